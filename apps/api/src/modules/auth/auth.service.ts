@@ -12,6 +12,12 @@ import * as QRCode from "qrcode";
 import { AuthRepository } from "./auth.repository";
 import { EncryptionService } from "../../common/encryption/encryption.service";
 
+/**
+ * Empty SHA-256 state resolved once at load; hashToken() copies it rather
+ * than looking the digest up again on every refresh-token hash.
+ */
+const SHA256_PROTOTYPE = crypto.createHash("sha256");
+
 export interface TokenPair {
   accessToken: string;
   refreshToken: string;
@@ -296,7 +302,7 @@ export class AuthService {
   }
 
   private hashToken(token: string): string {
-    return crypto.createHash("sha256").update(token).digest("hex");
+    return SHA256_PROTOTYPE.copy().update(token).digest("hex");
   }
 
   private base32Decode(str: string): Buffer {
@@ -321,8 +327,7 @@ export class AuthService {
     return Buffer.from(bytes);
   }
 
-  private generateTOTP(secretBase32: string, timeStepIndex: number): string {
-    const key = this.base32Decode(secretBase32);
+  private generateTOTP(key: Buffer, timeStepIndex: number): string {
     const buffer = Buffer.alloc(8);
     const high = Math.floor(timeStepIndex / 0x100000000);
     const low = timeStepIndex % 0x100000000;
@@ -345,9 +350,11 @@ export class AuthService {
   private verifyTOTP(secretBase32: string, token: string): number | null {
     if (!/^\d{6}$/.test(token)) return null;
     const now = Math.floor(Date.now() / 1000 / 30);
+    // Decode the shared secret once for all three candidate time steps.
+    const key = this.base32Decode(secretBase32);
     for (let i = -1; i <= 1; i++) {
       const step = now + i;
-      if (this.generateTOTP(secretBase32, step) === token) {
+      if (this.generateTOTP(key, step) === token) {
         return step;
       }
     }
@@ -0,0 +1,70 @@
+/// <reference types="jest" />
+
+import { GithubService } from "./github.service";
+
+function response(
+  body: unknown,
+  headers: Record<string, string> = {},
+  ok = true,
+) {
+  return {
+    ok,
+    json: async () => body,
+    headers: { get: (name: string) => headers[name] ?? null },
+  };
+}
+
+describe("GithubService", () => {
+  let originalFetch: typeof fetch;
+  let fetchMock: jest.Mock;
+  let svc: GithubService;
+
+  beforeAll(() => {
+    originalFetch = global.fetch;
+  });
+
+  afterAll(() => {
+    global.fetch = originalFetch;
+  });
+
+  beforeEach(() => {
+    fetchMock = jest.fn();
+    global.fetch = fetchMock as unknown as typeof fetch;
+    const settings = { getDecrypted: jest.fn().mockResolvedValue(null) };
+    svc = new GithubService(settings as any);
+  });
+
+  it("reuses a resolved tag for repeated lookups of the same repo", async () => {
+    fetchMock.mockResolvedValue(response({ tag_name: "v1.2.0" }));
+
+    const [a, b] = await Promise.all([
+      svc.getLatestTag("https://github.com/acme/plugin"),
+      svc.getLatestTag("https://github.com/acme/plugin"),
+    ]);
+    const c = await svc.getLatestTag("git@github.com:acme/plugin.git");
+
+    expect([a, b, c]).toEqual(["v1.2.0", "v1.2.0", "v1.2.0"]);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+
+  it("stops calling GitHub once the rate limit is exhausted", async () => {
+    const reset = Math.floor(Date.now() / 1000) + 3600;
+    fetchMock.mockResolvedValue(
+      response(
+        {},
+        {
+          "x-ratelimit-remaining": "0",
+          "x-ratelimit-reset": String(reset),
+        },
+        false,
+      ),
+    );
+
+    await svc.getLatestTag("https://github.com/acme/one");
+    const calls = fetchMock.mock.calls.length;
+    const tag = await svc.getLatestTag("https://github.com/acme/two");
+
+    expect(tag).toBeNull();
+    expect(fetchMock).toHaveBeenCalledTimes(calls);
+  });
+});
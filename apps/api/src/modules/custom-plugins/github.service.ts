@@ -3,9 +3,22 @@ import { SettingsService } from "../settings/settings.service";
 
 const GITHUB_TOKEN_KEY = "GITHUB_API_TOKEN";
 
+// Version checks fan out over every environment that has a custom plugin
+// installed, and most of them point at the same handful of repositories.
+// Resolved tags are reused for LATEST_TAG_TTL_MS (misses for a shorter
+// window) so repeated checks don't burn through GitHub's hourly rate limit.
+const LATEST_TAG_TTL_MS = 10 * 60 * 1000;
+const LATEST_TAG_MISS_TTL_MS = 60 * 1000;
+
 @Injectable()
 export class GithubService {
   private readonly logger = new Logger(GithubService.name);
+  private readonly latestTags = new Map<
+    string,
+    { expiresAt: number; tag: Promise<string | null> }
+  >();
+  /** Epoch ms until which GitHub reported the rate limit as exhausted. */
+  private rateLimitedUntil = 0;
 
   constructor(private readonly settings: SettingsService) {}
 
@@ -14,6 +27,8 @@ export class GithubService {
    * Tries /releases/latest first; falls back to /tags if no releases exist.
    * If no releases/tags exist, scans repo files for a version comment header.
    * Returns null if the repo is unreachable, rate-limited, or has no tags/version.
+   * Results are cached per repo/path for a few minutes, and concurrent
+   * lookups of the same repo share one request.
    */
   async getLatestTag(
     repoUrl: string,
@@ -24,20 +39,49 @@ export class GithubService {
     const parsed = this.parseGithubRepo(repoUrl);
     if (!parsed) return null;
 
-    const { owner, repo } = parsed;
-    const token = await this.getToken();
-    const headers: Record<string, string> = {
-      Accept: "application/vnd.github+json",
-      "X-GitHub-Api-Version": "2022-11-28",
-      "User-Agent": "bedrock-forge",
+    const key = `${parsed.owner}/${parsed.repo}:${repoPath}:${type}:${slug ?? ""}`;
+    const now = Date.now();
+    const cached = this.latestTags.get(key);
+    if (cached && cached.expiresAt > now) return cached.tag;
+
+    const entry = {
+      expiresAt: now + LATEST_TAG_TTL_MS,
+      tag: this.fetchLatestTag(parsed, repoPath, type, slug),
     };
-    if (token) {
-      headers["Authorization"] = `Bearer ${token}`;
+    this.latestTags.set(key, entry);
+    const tag = await entry.tag;
+    if (tag === null) entry.expiresAt = Date.now() + LATEST_TAG_MISS_TTL_MS;
+    return tag;
+  }
+
+  private async fetchLatestTag(
+    { owner, repo }: { owner: string; repo: string },
+    repoPath: string,
+    type: string,
+    slug?: string,
+  ): Promise<string | null> {
+    if (Date.now() < this.rateLimitedUntil) {
+      this.logger.warn(
+        `GitHub rate limit exhausted — skipping lookup for ${owner}/${repo}`,
+      );
+      return null;
     }
 
     try {
+      // Inside the try: a settings or decryption failure must resolve to a
+      // miss, not a rejection that stays cached for the full TTL.
+      const token = await this.getToken();
+      const headers: Record<string, string> = {
+        Accept: "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+        "User-Agent": "bedrock-forge",
+      };
+      if (token) {
+        headers["Authorization"] = `Bearer ${token}`;
+      }
+
       // Try releases/latest first
-      const releaseRes = await fetch(
+      const releaseRes = await this.request(
         `https://api.github.com/repos/${owner}/${repo}/releases/latest`,
         { headers },
       );
@@ -47,7 +91,7 @@ export class GithubService {
       }
 
       // Fall back to /tags
-      const tagsRes = await fetch(
+      const tagsRes = await this.request(
         `https://api.github.com/repos/${owner}/${repo}/tags?per_page=1`,
         { headers },
       );
@@ -64,7 +108,7 @@ export class GithubService {
           ? ""
           : repoPath.replace(/^\/|\/$/g, "");
       const contentsUrl = `https://api.github.com/repos/${owner}/${repo}/contents/${cleanPath}`;
-      const contentsRes = await fetch(contentsUrl, { headers });
+      const contentsRes = await this.request(contentsUrl, { headers });
       if (contentsRes.ok) {
         const items = (await contentsRes.json()) as {
           name: string;
@@ -112,7 +156,7 @@ export class GithubService {
           // Check first 3 candidates
           for (const filePath of fileCandidates.slice(0, 3)) {
             try {
-              const fileRes = await fetch(
+              const fileRes = await this.request(
                 `https://api.github.com/repos/${owner}/${repo}/contents/${filePath}`,
                 { headers },
               );
@@ -152,6 +196,20 @@ export class GithubService {
     }
   }
 
+  /** fetch() that remembers when GitHub says the rate limit is used up. */
+  private async request(
+    url: string,
+    init: { headers: Record<string, string> },
+  ): Promise<Response> {
+    const res = await fetch(url, init);
+    if (res.headers.get("x-ratelimit-remaining") === "0") {
+      const reset = Number(res.headers.get("x-ratelimit-reset"));
+      this.rateLimitedUntil =
+        reset > 0 ? reset * 1000 : Date.now() + LATEST_TAG_MISS_TTL_MS;
+    }
+    return res;
+  }
+
   private parseGithubRepo(url: string): { owner: string; repo: string } | null {
     // SSH: git@github.com:owner/repo.git
     const sshMatch = url.match(/^git@github\.com:([^/]+)\/([^/]+?)(?:\.git)?$/);
@@ -0,0 +1,50 @@
+/// <reference types="jest" />
+
+import { CyberpanelService } from "./cyberpanel.service";
+
+describe("CyberpanelService", () => {
+  let repo: { findServerById: jest.Mock; saveCyberpanelLogin: jest.Mock };
+  let enc: { encrypt: jest.Mock; decrypt: jest.Mock };
+  let svc: CyberpanelService;
+
+  beforeEach(() => {
+    repo = {
+      findServerById: jest
+        .fn()
+        .mockResolvedValue({ id: BigInt(1), cyberpanel_login: "enc" }),
+      saveCyberpanelLogin: jest.fn().mockResolvedValue(undefined),
+    };
+    enc = {
+      encrypt: jest.fn().mockReturnValue("enc2"),
+      decrypt: jest.fn().mockReturnValue(
+        JSON.stringify({
+          url: "https://panel:8090",
+          username: "admin",
+          password: "secret",
+        }),
+      ),
+    };
+    svc = new CyberpanelService(repo as any, enc as any);
+  });
+
+  it("reuses resolved credentials for repeated calls", async () => {
+    const a = await svc.resolveCredentials(1);
+    const b = await svc.resolveCredentials(1);
+
+    expect(b).toBe(a);
+    expect(repo.findServerById).toHaveBeenCalledTimes(1);
+    expect(enc.decrypt).toHaveBeenCalledTimes(1);
+  });
+
+  it("drops cached credentials when new ones are saved", async () => {
+    await svc.resolveCredentials(1);
+    await svc.saveCredentials(1, {
+      url: "https://panel:8090",
+      username: "admin",
+      password: "rotated",
+    });
+    await svc.resolveCredentials(1);
+
+    expect(enc.decrypt).toHaveBeenCalledTimes(2);
+  });
+});
@@ -4,12 +4,29 @@ import {
   BadRequestException,
   Logger,
 } from "@nestjs/common";
-import { request as httpsRequest, RequestOptions } from "node:https";
-import { request as httpRequest } from "node:http";
+import {
+  Agent as HttpsAgent,
+  request as httpsRequest,
+  RequestOptions,
+} from "node:https";
+import { Agent as HttpAgent, request as httpRequest } from "node:http";
 import { CyberpanelRepository } from "./cyberpanel.repository";
 import { EncryptionService } from "../../common/encryption/encryption.service";
 import { UpsertCyberpanelDto } from "./dto/cyberpanel.dto";
 
+// Shared keep-alive agents so consecutive panel calls (createWebsite followed
+// by submitDBCreation, …) reuse one TCP/TLS connection per panel.
+const HTTP_AGENT = new HttpAgent({ keepAlive: true, maxSockets: 8 });
+const HTTPS_AGENT = new HttpsAgent({ keepAlive: true, maxSockets: 8 });
+
+// Decrypted panel logins are reused for this long, so a provisioning run's
+// back-to-back calls read and decrypt the server row once. Saving new
+// credentials through this service drops the entry immediately.
+const CREDENTIALS_TTL_MS = 60_000;
+
+/** How much of a non-2xx response body is quoted in the error message. */
+const ERROR_BODY_PREVIEW_LENGTH = 200;
+
 interface CpCredentials {
   url: string;
   username: string;
@@ -19,6 +36,10 @@ interface CpCredentials {
 @Injectable()
 export class CyberpanelService {
   private readonly logger = new Logger(CyberpanelService.name);
+  private readonly credentialsCache = new Map<
+    number,
+    { creds: CpCredentials; expiresAt: number }
+  >();
 
   constructor(
     private readonly repo: CyberpanelRepository,
@@ -57,6 +78,7 @@ export class CyberpanelService {
       }),
     );
     await this.repo.saveCyberpanelLogin(BigInt(serverId), encrypted);
+    this.credentialsCache.delete(serverId);
     return { success: true };
   }
 
@@ -128,6 +150,9 @@ export class CyberpanelService {
    * Used internally by API methods above.
    */
   async resolveCredentials(serverId: number): Promise<CpCredentials> {
+    const cached = this.credentialsCache.get(serverId);
+    if (cached && cached.expiresAt > Date.now()) return cached.creds;
+
     const server = await this.repo.findServerById(BigInt(serverId));
     if (!server) throw new NotFoundException(`Server ${serverId} not found`);
     if (!server.cyberpanel_login)
@@ -135,7 +160,12 @@ export class CyberpanelService {
         `Server ${serverId} has no CyberPanel credentials`,
       );
     const raw = this.enc.decrypt(server.cyberpanel_login as string);
-    return JSON.parse(raw) as CpCredentials;
+    const creds = JSON.parse(raw) as CpCredentials;
+    this.credentialsCache.set(serverId, {
+      creds,
+      expiresAt: Date.now() + CREDENTIALS_TTL_MS,
+    });
+    return creds;
   }
 
   // ── private ──────────────────────────────────────────────────────────────
@@ -170,6 +200,7 @@ export class CyberpanelService {
             "Content-Type": "application/json",
             "Content-Length": Buffer.byteLength(serialized),
           },
+          agent: isHttps ? HTTPS_AGENT : HTTP_AGENT,
           // Default: verify TLS certificates. Set CYBERPANEL_TLS_VERIFY=false only
           // when the CyberPanel instance uses a self-signed cert that cannot be
           // replaced — understand that this opens the connection to MITM attacks.
@@ -180,6 +211,30 @@ export class CyberpanelService {
           : httpRequest(opts, handler);
         function handler(res: import("node:http").IncomingMessage) {
           const chunks: Buffer[] = [];
+          // A non-2xx reply (401 login page, proxy 502) is an error whatever
+          // its body says: keep only a short preview for the message, drain
+          // the rest so the keep-alive socket can be reused, and skip the
+          // JSON parse entirely.
+          const code = res.statusCode ?? 0;
+          if (code < 200 || code >= 300) {
+            let kept = 0;
+            res.on("data", (c: Buffer) => {
+              if (kept >= ERROR_BODY_PREVIEW_LENGTH) return;
+              chunks.push(c);
+              kept += c.length;
+            });
+            res.on("end", () => {
+              const preview = Buffer.concat(chunks)
+                .toString()
+                .slice(0, ERROR_BODY_PREVIEW_LENGTH);
+              reject(
+                new BadRequestException(
+                  `CyberPanel ${endpoint} returned HTTP ${code}: ${preview}`,
+                ),
+              );
+            });
+            return;
+          }
           res.on("data", (c: Buffer) => chunks.push(c));
           res.on("end", () => {
             try {
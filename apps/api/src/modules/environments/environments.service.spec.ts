@@ -385,9 +385,6 @@ describe("EnvironmentsService", () => {
         if (command.includes("[ -x '/usr/local/lsws/lsphp83/bin/php' ]")) {
           return { code: 0, stdout: "yes", stderr: "" };
         }
-        if (command.includes("base64 -d")) {
-          return { code: 0, stdout: "", stderr: "" };
-        }
         if (command.includes("bf-wp-users")) {
           return {
             code: 0,
@@ -412,6 +409,11 @@ describe("EnvironmentsService", () => {
       const result = await svc.getWpUsers(1);
 
       expect(result).toHaveLength(1);
+      expect(executor.pushFile).toHaveBeenCalledWith({
+        remotePath: expect.stringMatching(/^\/tmp\/bf-wp-creds-/),
+        content: expect.any(Buffer),
+        mode: 0o600,
+      });
       expect(
         executor.execute.mock.calls.some(([command]) =>
           command.startsWith(
@@ -429,9 +431,6 @@ describe("EnvironmentsService", () => {
         ) {
           return { code: 0, stdout: "", stderr: "" };
         }
-        if (command.includes("base64 -d")) {
-          return { code: 0, stdout: "", stderr: "" };
-        }
         if (command.includes("bf-wp-users")) {
           return { code: 0, stdout: JSON.stringify({ users: [] }), stderr: "" };
         }
@@ -455,9 +454,6 @@ describe("EnvironmentsService", () => {
         ) {
           return { code: 0, stdout: "", stderr: "" };
         }
-        if (command.includes("base64 -d")) {
-          return { code: 0, stdout: "", stderr: "" };
-        }
         if (command.includes("bf-wp-users")) {
           return { code: 1, stdout: "", stderr: "PDO driver missing" };
         }
@@ -477,9 +473,6 @@ describe("EnvironmentsService", () => {
         ) {
           return { code: 0, stdout: "", stderr: "" };
         }
-        if (command.includes("base64 -d")) {
-          return { code: 0, stdout: "", stderr: "" };
-        }
         if (command.includes("bf-wp-users")) {
           return { code: 0, stdout: "<br>warning", stderr: "" };
         }
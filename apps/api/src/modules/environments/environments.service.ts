@@ -412,17 +412,19 @@ export class EnvironmentsService {
       );
     }
 
-    // Write creds to a temp .my.cnf via base64 (safe: no shell-special chars)
+    // Write creds to a temp .my.cnf over SFTP — created 0600 by the open
+    // itself, so the file never passes through a shell or a chmod exec.
     const cnfContent = `[client]\nhost=${creds.dbHost}\nuser=${creds.dbUser}\npassword=${creds.dbPassword}\n`;
-    const cnfB64 = Buffer.from(cnfContent).toString("base64");
-    const tmpDir = `/tmp/bf-dbt-${Date.now()}`;
-    const cnfPath = `${tmpDir}/.my.cnf`;
+    // Random rather than timestamped: a guessable path in the shared /tmp
+    // could be pre-created by another local user.
+    const cnfPath = `/tmp/bf-dbt-${randomBytes(12).toString("base64url")}.cnf`;
 
     try {
-      await executor.execute(`mkdir -p "${tmpDir}" && chmod 700 "${tmpDir}"`);
-      await executor.execute(
-        `echo '${cnfB64}' | base64 -d > "${cnfPath}" && chmod 600 "${cnfPath}"`,
-      );
+      await executor.pushFile({
+        remotePath: cnfPath,
+        content: Buffer.from(cnfContent),
+        mode: 0o600,
+      });
 
       const result = await executor.execute(
         `mysql --defaults-extra-file="${cnfPath}" "${creds.dbName}" -e "SHOW TABLES" 2>&1`,
@@ -444,7 +446,7 @@ export class EnvironmentsService {
 
       return tables;
     } finally {
-      await executor.execute(`rm -rf "${tmpDir}"`).catch(() => {});
+      await executor.execute(`rm -f "${cnfPath}"`).catch(() => {});
     }
   }
 
@@ -517,10 +519,11 @@ export class EnvironmentsService {
           dbPassword: creds.dbPassword,
           dbName: creds.dbName,
         });
-        const credsB64 = Buffer.from(credsJson).toString("base64");
-        await executor.execute(
-          `echo ${shellEscape(credsB64)} | base64 -d > ${shellEscape(remoteCredsFile)} && chmod 600 ${shellEscape(remoteCredsFile)}`,
-        );
+        await executor.pushFile({
+          remotePath: remoteCredsFile,
+          content: Buffer.from(credsJson),
+          mode: 0o600,
+        });
         phpCmd = `${phpCmdPrefix} ${shellEscape(remoteScript)} --creds-file=${shellEscape(remoteCredsFile)}${env.root_path ? ` --docroot=${shellEscape(env.root_path)}` : ""}`;
       } else {
         // Credentials not pre-resolved — let the PHP script search for
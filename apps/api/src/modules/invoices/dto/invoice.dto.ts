@@ -11,7 +11,6 @@ import {
   Min,
   Max,
 } from "class-validator";
-import { PartialType } from "@nestjs/mapped-types";
 import { Type } from "class-transformer";
 import { PaginationQueryDto } from "../../../common/dto/pagination-query.dto";
 
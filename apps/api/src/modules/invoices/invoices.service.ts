@@ -7,7 +7,6 @@ import {
   ServiceUnavailableException,
 } from "@nestjs/common";
 import { Cron, CronExpression } from "@nestjs/schedule";
-import * as puppeteer from "puppeteer-core";
 import { existsSync } from "fs";
 import { InvoicesRepository } from "./invoices.repository";
 import { NotificationsService } from "../notifications/notifications.service";
@@ -57,6 +56,7 @@ function firstExistingPath(paths: Array<string | undefined>): string | null {
 @Injectable()
 export class InvoicesService {
   private readonly logger = new Logger(InvoicesService.name);
+  private chromePath: string | null = null;
 
   constructor(
     private readonly repo: InvoicesRepository,
@@ -96,7 +96,10 @@ export class InvoicesService {
     if (!rawInv) throw new NotFoundException(`Invoice #${id} not found`);
     const inv = this.serialise(rawInv);
 
-    const chromePath = firstExistingPath([
+    // Resolved once and kept: the env vars and install locations don't
+    // change under a running API. A miss is not cached, so installing
+    // Chromium later takes effect without a restart.
+    this.chromePath ??= firstExistingPath([
       process.env.LIGHTHOUSE_CHROME_PATH,
       process.env.CHROME_PATH,
       "/usr/bin/google-chrome-stable",
@@ -104,6 +107,7 @@ export class InvoicesService {
       "/usr/bin/chromium-browser",
       "/usr/bin/chromium",
     ]);
+    const chromePath = this.chromePath;
 
     if (!chromePath) {
       throw new ServiceUnavailableException(
@@ -111,6 +115,9 @@ export class InvoicesService {
       );
     }
 
+    // puppeteer-core is only needed here; load it on the first invoice PDF
+    // rather than with every API boot.
+    const puppeteer = await import("puppeteer-core");
     const browser = await puppeteer.launch({
       executablePath: chromePath,
       args: [
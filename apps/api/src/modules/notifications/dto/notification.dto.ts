@@ -8,7 +8,6 @@ import {
   MinLength,
 } from "class-validator";
 import { PartialType } from "@nestjs/mapped-types";
-import type { NotificationEventType } from "@bedrock-forge/shared";
 
 export class CreateChannelDto {
   @IsString()
@@ -107,4 +107,43 @@ describe("PluginScansService", () => {
       expect.any(Object),
     );
   });
+
+  it("asks WordPress.org only for the fields the search shows", async () => {
+    const originalFetch = global.fetch;
+    const fetchMock = jest.fn().mockResolvedValue({
+      ok: true,
+      json: async () => ({
+        plugins: [
+          {
+            name: "Contact Form 7",
+            slug: "contact-form-7",
+            version: "6.0",
+            author: '<a href="https://example.com">Takayuki Miyoshi</a>',
+          },
+        ],
+      }),
+    });
+    global.fetch = fetchMock as unknown as typeof fetch;
+
+    try {
+      const svc = new PluginScansService(
+        makeRepo() as any,
+        {} as any,
+        makeQueue() as any,
+        makeQueue() as any,
+        {} as any,
+      );
+      const results = await svc.searchWpOrg("contact form");
+
+      const url = new URL(fetchMock.mock.calls[0][0]);
+      expect(url.searchParams.get("request[search]")).toBe("contact form");
+      expect(url.searchParams.get("request[fields][description]")).toBe("0");
+      expect(results[0]).toMatchObject({
+        slug: "contact-form-7",
+        author: "Takayuki Miyoshi",
+      });
+    } finally {
+      global.fetch = originalFetch;
+    }
+  });
 });
@@ -16,7 +16,6 @@ import { AuthGuard } from "@nestjs/passport";
 import { RolesGuard } from "../../common/guards/roles.guard";
 import { Roles } from "../../common/decorators/roles.decorator";
 import { ROLES } from "@bedrock-forge/shared";
-import { PaginationQueryDto } from "../../common/dto/pagination-query.dto";
 import { ProjectsService } from "./projects.service";
 import {
   CreateProjectDto,
@@ -1,7 +1,6 @@
 import { Injectable, NotFoundException } from "@nestjs/common";
 import { PrismaService } from "../../prisma/prisma.service";
 import { EncryptionService } from "../../common/encryption/encryption.service";
-import { PaginationQuery } from "@bedrock-forge/shared";
 import type { QueryProjectsDto } from "./dto/project.dto";
 
 interface CreateProjectData {
@@ -6,7 +6,6 @@ import {
   QUEUES,
   JOB_TYPES,
   DEFAULT_JOB_OPTIONS,
-  PaginationQuery,
 } from "@bedrock-forge/shared";
 import { ProjectsRepository } from "./projects.repository";
 import {
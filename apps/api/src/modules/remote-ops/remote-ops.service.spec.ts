@@ -69,6 +69,14 @@ describe("RemoteOpsService", () => {
         }
         return { code: 0, stdout: "/var/www", stderr: "" };
       }
+      if (cmd.includes("sha256sum")) {
+        const digest = createHash("sha256").update("API_KEY=key\n").digest("hex");
+        return {
+          code: 0,
+          stdout: `100\ntext/plain; charset=us-ascii\n${digest}  /var/www/.env\n`,
+          stderr: "",
+        };
+      }
       if (cmd.includes("stat")) {
         return { code: 0, stdout: "100", stderr: "" };
       }
@@ -106,6 +114,24 @@ describe("RemoteOpsService", () => {
         }),
       );
     });
+
+    it("checksums the raw file bytes", async () => {
+      repo.findEnvironmentWithServerAndProject.mockResolvedValue({
+        id: BigInt(1),
+        type: "staging",
+        root_path: "/var/www",
+        server: { ip: "1.2.3.4", port: 22 },
+        project: { name: "Test project" },
+      });
+      repo.findTemplatesByEnvType.mockResolvedValue([]);
+      const raw = Buffer.from([0x41, 0x3d, 0xe9, 0x0a]); // "A=\xe9\n" (latin-1)
+      mockExecutor.pullFile.mockResolvedValue(raw);
+
+      const res = await service.readEnvFile(1);
+      expect(res.checksum).toBe(
+        createHash("sha256").update(raw).digest("hex"),
+      );
+    });
   });
 
   describe("writeEnvFile", () => {
@@ -137,6 +163,56 @@ describe("RemoteOpsService", () => {
         }),
       );
     });
+
+    it("rejects the write when the remote checksum has changed", async () => {
+      repo.findEnvironmentWithServerAndProject.mockResolvedValue({
+        id: BigInt(1),
+        type: "staging",
+        root_path: "/var/www",
+        server: { ip: "1.2.3.4", port: 22 },
+        project: { name: "Test project" },
+      });
+
+      await expect(
+        service.writeFile(1, {
+          path: ".env",
+          content: "API_KEY=new-key\n",
+          checksum: "stale",
+          confirmation: "staging",
+        }),
+      ).rejects.toThrow(BadRequestException);
+      expect(mockExecutor.pullFile).not.toHaveBeenCalled();
+      expect(mockExecutor.pushFile).not.toHaveBeenCalled();
+    });
+
+    it("refuses to overwrite a binary file", async () => {
+      repo.findEnvironmentWithServerAndProject.mockResolvedValue({
+        id: BigInt(1),
+        type: "staging",
+        root_path: "/var/www",
+        server: { ip: "1.2.3.4", port: 22 },
+        project: { name: "Test project" },
+      });
+      mockExecutor.execute.mockImplementation(async (cmd: string) =>
+        cmd.includes("realpath")
+          ? { code: 0, stdout: "/var/www/.env", stderr: "" }
+          : {
+              code: 0,
+              stdout: "100\napplication/octet-stream; charset=binary\nabc  /var/www/.env\n",
+              stderr: "",
+            },
+      );
+
+      await expect(
+        service.writeFile(1, {
+          path: ".env",
+          content: "API_KEY=new-key\n",
+          checksum: "abc",
+          confirmation: "staging",
+        }),
+      ).rejects.toThrow(BadRequestException);
+      expect(mockExecutor.pushFile).not.toHaveBeenCalled();
+    });
   });
 
   describe("getNotes", () => {
@@ -348,8 +348,14 @@ export class RemoteOpsService {
       );
     }
     const buf = await executor.pullFile(safePath);
-    const content = buf.toString("utf8");
-    return { path: safePath, content, checksum: checksum(content), env };
+    // Hash the pulled bytes directly rather than re-encoding the decoded
+    // string, which would copy the whole file a second time just to hash it.
+    return {
+      path: safePath,
+      content: buf.toString("utf8"),
+      checksum: checksum(buf),
+      env,
+    };
   }
 
   private async writeSafeTextFile(envId: number, dto: WriteRemoteFileDto) {
@@ -363,15 +369,40 @@ export class RemoteOpsService {
         `File exceeds ${MAX_EDIT_BYTES} byte edit limit`,
       );
     }
-    const current = await this.readSafeTextFile(
-      envId,
-      dto.path,
-      MAX_EDIT_BYTES,
+    // Re-run the read path's guards (regular file, size, text type) and hash
+    // the file on the server in one exec instead of pulling it back over
+    // SFTP: only the size, mime type and digest cross the wire.
+    const probe = await executor.execute(
+      `if test -f ${q(safePath)}; then ` +
+        `stat -c '%s' ${q(safePath)} && { file -bi ${q(safePath)} || echo; } && sha256sum -- ${q(safePath)}; ` +
+        `else echo missing; fi`,
+      { timeout: 20_000 },
     );
-    if (current.checksum !== dto.checksum) {
+    if (probe.stdout.trim() === "missing") {
+      throw new NotFoundException(`${safePath} does not exist`);
+    }
+    if (probe.code !== 0) {
+      throw new BadRequestException(
+        probe.stderr.trim() || `Unable to read ${safePath}`,
+      );
+    }
+    const [sizeLine = "", mime = "", hashLine = ""] = probe.stdout.split("\n");
+    const size = Number(sizeLine.trim());
+    if (!Number.isFinite(size) || size > MAX_EDIT_BYTES) {
+      throw new BadRequestException(
+        `File is too large to edit (${size} bytes, max ${MAX_EDIT_BYTES})`,
+      );
+    }
+    if (mime.trim() && !/text|json|xml|x-empty|inode\/x-empty/i.test(mime)) {
+      throw new BadRequestException(
+        `Binary files cannot be edited (${mime.trim()})`,
+      );
+    }
+    const currentChecksum = hashLine.trim().split(/\s+/)[0];
+    if (currentChecksum !== dto.checksum) {
       throw new BadRequestException({
         message: "Remote file changed since it was loaded",
-        current_checksum: current.checksum,
+        current_checksum: currentChecksum,
       });
     }
     const backupDir = `${env.backup_path || `${env.root_path}/.forge-backups`}/file-edits`;
@@ -591,7 +622,7 @@ function maskSecret(value: string): string {
   return `${unquoted.slice(0, 2)}****${unquoted.slice(-2)}`;
 }
 
-function checksum(content: string): string {
+function checksum(content: string | Buffer): string {
   return createHash("sha256").update(content).digest("hex");
 }
 
@@ -13,10 +13,7 @@ import {
   SshServerConfig,
 } from "@bedrock-forge/remote-executor";
 import { CreateServerDto, UpdateServerDto } from "./dto/server.dto";
-import {
-  DetectBedrockDto,
-  BedrockDetectionResult,
-} from "./dto/detect-bedrock.dto";
+import { BedrockDetectionResult } from "./dto/detect-bedrock.dto";
 import { ScannedProject, ScanProjectsMultiDto } from "./dto/scan-projects.dto";
 
 @Injectable()
@@ -105,6 +102,22 @@ export class ServersService {
   async getServerSshConfig(serverId: number): Promise<SshServerConfig> {
     const server = await this.repo.findByIdWithKey(BigInt(serverId));
     if (!server) throw new NotFoundException(`Server ${serverId} not found`);
+    return this.buildSshConfig(server);
+  }
+
+  /**
+   * Build the SSH configuration from an already-loaded server row, for
+   * callers that need the row themselves and shouldn't load it twice.
+   */
+  private async buildSshConfig(server: {
+    id: bigint;
+    name: string;
+    ip_address: string;
+    ssh_port: number;
+    ssh_user: string;
+    ssh_private_key_encrypted: string;
+    host_key_fingerprint: string | null;
+  }): Promise<SshServerConfig> {
     const privateKey = await this.resolvePrivateKey(server);
     return {
       host: server.ip_address,
@@ -113,12 +126,12 @@ export class ServersService {
       privateKey,
       expectedHostKeyFingerprint: server.host_key_fingerprint ?? undefined,
       onHostKeyFingerprint: async (fingerprint) => {
-        await this.repo.updateHostKeyFingerprint(BigInt(serverId), fingerprint);
+        await this.repo.updateHostKeyFingerprint(server.id, fingerprint);
       },
     };
   }
 
-  /** Execute a quick `echo ok` to verify SSH connectivity, and probe CyberPanel version */
+  /** Execute a quick `echo ok` to verify SSH connectivity, and probe CyberPanel version in the same exec */
   async testConnection(id: number): Promise<{
     success: boolean;
     message: string;
@@ -127,48 +140,35 @@ export class ServersService {
     const server = await this.repo.findByIdWithKey(BigInt(id));
     if (!server) throw new NotFoundException(`Server ${id} not found`);
 
-    const privateKey = await this.resolvePrivateKey(server);
-
-    const executor = createRemoteExecutor({
-      host: server.ip_address,
-      port: server.ssh_port,
-      username: server.ssh_user,
-      privateKey,
-      expectedHostKeyFingerprint: server.host_key_fingerprint ?? undefined,
-      onHostKeyFingerprint: async (fingerprint) => {
-        await this.repo.updateHostKeyFingerprint(server.id, fingerprint);
-      },
-    });
+    const executor = createRemoteExecutor(await this.buildSshConfig(server));
 
     try {
-      const result = await executor.execute("echo ok");
-      const success = result.code === 0;
+      // The connectivity probe carries the CyberPanel version read with it,
+      // so a test costs one exec instead of two.
+      const result = await executor.execute(
+        "echo ok; cat /usr/local/CyberCP/version.txt 2>/dev/null || true",
+      );
+      const [probe = "", ...rest] = result.stdout.split("\n");
+      const success = result.code === 0 && probe.trim() === "ok";
       await this.repo.updateStatus(BigInt(id), success ? "online" : "offline");
 
       let cyberpanelVersion: string | undefined;
       if (success) {
-        try {
-          const versionResult = await executor.execute(
-            "cat /usr/local/CyberCP/version.txt 2>/dev/null || echo ''",
-          );
-          const detected = versionResult.stdout.trim();
-          if (detected) {
-            cyberpanelVersion = detected;
-            await this.repo
-              .updateCyberPanelVersion(BigInt(id), detected)
-              .catch(() => {});
-          } else {
-            // CyberPanel not installed — clear any stale version
-            await this.repo
-              .updateCyberPanelVersion(BigInt(id), null)
-              .catch(() => {});
-          }
-        } catch {
-          // Version detection is non-critical — ignore failures
+        const detected = rest.join("\n").trim();
+        if (detected) {
+          cyberpanelVersion = detected;
+          await this.repo
+            .updateCyberPanelVersion(BigInt(id), detected)
+            .catch(() => {});
+        } else {
+          // CyberPanel not installed — clear any stale version
+          await this.repo
+            .updateCyberPanelVersion(BigInt(id), null)
+            .catch(() => {});
         }
       }
 
-      return { success, message: result.stdout.trim(), cyberpanelVersion };
+      return { success, message: probe.trim(), cyberpanelVersion };
     } catch (err: unknown) {
       await this.repo.updateStatus(BigInt(id), "offline").catch(() => {});
       return {
@@ -186,43 +186,68 @@ export class ServersService {
     id: number,
     path: string,
   ): Promise<BedrockDetectionResult> {
-    const server = await this.repo.findByIdWithKey(BigInt(id));
-    if (!server) throw new NotFoundException(`Server ${id} not found`);
-
+    // getServerSshConfig() loads the row and throws NotFoundException itself.
     const executor = createRemoteExecutor(
       await this.getServerSshConfig(id),
     );
 
     const rootPath = path.endsWith("/") ? path.slice(0, -1) : path;
 
-    // Check existence of key files
-    const checkFile = async (filePath: string): Promise<boolean> => {
-      try {
-        const r = await executor.execute(
-          `test -f "${filePath}" && echo found || echo missing`,
+    // Probe all four marker files and read the three we parse in a single
+    // exec: each file is announced by a marker line ("found"/"missing")
+    // followed by its contents, instead of one SSH round trip per test -f
+    // and another per cat.
+    const PROBE_MARKER = "__BF_PROBE__";
+    const probeFiles = [
+      "composer.json",
+      "config/application.php",
+      ".env",
+      "web/wp-config.php",
+    ];
+    const readable = new Set(["composer.json", "config/application.php", ".env"]);
+    const quotedRoot = `'${rootPath.replace(/'/g, "'\\''")}'`;
+    const probeCmd = probeFiles
+      .map((f) => {
+        const target = `${quotedRoot}/'${f}'`;
+        const body = readable.has(f) ? `; cat ${target}; printf '\\n'` : "";
+        return (
+          `if test -f ${target}; then echo '${PROBE_MARKER} ${f} found'${body}; ` +
+          `else echo '${PROBE_MARKER} ${f} missing'; fi`
         );
-        return r.stdout.trim() === "found";
-      } catch {
-        return false;
-      }
-    };
+      })
+      .join("; ");
 
-    const readFile = async (filePath: string): Promise<string | null> => {
-      try {
-        const r = await executor.execute(`cat "${filePath}"`);
-        return r.code === 0 ? r.stdout : null;
-      } catch {
-        return null;
+    const found = new Set<string>();
+    const contents = new Map<string, string>();
+    try {
+      const r = await executor.execute(probeCmd);
+      let current: string | null = null;
+      let lines: string[] = [];
+      const flush = () => {
+        if (current) contents.set(current, lines.join("\n").trim());
+      };
+      for (const line of r.stdout.split("\n")) {
+        if (line.startsWith(`${PROBE_MARKER} `)) {
+          flush();
+          const [, file, state] = line.split(" ");
+          current = state === "found" ? file : null;
+          if (current) found.add(current);
+          lines = [];
+        } else if (current) {
+          lines.push(line);
+        }
       }
-    };
+      flush();
+    } catch {
+      // Treat an unreachable server like a path with none of the files
+    }
 
-    const [hasComposer, hasAppConfig, hasEnvFile, hasWpConfig] =
-      await Promise.all([
-        checkFile(`${rootPath}/composer.json`),
-        checkFile(`${rootPath}/config/application.php`),
-        checkFile(`${rootPath}/.env`),
-        checkFile(`${rootPath}/web/wp-config.php`),
-      ]);
+    const hasComposer = found.has("composer.json");
+    const hasAppConfig = found.has("config/application.php");
+    const hasEnvFile = found.has(".env");
+    const hasWpConfig = found.has("web/wp-config.php");
+    const readFile = (file: string): string | null =>
+      contents.get(file) || null;
 
     const isBedrock = hasAppConfig || (hasComposer && hasEnvFile);
     const isWordPress = hasWpConfig || isBedrock;
@@ -231,7 +256,7 @@ export class ServersService {
     let composerJson: Record<string, unknown> | undefined;
     let projectName = rootPath.split("/").pop() ?? "Unknown";
     if (hasComposer) {
-      const raw = await readFile(`${rootPath}/composer.json`);
+      const raw = readFile("composer.json");
       if (raw) {
         try {
           composerJson = JSON.parse(raw) as Record<string, unknown>;
@@ -248,7 +273,7 @@ export class ServersService {
     let dbCredentials: BedrockDetectionResult["dbCredentials"];
     let siteUrl: string | undefined;
     if (hasEnvFile) {
-      const raw = await readFile(`${rootPath}/.env`);
+      const raw = readFile(".env");
       if (raw) {
         const creds = credentialParser.parseEnvFile(raw);
         if (creds) {
@@ -268,7 +293,7 @@ export class ServersService {
 
     // Fallback: try config/application.php if no DB creds yet
     if (!dbCredentials && hasAppConfig) {
-      const raw = await readFile(`${rootPath}/config/application.php`);
+      const raw = readFile("config/application.php");
       if (raw) {
         const creds = credentialParser.parse(raw);
         if (creds) {
@@ -303,9 +328,7 @@ export class ServersService {
     const server = await this.repo.findByIdWithKey(BigInt(id));
     if (!server) throw new NotFoundException(`Server ${id} not found`);
 
-    const executor = createRemoteExecutor(
-      await this.getServerSshConfig(id),
-    );
+    const executor = createRemoteExecutor(await this.buildSshConfig(server));
 
     // Single SSH command: iterate /home/*/public_html, emit delimited blocks
     const scanCmd = [
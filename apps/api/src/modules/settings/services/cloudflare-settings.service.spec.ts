@@ -56,4 +56,32 @@ describe("CloudflareSettingsService", () => {
     expect(repo.delete).toHaveBeenCalledWith("cloudflare_api_token");
     expect(repo.delete).toHaveBeenCalledWith("cloudflare_zone_id");
   });
+
+  it("fails fast after Cloudflare answers 429 until Retry-After passes", async () => {
+    repo.findByKey.mockImplementation(async (key: string) =>
+      key === "cloudflare_api_token"
+        ? { value: "enc:token" }
+        : { value: "zone-1" },
+    );
+    const fetchMock = jest.fn().mockResolvedValue({
+      status: 429,
+      ok: false,
+      headers: { get: (name: string) => (name === "retry-after" ? "30" : null) },
+      json: async () => ({ success: false }),
+    });
+    const originalFetch = global.fetch;
+    global.fetch = fetchMock as unknown as typeof fetch;
+
+    try {
+      await expect(service.purgeCloudflareCache()).rejects.toThrow(
+        BadRequestException,
+      );
+      await expect(service.purgeCloudflareCache()).rejects.toThrow(
+        /rate limit reached/,
+      );
+      expect(fetchMock).toHaveBeenCalledTimes(1);
+    } finally {
+      global.fetch = originalFetch;
+    }
+  });
 });
@@ -3,8 +3,16 @@ import { SettingsRepository } from "../settings.repository";
 import { EncryptionService } from "../../../common/encryption/encryption.service";
 import { UpdateCloudflareDnsRecordDto } from "../dto/cloudflare-settings.dto";
 
+/** Upper bound for a single Cloudflare API call, connect through body. */
+const CLOUDFLARE_TIMEOUT_MS = 15_000;
+/** Back-off used when a 429 arrives without a usable Retry-After header. */
+const CLOUDFLARE_RATE_LIMIT_FALLBACK_MS = 60_000;
+
 @Injectable()
 export class CloudflareSettingsService {
+  /** Epoch ms until which calls fail fast after a 429 from Cloudflare. */
+  private rateLimitedUntil = 0;
+
   constructor(
     private readonly repo: SettingsRepository,
     private readonly enc: EncryptionService,
@@ -128,14 +136,39 @@ export class CloudflareSettingsService {
     path: string,
     init: RequestInit = {},
   ): Promise<any> {
-    const res = await fetch(`https://api.cloudflare.com/client/v4${path}`, {
-      ...init,
-      headers: {
-        Authorization: `Bearer ${token}`,
-        "Content-Type": "application/json",
-        ...(init.headers ?? {}),
-      },
-    });
+    if (Date.now() < this.rateLimitedUntil) {
+      throw this.rateLimitError();
+    }
+
+    let res: Response;
+    try {
+      res = await fetch(`https://api.cloudflare.com/client/v4${path}`, {
+        ...init,
+        headers: {
+          Authorization: `Bearer ${token}`,
+          "Content-Type": "application/json",
+          ...(init.headers ?? {}),
+        },
+        signal: AbortSignal.timeout(CLOUDFLARE_TIMEOUT_MS),
+      });
+    } catch (err) {
+      throw new BadRequestException(
+        err instanceof Error && err.name === "TimeoutError"
+          ? `Cloudflare did not respond within ${CLOUDFLARE_TIMEOUT_MS / 1000}s`
+          : `Cloudflare request failed: ${err instanceof Error ? err.message : String(err)}`,
+      );
+    }
+
+    if (res.status === 429) {
+      const retryAfter = Number(res.headers.get("retry-after"));
+      this.rateLimitedUntil =
+        Date.now() +
+        (retryAfter > 0
+          ? retryAfter * 1000
+          : CLOUDFLARE_RATE_LIMIT_FALLBACK_MS);
+      throw this.rateLimitError();
+    }
+
     const payload = await res.json().catch(() => null);
     if (!res.ok || payload?.success === false) {
       const message =
@@ -146,4 +179,10 @@ export class CloudflareSettingsService {
     }
     return payload;
   }
+
+  private rateLimitError(): BadRequestException {
+    return new BadRequestException(
+      `Cloudflare rate limit reached — retry after ${new Date(this.rateLimitedUntil).toISOString()}`,
+    );
+  }
 }
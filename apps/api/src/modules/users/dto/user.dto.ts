@@ -5,7 +5,6 @@ import {
   MaxLength,
   IsArray,
   IsEnum,
-  IsOptional,
 } from "class-validator";
 import { PartialType } from "@nestjs/mapped-types";
 import { Role } from "@bedrock-forge/shared";
@@ -5,7 +5,10 @@ import {
 } from "@nestjs/common";
 import { InjectQueue } from "@nestjs/bullmq";
 import { Queue } from "bullmq";
-import { createRemoteExecutor } from "@bedrock-forge/remote-executor";
+import {
+  createRemoteExecutor,
+  type ExecuteResult,
+} from "@bedrock-forge/remote-executor";
 import { QUEUES, JOB_TYPES } from "@bedrock-forge/shared";
 import { WpActionsRepository } from "./wp-actions.repository";
 import { ServersService } from "../servers/servers.service";
@@ -19,6 +22,8 @@ import {
 import { readFileSync } from "fs";
 import { join } from "path";
 
+const SCRIPTS_PATH = join(__dirname, "../../../../worker/scripts");
+
 @Injectable()
 export class WpActionsService {
   constructor(
@@ -133,72 +138,45 @@ export class WpActionsService {
 
   async getDebugStatus(envId: number) {
     const { executor, env } = await this.connectToEnv(envId);
-    const scriptsPath = join(__dirname, "../../../../worker/scripts");
-    const remoteScript = `/tmp/wp_debug_status_${Date.now()}.php`;
-    await executor.pushFile({
-      remotePath: remoteScript,
-      content: readFileSync(join(scriptsPath, "wp-debug.php")),
-    });
-    try {
-      const result = await executor.execute(
-        `php ${remoteScript} --docroot=${shellQuote(env.root_path ?? "")} --action=status`,
-        { timeout: 10_000 },
-      );
-      const parsed = safeJsonParse(result.stdout);
-      return parsed ?? { success: false, error: result.stderr };
-    } finally {
-      await executor
-        .execute(`rm -f ${remoteScript}`, { timeout: 5_000 })
-        .catch(() => {});
-    }
+    const result = await this.runPhpScript(
+      executor,
+      "wp-debug.php",
+      `/tmp/wp_debug_status_${Date.now()}.php`,
+      `--docroot=${shellQuote(env.root_path ?? "")} --action=status`,
+      10_000,
+    );
+    const parsed = safeJsonParse(result.stdout);
+    return parsed ?? { success: false, error: result.stderr };
   }
 
   async getLogs(envId: number, query: WpLogsQueryDto) {
     const { executor, env } = await this.connectToEnv(envId);
-    const scriptsPath = join(__dirname, "../../../../worker/scripts");
-    const remoteScript = `/tmp/wp_logs_${Date.now()}.php`;
-    await executor.pushFile({
-      remotePath: remoteScript,
-      content: readFileSync(join(scriptsPath, "wp-logs.php")),
-    });
-    try {
-      const type = query.type ?? "debug";
-      const lines = query.lines ?? 100;
-      const result = await executor.execute(
-        `php ${remoteScript} --docroot=${shellQuote(env.root_path ?? "")} --type=${shellQuote(type)} --lines=${lines}`,
-        { timeout: 15_000 },
-      );
-      return (
-        safeJsonParse(result.stdout) ?? { success: false, error: result.stderr }
-      );
-    } finally {
-      await executor
-        .execute(`rm -f ${remoteScript}`, { timeout: 5_000 })
-        .catch(() => {});
-    }
+    const type = query.type ?? "debug";
+    const lines = query.lines ?? 100;
+    const result = await this.runPhpScript(
+      executor,
+      "wp-logs.php",
+      `/tmp/wp_logs_${Date.now()}.php`,
+      `--docroot=${shellQuote(env.root_path ?? "")} --type=${shellQuote(type)} --lines=${lines}`,
+      15_000,
+    );
+    return (
+      safeJsonParse(result.stdout) ?? { success: false, error: result.stderr }
+    );
   }
 
   async getCron(envId: number) {
     const { executor, env } = await this.connectToEnv(envId);
-    const scriptsPath = join(__dirname, "../../../../worker/scripts");
-    const remoteScript = `/tmp/wp_cron_${Date.now()}.php`;
-    await executor.pushFile({
-      remotePath: remoteScript,
-      content: readFileSync(join(scriptsPath, "wp-cron.php")),
-    });
-    try {
-      const result = await executor.execute(
-        `php ${remoteScript} --docroot=${shellQuote(env.root_path ?? "")}`,
-        { timeout: 20_000 },
-      );
-      return (
-        safeJsonParse(result.stdout) ?? { success: false, error: result.stderr }
-      );
-    } finally {
-      await executor
-        .execute(`rm -f ${remoteScript}`, { timeout: 5_000 })
-        .catch(() => {});
-    }
+    const result = await this.runPhpScript(
+      executor,
+      "wp-cron.php",
+      `/tmp/wp_cron_${Date.now()}.php`,
+      `--docroot=${shellQuote(env.root_path ?? "")}`,
+      20_000,
+    );
+    return (
+      safeJsonParse(result.stdout) ?? { success: false, error: result.stderr }
+    );
   }
 
   async getMaintenanceStatus(envId: number) {
@@ -256,6 +234,34 @@ export class WpActionsService {
     return { executor, env };
   }
 
+  /**
+   * Push a worker PHP helper and run it, removing the script in the same
+   * exec. Only a failed exec (e.g. timeout) costs an extra cleanup call.
+   */
+  private async runPhpScript(
+    executor: Awaited<ReturnType<typeof createRemoteExecutor>>,
+    scriptName: string,
+    remoteScript: string,
+    args: string,
+    timeout: number,
+  ): Promise<ExecuteResult> {
+    await executor.pushFile({
+      remotePath: remoteScript,
+      content: readScript(scriptName),
+    });
+    try {
+      return await executor.execute(
+        `php ${remoteScript} ${args}; rc=$?; rm -f ${remoteScript}; exit $rc`,
+        { timeout },
+      );
+    } catch (err) {
+      await executor
+        .execute(`rm -f ${remoteScript}`, { timeout: 5_000 })
+        .catch(() => {});
+      throw err;
+    }
+  }
+
   private async resolveWpPathForStatus(
     executor: Awaited<ReturnType<typeof createRemoteExecutor>>,
     rootPath: string,
@@ -270,6 +276,18 @@ export class WpActionsService {
   }
 }
 
+/** Script bodies are immutable for the life of the process; read each once. */
+const scriptCache = new Map<string, Buffer>();
+
+function readScript(name: string): Buffer {
+  let content = scriptCache.get(name);
+  if (!content) {
+    content = readFileSync(join(SCRIPTS_PATH, name));
+    scriptCache.set(name, content);
+  }
+  return content;
+}
+
 function shellQuote(value: string): string {
   return "'" + value.replace(/'/g, "'\\''") + "'";
 }
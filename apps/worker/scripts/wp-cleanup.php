@@ -14,6 +14,7 @@
  *   - Orphaned postmeta (meta for deleted posts)
  *
  * Output: JSON { success, dry_run, counts: { revisions, transients, spam_comments, orphaned_postmeta } }
+ *         (counts are rows matched on a dry run, rows deleted on a live run)
  */
 
 $args         = getopt('', ['docroot:', 'dry-run', 'keep-revisions:']);
@@ -37,25 +38,29 @@ try {
     $prefix = $db['prefix'];
     $counts = [];
 
+    // Each category is scanned once: a dry run counts matching rows, a live
+    // run deletes them and reports the affected-row count from the DELETE
+    // itself rather than running the same predicate twice.
+
     // ── 1. Post revisions — keep the N most recent per post ─────────────────
-    // Count revisions excluding the N most recent per parent
-    $revCount = (int)$pdo->query(
-        "SELECT COUNT(*) FROM `{$prefix}posts` r
-         WHERE r.post_type = 'revision'
-           AND r.ID NOT IN (
-               SELECT id FROM (
-                   SELECT ID as id
-                   FROM `{$prefix}posts`
-                   WHERE post_type = 'revision'
-                     AND post_parent = r.post_parent
-                   ORDER BY post_date DESC
-                   LIMIT $keepRevisions
-               ) sub
-           )"
-    )->fetchColumn();
-    $counts['revisions'] = $revCount;
-    if (!$dryRun && $revCount > 0) {
-        $pdo->exec(
+    if ($dryRun) {
+        // Count revisions excluding the N most recent per parent
+        $counts['revisions'] = (int)$pdo->query(
+            "SELECT COUNT(*) FROM `{$prefix}posts` r
+             WHERE r.post_type = 'revision'
+               AND r.ID NOT IN (
+                   SELECT id FROM (
+                       SELECT ID as id
+                       FROM `{$prefix}posts`
+                       WHERE post_type = 'revision'
+                         AND post_parent = r.post_parent
+                       ORDER BY post_date DESC
+                       LIMIT $keepRevisions
+                   ) sub
+               )"
+        )->fetchColumn();
+    } else {
+        $counts['revisions'] = (int)$pdo->exec(
             "DELETE r FROM `{$prefix}posts` r
              WHERE r.post_type = 'revision'
                AND r.ID NOT IN (
@@ -72,6 +77,8 @@ try {
     }
 
     // ── 2. Expired transients ────────────────────────────────────────────────
+    // Still counted first: the DELETE removes both the timeout and the value
+    // row, so its affected-row count is not the number of transients.
     $now = time();
     $transCount = (int)$pdo->query(
         "SELECT COUNT(*) FROM `{$prefix}options`
@@ -100,23 +107,25 @@ try {
     }
 
     // ── 3. Spam comments ─────────────────────────────────────────────────────
-    $spamCount = (int)$pdo->query(
-        "SELECT COUNT(*) FROM `{$prefix}comments` WHERE comment_approved = 'spam'"
-    )->fetchColumn();
-    $counts['spam_comments'] = $spamCount;
-    if (!$dryRun && $spamCount > 0) {
-        $pdo->exec("DELETE FROM `{$prefix}comments` WHERE comment_approved = 'spam'");
+    if ($dryRun) {
+        $counts['spam_comments'] = (int)$pdo->query(
+            "SELECT COUNT(*) FROM `{$prefix}comments` WHERE comment_approved = 'spam'"
+        )->fetchColumn();
+    } else {
+        $counts['spam_comments'] = (int)$pdo->exec(
+            "DELETE FROM `{$prefix}comments` WHERE comment_approved = 'spam'"
+        );
     }
 
     // ── 4. Orphaned postmeta ─────────────────────────────────────────────────
-    $orphanCount = (int)$pdo->query(
-        "SELECT COUNT(*) FROM `{$prefix}postmeta` pm
-         LEFT JOIN `{$prefix}posts` p ON p.ID = pm.post_id
-         WHERE p.ID IS NULL"
-    )->fetchColumn();
-    $counts['orphaned_postmeta'] = $orphanCount;
-    if (!$dryRun && $orphanCount > 0) {
-        $pdo->exec(
+    if ($dryRun) {
+        $counts['orphaned_postmeta'] = (int)$pdo->query(
+            "SELECT COUNT(*) FROM `{$prefix}postmeta` pm
+             LEFT JOIN `{$prefix}posts` p ON p.ID = pm.post_id
+             WHERE p.ID IS NULL"
+        )->fetchColumn();
+    } else {
+        $counts['orphaned_postmeta'] = (int)$pdo->exec(
             "DELETE pm FROM `{$prefix}postmeta` pm
              LEFT JOIN `{$prefix}posts` p ON p.ID = pm.post_id
              WHERE p.ID IS NULL"
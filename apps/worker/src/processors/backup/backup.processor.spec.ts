@@ -19,6 +19,8 @@ function makePrisma() {
       update: jest.fn().mockResolvedValue({}),
       create: jest.fn(),
       findUniqueOrThrow: jest.fn(),
+      findMany: jest.fn().mockResolvedValue([]),
+      deleteMany: jest.fn().mockResolvedValue({ count: 0 }),
     },
     backupSchedule: {
       findUniqueOrThrow: jest.fn(),
@@ -226,4 +228,38 @@ describe("BackupProcessor", () => {
       );
     });
   });
+
+  // ── cleanupRetention ─────────────────────────────────────────────────────
+
+  describe("cleanupRetention", () => {
+    it("only queries rows beyond the retention count", async () => {
+      await (processor as any).cleanupRetention(1, 99, 5, null);
+
+      expect(prisma.backup.findMany).toHaveBeenCalledTimes(1);
+      expect(prisma.backup.findMany).toHaveBeenCalledWith(
+        expect.objectContaining({ skip: 4 }),
+      );
+      expect(prisma.backup.deleteMany).not.toHaveBeenCalled();
+      expect(queue.add).not.toHaveBeenCalled();
+    });
+
+    it("deletes each stale backup once when both limits match it", async () => {
+      const stale = { id: BigInt(7), file_path: "gdrive:f/old.tar.gz" };
+      prisma.backup.findMany
+        .mockResolvedValueOnce([stale])
+        .mockResolvedValueOnce([stale]);
+
+      await (processor as any).cleanupRetention(1, 99, 2, 30);
+
+      expect(queue.add).toHaveBeenCalledTimes(1);
+      expect(queue.add).toHaveBeenCalledWith(
+        JOB_TYPES.BACKUP_DELETE_FILE,
+        { filePath: "gdrive:f/old.tar.gz" },
+        expect.any(Object),
+      );
+      expect(prisma.backup.deleteMany).toHaveBeenCalledWith({
+        where: { id: { in: [BigInt(7)] } },
+      });
+    });
+  });
 });
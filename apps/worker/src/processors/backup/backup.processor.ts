@@ -1,7 +1,7 @@
 import { Processor, WorkerHost, InjectQueue } from "@nestjs/bullmq";
 import { Logger } from "@nestjs/common";
 import { Job, Queue } from "bullmq";
-import { mkdir, rm, readFile, stat, statfs } from "fs/promises";
+import { mkdir, rm, statfs } from "fs/promises";
 import { StepTracker } from "../../services/step-tracker";
 import { join } from "path";
 import { PrismaService } from "../../prisma/prisma.service";
@@ -175,7 +175,10 @@ export class BackupProcessor extends WorkerHost {
     const remoteOutput = `/tmp/forge_backup_${job.id}.tar.gz`;
     const localStagingDir = `${STAGING_DIR}/${job.id}`;
     const localFile = `${localStagingDir}/forge_backup_${job.id}.tar.gz`;
-    const backupFilename = `${slugify(env.project.name)}_${slugify(env.type)}_${formatTimestamp(new Date())}.tar.gz`;
+    // One clock read per run so the archive name and the Backup row's
+    // started_at always describe the same instant.
+    const startedAt = new Date();
+    const backupFilename = `${slugify(env.project.name)}_${slugify(env.type)}_${formatTimestamp(startedAt)}.tar.gz`;
     let output: { size: number; filename: string } | null = null;
 
     await tracker.track({
@@ -187,7 +190,7 @@ export class BackupProcessor extends WorkerHost {
     // Mark the pre-created Backup row as running
     await this.prisma.backup.update({
       where: { id: BigInt(backupId) },
-      data: { status: "running", started_at: new Date() },
+      data: { status: "running", started_at: startedAt },
     });
 
     try {
@@ -282,14 +285,12 @@ export class BackupProcessor extends WorkerHost {
         detail: remoteOutput,
       });
 
-      // Pre-flight disk space check: get remote file size via stat and compare
-      // against available /tmp space before committing to the SFTP download.
+      // Pre-flight disk space check: backup.php reports the archive size, so
+      // compare it against available /tmp space before committing to the SFTP
+      // download — no extra stat round-trip needed.
       try {
-        const statResult = await executor.execute(`stat -c%s ${shellQuote(remoteOutput)}`, {
-          timeout: 10_000,
-        });
-        const remoteFileBytes = parseInt(statResult.stdout.trim(), 10);
-        if (!isNaN(remoteFileBytes) && remoteFileBytes > 0) {
+        const remoteFileBytes = Number(output?.size);
+        if (Number.isFinite(remoteFileBytes) && remoteFileBytes > 0) {
           const fsInfo = await statfs("/tmp");
           const availableBytes = fsInfo.bavail * fsInfo.bsize;
           // Require 10% buffer above file size
@@ -327,22 +328,40 @@ export class BackupProcessor extends WorkerHost {
       );
       await mkdir(localStagingDir, { recursive: true });
       const pullStart = Date.now();
-      let lastLoggedMb = 0;
+      // The callback runs for every SFTP read; compare raw byte counts so the
+      // MB figure and log line are only built when one is actually emitted.
+      let nextLogAtBytes = 50 * 1024 * 1024;
+      // The progress callback already reports the cumulative byte count, so
+      // keep the last value instead of stat()ing the file again afterwards.
+      let pulledBytes = 0;
       await executor.pullFileToPath(
         remoteOutput,
         localFile,
         undefined,
         (bytes) => {
-          const mb = Math.floor(bytes / (1024 * 1024));
-          if (mb >= lastLoggedMb + 50) {
-            lastLoggedMb = mb;
+          pulledBytes = bytes;
+          if (bytes >= nextLogAtBytes) {
+            const mb = Math.floor(bytes / (1024 * 1024));
+            nextLogAtBytes = (mb + 50) * 1024 * 1024;
             this.logger.log(
               `[${job.id}] SFTP pull progress: ${mb} MB received`,
             );
           }
         },
       );
-      const { size: pulledBytes } = await stat(localFile);
+      // backup.php already reports the archive's exact size, so a byte-count
+      // match is enough to catch a truncated transfer without hashing the
+      // archive on either side.
+      const expectedBytes = Number(output?.size);
+      if (
+        Number.isFinite(expectedBytes) &&
+        expectedBytes > 0 &&
+        pulledBytes !== expectedBytes
+      ) {
+        throw new Error(
+          `Backup pull incomplete: received ${pulledBytes} of ${expectedBytes} bytes`,
+        );
+      }
       await tracker.track({
         step: "Backup pulled via SFTP",
         level: "info",
@@ -355,6 +374,16 @@ export class BackupProcessor extends WorkerHost {
       });
 
       // ── Step D: Upload to Google Drive ────────────────────────────────────
+      // The remote script and archive are no longer needed once pulled, so
+      // their cleanup runs on the server while rclone uploads the local copy
+      // instead of waiting for the upload to finish. The noop catch only
+      // stops an early rejection from going unhandled if the upload throws;
+      // the result is still awaited (and any error surfaced) in Step E.
+      const cleanCmd = `rm -f ${shellQuote(remoteScript)} ${shellQuote(remoteOutput)}`;
+      const cleanStart = Date.now();
+      const cleanPromise = executor.execute(cleanCmd);
+      cleanPromise.catch(() => undefined);
+
       const configWritten = await this.rclone.writeConfig();
       if (!configWritten) {
         throw new Error(
@@ -381,9 +410,7 @@ export class BackupProcessor extends WorkerHost {
       await job.updateProgress({ value: 85, step: "Uploaded to Google Drive" });
 
       // ── Step E: Remote cleanup ──────────────────────────────────────────
-      const cleanCmd = `rm -f ${shellQuote(remoteScript)} ${shellQuote(remoteOutput)}`;
-      const cleanStart = Date.now();
-      const cleanResult = await executor.execute(cleanCmd);
+      const cleanResult = await cleanPromise;
       await tracker.trackCommand(
         "Remote temp file cleanup",
         cleanCmd,
@@ -540,8 +567,11 @@ export class BackupProcessor extends WorkerHost {
       // ── Step C: Stream archive directly from Google Drive → server ──────
       // Zero local temp files — rclone stdout is piped directly into SFTP.
       const totalBytes = backup.size_bytes ? Number(backup.size_bytes) : 0;
+      // Byte thresholds for the next cancellation check / progress write, so
+      // the per-chunk callback is a pair of comparisons until one is due.
+      let nextLogAtBytes = 50 * 1024 * 1024;
+      let nextCancelCheckAtBytes = 10 * 1024 * 1024;
       let lastLoggedMb = 0;
-      let lastCancelCheckMb = 0;
 
       await tracker.track({
         step: "Streaming archive from Google Drive to server",
@@ -565,20 +595,27 @@ export class BackupProcessor extends WorkerHost {
         downloadStream,
         45 * 60 * 1000,
         async (bytesTransferred) => {
+          if (
+            bytesTransferred < nextCancelCheckAtBytes &&
+            bytesTransferred < nextLogAtBytes
+          ) {
+            return;
+          }
           const mb = Math.floor(bytesTransferred / (1024 * 1024));
 
           // Check for user cancellation every ~10 MB — responsive but
           // avoids a Redis round-trip on every SFTP chunk event.
-          if (mb >= lastCancelCheckMb + 10) {
-            lastCancelCheckMb = mb;
+          if (bytesTransferred >= nextCancelCheckAtBytes) {
+            nextCancelCheckAtBytes = (mb + 10) * 1024 * 1024;
             if (await tracker.isCancelled(this.backupsQueue)) {
               rcloneChild.kill("SIGTERM");
               throw new Error("Cancelled by user");
             }
           }
 
-          if (mb >= lastLoggedMb + 50) {
+          if (bytesTransferred >= nextLogAtBytes) {
             lastLoggedMb = mb;
+            nextLogAtBytes = (mb + 50) * 1024 * 1024;
             const totalMb =
               totalBytes > 0 ? Math.round(totalBytes / 1024 / 1024) : 0;
             const pct =
@@ -825,8 +862,9 @@ export class BackupProcessor extends WorkerHost {
                 }
               }
             } finally {
-              await cleanupRemoteMyCnf(executor, srMycnf);
-              await executor.execute(`rm -f ${srScript}`).catch(() => {});
+              await executor
+                .execute(`rm -f ${shellQuote(srMycnf)} ${shellQuote(srScript)}`)
+                .catch(() => {});
             }
 
             // Replace hardcoded URLs in wp-content files (CSS, JS, PHP, etc.)
@@ -839,19 +877,25 @@ export class BackupProcessor extends WorkerHost {
             if (altSrc && altTgt && altSrc !== tgtUrl)
               filePairs.push([altSrc, altTgt]);
 
-            for (const [oldUrl, newUrl] of filePairs) {
-              await executor
-                .execute(
-                  [
-                    `find ${shellQuote(wpContent)} -type f`,
-                    `\\( -name '*.css' -o -name '*.js' -o -name '*.json' -o -name '*.html'`,
-                    `-o -name '*.htm' -o -name '*.svg' -o -name '*.xml' -o -name '*.txt'`,
-                    `-o -name '*.php' \\)`,
-                    `-exec sed -i 's|${sedEscape(oldUrl)}|${sedEscape(newUrl)}|g' {} +`,
-                  ].join(" "),
-                )
-                .catch(() => {});
-            }
+            // One tree walk and one SSH exec for every pair: sed applies the
+            // -e expressions in order, exactly like the sequential passes did.
+            const sedArgs = filePairs
+              .map(
+                ([oldUrl, newUrl]) =>
+                  `-e ${shellQuote(`s|${sedEscape(oldUrl)}|${sedEscape(newUrl)}|g`)}`,
+              )
+              .join(" ");
+            await executor
+              .execute(
+                [
+                  `find ${shellQuote(wpContent)} -type f`,
+                  `\\( -name '*.css' -o -name '*.js' -o -name '*.json' -o -name '*.html'`,
+                  `-o -name '*.htm' -o -name '*.svg' -o -name '*.xml' -o -name '*.txt'`,
+                  `-o -name '*.php' \\)`,
+                  `-exec sed -i ${sedArgs} {} +`,
+                ].join(" "),
+              )
+              .catch(() => {});
 
             // Flush caches
             const wpCli = await WpCliBuilder.create(executor, env.root_path);
@@ -946,6 +990,7 @@ export class BackupProcessor extends WorkerHost {
 
     // Create the Backup and JobExecution rows, then delegate to handleCreate
     const bullJobId = job.id ?? String(scheduleId);
+    const runAt = new Date();
 
     const exec = await this.prisma.jobExecution.create({
       data: {
@@ -953,7 +998,7 @@ export class BackupProcessor extends WorkerHost {
         bull_job_id: bullJobId,
         environment_id: BigInt(environmentId),
         status: "active",
-        started_at: new Date(),
+        started_at: runAt,
         payload: { scheduleId, environmentId, type } as object,
       },
     });
@@ -985,7 +1030,7 @@ export class BackupProcessor extends WorkerHost {
         job_execution_id: exec.id,
         type: type as "full" | "db_only" | "files_only",
         status: "running",
-        started_at: new Date(),
+        started_at: runAt,
       },
     });
 
@@ -993,7 +1038,7 @@ export class BackupProcessor extends WorkerHost {
     await this.prisma.backupSchedule
       .update({
         where: { id: BigInt(scheduleId) },
-        data: { last_run_at: new Date() },
+        data: { last_run_at: runAt },
       })
       .catch((e) =>
         this.logger.warn(`Could not update schedule last_run_at: ${e}`),
@@ -1045,38 +1090,47 @@ export class BackupProcessor extends WorkerHost {
   ): Promise<void> {
     if (!retentionCount && !retentionDays) return;
 
-    // Fetch all completed scheduled backups for this environment,
-    // ordered newest-first, excluding the backup just created.
-    const scheduledBackups = await this.prisma.backup.findMany({
-      where: {
-        environment_id: BigInt(environmentId),
-        status: "completed",
-        id: { not: BigInt(justCreatedBackupId) },
-        jobExecution: {
-          job_type: JOB_TYPES.BACKUP_SCHEDULED,
-        },
+    const where = {
+      environment_id: BigInt(environmentId),
+      status: "completed" as const,
+      id: { not: BigInt(justCreatedBackupId) },
+      jobExecution: {
+        job_type: JOB_TYPES.BACKUP_SCHEDULED,
       },
-      orderBy: { created_at: "desc" },
-      select: { id: true, file_path: true, created_at: true },
-    });
-
-    const toDelete = new Set<bigint>();
-
-    // Count limit: justCreated counts as 1. Keep (retentionCount - 1) from
-    // the sorted list and mark the remainder for deletion.
-    if (retentionCount && scheduledBackups.length >= retentionCount) {
-      for (const b of scheduledBackups.slice(retentionCount - 1)) {
-        toDelete.add(b.id);
-      }
-    }
+    };
+    const select = { id: true, file_path: true } as const;
+
+    // Only fetch the rows that are actually past a limit, so the common case
+    // (history still within policy) reads nothing instead of every backup.
+    const [overCount, overAge] = await Promise.all([
+      // Count limit: justCreated counts as 1. Skip the (retentionCount - 1)
+      // newest and everything after that is stale.
+      retentionCount
+        ? this.prisma.backup.findMany({
+            where,
+            orderBy: { created_at: "desc" },
+            skip: retentionCount - 1,
+            select,
+          })
+        : [],
+      // Age limit: anything older than retentionDays.
+      retentionDays
+        ? this.prisma.backup.findMany({
+            where: {
+              ...where,
+              created_at: {
+                lt: new Date(
+                  Date.now() - retentionDays * 24 * 60 * 60 * 1000,
+                ),
+              },
+            },
+            select,
+          })
+        : [],
+    ]);
 
-    // Age limit: mark anything older than retentionDays for deletion.
-    if (retentionDays) {
-      const cutoff = new Date(Date.now() - retentionDays * 24 * 60 * 60 * 1000);
-      for (const b of scheduledBackups) {
-        if (b.created_at < cutoff) toDelete.add(b.id);
-      }
-    }
+    const toDelete = new Map<bigint, string | null>();
+    for (const b of [...overCount, ...overAge]) toDelete.set(b.id, b.file_path);
 
     if (toDelete.size === 0) return;
 
@@ -1085,19 +1139,18 @@ export class BackupProcessor extends WorkerHost {
     );
 
     // Enqueue GDrive file deletion before removing DB rows (fire-and-forget)
-    for (const id of toDelete) {
-      const b = scheduledBackups.find((sb) => sb.id === id);
-      if (b?.file_path) {
+    for (const filePath of toDelete.values()) {
+      if (filePath) {
         await this.backupsQueue.add(
           JOB_TYPES.BACKUP_DELETE_FILE,
-          { filePath: b.file_path },
+          { filePath },
           { ...DEFAULT_JOB_OPTIONS, attempts: 5 },
         );
       }
     }
 
     await this.prisma.backup.deleteMany({
-      where: { id: { in: [...toDelete] } },
+      where: { id: { in: [...toDelete.keys()] } },
     });
   }
 
@@ -25,6 +25,25 @@ import {
   WpCliBuilder,
 } from "../../utils/processor-utils";
 
+// Polling for a child backup/restore job backs off from JOB_POLL_INITIAL_MS to
+// JOB_POLL_MAX_MS, so short jobs are noticed within a second or two instead of
+// on the next fixed 5 s tick, while long ones are still polled at 5 s.
+const JOB_POLL_INITIAL_MS = 1_000;
+const JOB_POLL_MAX_MS = 5_000;
+
+// WordPress auth keys and salts written to a new site's .env, in Bedrock's
+// .env.example order. Each gets 64 characters from one shared random draw.
+const WP_SALT_KEYS = [
+  "AUTH_KEY",
+  "SECURE_AUTH_KEY",
+  "LOGGED_IN_KEY",
+  "NONCE_KEY",
+  "AUTH_SALT",
+  "SECURE_AUTH_SALT",
+  "LOGGED_IN_SALT",
+  "NONCE_SALT",
+] as const;
+
 // concurrency=1: Bedrock provisioning runs composer, git clone, SSH commands.
 @Processor(QUEUES.PROJECTS, { concurrency: 1 })
 export class CreateBedrockProcessor extends WorkerHost {
@@ -80,6 +99,16 @@ export class CreateBedrockProcessor extends WorkerHost {
       );
       await job.updateProgress({ value: 5, step: "Connected to server" });
 
+      // A fresh install needs Composer, which depends only on the server —
+      // check (and if needed install) it over SSH while CyberPanel creates
+      // the website and database over HTTP.
+      const composerReady = sourceEnvironmentId
+        ? null
+        : this.ensureComposer(executor);
+      // Awaited in 2b; this only keeps a CyberPanel failure that aborts the
+      // job first from leaving the rejection unhandled.
+      composerReady?.catch(() => {});
+
       // ── 1. CyberPanel provisioning ───────────────────────────────────
 
       if (cyberpanel) {
@@ -199,9 +228,13 @@ export class CreateBedrockProcessor extends WorkerHost {
           dbHost: this.encryption.decrypt(sc.db_host_encrypted),
         };
 
-        const srcExecutor = createRemoteExecutor(
-          await this.sshKey.getSshConfig(srcEnv.server),
-        );
+        // Cloning from an environment on the same server (the usual
+        // staging → production case) keeps working on the job's executor:
+        // no second SSH config, and the dump never leaves the server.
+        const sameServer = srcEnv.server.id === server.id;
+        const srcExecutor = sameServer
+          ? executor
+          : createRemoteExecutor(await this.sshKey.getSshConfig(srcEnv.server));
 
         await job.updateProgress({
           value: 35,
@@ -231,8 +264,11 @@ export class CreateBedrockProcessor extends WorkerHost {
         await job.updateProgress({ value: 50, step: "Source database dumped" });
 
         // ── Transfer + import ──
-        const dumpBuffer = await srcExecutor.pullFile(dumpTmp);
-        await srcExecutor.execute(`rm -f ${shellQuote(dumpTmp)}`).catch(() => {});
+        if (!sameServer) {
+          const dumpBuffer = await srcExecutor.pullFile(dumpTmp);
+          await srcExecutor.execute(`rm -f ${shellQuote(dumpTmp)}`).catch(() => {});
+          await executor.pushFile({ remotePath: dumpTmp, content: dumpBuffer });
+        }
 
         const dbName = cyberpanel?.dbName ?? srcCreds.dbName;
         const dbUser = cyberpanel?.dbUser ?? srcCreds.dbUser;
@@ -245,7 +281,6 @@ export class CreateBedrockProcessor extends WorkerHost {
           job.id ?? "default",
           "cb_tgt",
         );
-        await executor.pushFile({ remotePath: dumpTmp, content: dumpBuffer });
         try {
           const importResult = await executor.execute(
             `mysql --defaults-extra-file=${shellQuote(tgtMycnf)} ${shellQuote(dbName)} < ${shellQuote(dumpTmp)}`,
@@ -265,7 +300,7 @@ export class CreateBedrockProcessor extends WorkerHost {
         const srcPath = srcEnv.root_path?.replace(/\/+$/, "") ?? "";
         const tgtPath = env.root_path?.replace(/\/+$/, "") ?? "";
 
-        if (srcPath && tgtPath && srcEnv.server.id === server.id) {
+        if (srcPath && tgtPath && sameServer) {
           // Same server — local rsync
           await executor.execute(
             `rsync -a --delete ${shellQuote(srcPath + "/")} ${shellQuote(tgtPath + "/")}`,
@@ -274,12 +309,14 @@ export class CreateBedrockProcessor extends WorkerHost {
           // Cross-server via tar pipe
           const srcKey = await this.sshKey.resolvePrivateKey(srcEnv.server);
           const keyTmp = `/tmp/cb_key_${job.id}`;
-          await executor.pushFile({ remotePath: keyTmp, content: srcKey });
-          await executor.execute(`chmod 600 ${shellQuote(keyTmp)}`);
+          await executor.pushFile({
+            remotePath: keyTmp,
+            content: srcKey,
+            mode: 0o600,
+          });
           try {
-            await executor.execute(`mkdir -p ${shellQuote(tgtPath)}`);
             const pullResult = await executor.execute(
-              `ssh -o StrictHostKeyChecking=no -i ${shellQuote(keyTmp)} ${shellQuote(srcEnv.server.ssh_user)}@${shellQuote(srcEnv.server.ip_address)} "tar -cz -C ${shellQuote(srcPath)} ." | tar -xz -C ${shellQuote(tgtPath)}`,
+              `mkdir -p ${shellQuote(tgtPath)} && ssh -o StrictHostKeyChecking=no -i ${shellQuote(keyTmp)} ${shellQuote(srcEnv.server.ssh_user)}@${shellQuote(srcEnv.server.ip_address)} "tar -cz -C ${shellQuote(srcPath)} ." | tar -xz -C ${shellQuote(tgtPath)}`,
             );
             if (pullResult.code !== 0) {
               throw new Error(`Failed to transfer files from source server: ${pullResult.stderr}`);
@@ -433,15 +470,7 @@ export class CreateBedrockProcessor extends WorkerHost {
         const dbPassword = cyberpanel?.dbPassword ?? "";
         const dbHost = cyberpanel?.dbHost ?? "localhost";
 
-        // Install Composer if missing
-        const composerCheck = await executor.execute(
-          "command -v composer && echo ok || echo missing",
-        );
-        if (composerCheck.stdout.trim().includes("missing")) {
-          await executor.execute(
-            "php -r \"copy('https://getcomposer.org/installer', '/tmp/composer-setup.php');\" && php /tmp/composer-setup.php --install-dir=/usr/local/bin --filename=composer && rm /tmp/composer-setup.php",
-          );
-        }
+        await composerReady;
         await job.updateProgress({ value: 40, step: "Composer ready" });
 
         // Create Bedrock project
@@ -543,6 +572,20 @@ export class CreateBedrockProcessor extends WorkerHost {
     }
   }
 
+  /** Install Composer globally unless it is already on the PATH. */
+  private async ensureComposer(
+    executor: ReturnType<typeof createRemoteExecutor>,
+  ): Promise<void> {
+    const composerCheck = await executor.execute(
+      "command -v composer && echo ok || echo missing",
+    );
+    if (composerCheck.stdout.trim().includes("missing")) {
+      await executor.execute(
+        "php -r \"copy('https://getcomposer.org/installer', '/tmp/composer-setup.php');\" && php /tmp/composer-setup.php --install-dir=/usr/local/bin --filename=composer && rm /tmp/composer-setup.php",
+      );
+    }
+  }
+
   private async writeEnvFile(
     executor: ReturnType<typeof createRemoteExecutor>,
     rootPath: string,
@@ -553,8 +596,12 @@ export class CreateBedrockProcessor extends WorkerHost {
     wpEnv: string,
     wpHome: string,
   ) {
-    // 64-character cryptographically secure random salt per WordPress specification
-    const salt = () => randomBytes(48).toString("base64url").slice(0, 64);
+    // 64-character cryptographically secure random salt per WordPress
+    // specification. 48 random bytes encode to exactly 64 base64url chars, so
+    // every salt comes from a single randomBytes() draw.
+    const saltPool = randomBytes(WP_SALT_KEYS.length * 48).toString(
+      "base64url",
+    );
 
     const escapeSingleQuote = (val: string) => val.replace(/'/g, "\\'");
     const envContent = [
@@ -567,14 +614,9 @@ export class CreateBedrockProcessor extends WorkerHost {
       `WP_HOME='${escapeSingleQuote(wpHome)}'`,
       `WP_SITEURL=\${WP_HOME}/wp`,
       ``,
-      `AUTH_KEY='${salt()}'`,
-      `SECURE_AUTH_KEY='${salt()}'`,
-      `LOGGED_IN_KEY='${salt()}'`,
-      `NONCE_KEY='${salt()}'`,
-      `AUTH_SALT='${salt()}'`,
-      `SECURE_AUTH_SALT='${salt()}'`,
-      `LOGGED_IN_SALT='${salt()}'`,
-      `NONCE_SALT='${salt()}'`,
+      ...WP_SALT_KEYS.map(
+        (key, i) => `${key}='${saltPool.slice(i * 64, (i + 1) * 64)}'`,
+      ),
     ].join("\n");
 
     await executor.pushFile({
@@ -583,6 +625,45 @@ export class CreateBedrockProcessor extends WorkerHost {
     });
   }
 
+  /**
+   * Remove a site's database and user in one exec: `cyberpanel deleteDatabase`
+   * first and, only if that fails, drop the database, the local user and
+   * CyberPanel's record of it directly. `--force` keeps mysql going past a
+   * failing statement so each cleanup step still runs on its own.
+   */
+  private async dropSiteDatabase(
+    executor: ReturnType<typeof createRemoteExecutor>,
+    dbName: string,
+    dbUser: string,
+  ): Promise<void> {
+    const sql = [
+      `DROP DATABASE IF EXISTS \`${dbName}\`;`,
+      `DROP USER IF EXISTS '${dbUser}'@'localhost';`,
+      `DELETE FROM cyberpanel.databases_databases WHERE dbname='${dbName}';`,
+      "FLUSH PRIVILEGES;",
+    ].join(" ");
+    const result = await executor.execute(
+      `out=$(cyberpanel deleteDatabase --databaseName ${shellQuote(dbName)} 2>&1); rc=$?; ` +
+        `echo "cli=$rc"; ` +
+        `if [ $rc -ne 0 ]; then echo "$out"; mysql --force -e ${shellQuote(sql)} 2>&1; fi`,
+    );
+    const [marker, ...output] = result.stdout.split("\n");
+    const cliCode = marker?.match(/^cli=(\d+)$/)?.[1];
+
+    if (cliCode === "0") {
+      this.logger.log(`Deleted database ${dbName} via CyberPanel CLI`);
+      return;
+    }
+    this.logger.warn(
+      `CyberPanel CLI database deletion failed (code ${cliCode ?? "?"}) — fell back to manual MySQL cleanup: ${output.join("\n") || result.stderr}`,
+    );
+    if (result.code !== 0) {
+      this.logger.warn(
+        `Manual MySQL cleanup for ${dbName} reported errors (exit ${result.code})`,
+      );
+    }
+  }
+
   private async storeDbCredentials(
     environmentId: number,
     dbName: string,
@@ -648,72 +729,136 @@ export class CreateBedrockProcessor extends WorkerHost {
       const totalSteps = envs.length * ( (createBackup ? 1 : 0) + (deleteFromCyberpanel ? 1 : 0) );
       let currentStep = 0;
 
-      for (const env of envs) {
-        // Step 1: Create Backup
-        if (createBackup) {
-          await job.updateProgress({
-            value: Math.round((currentStep / totalSteps) * 100),
-            step: `Backing up environment: ${env.type}`,
-          });
-
+      // Step 1: Back up every environment before anything is deleted. All
+      // backup jobs are enqueued together and awaited as a set, so the
+      // backups queue runs them side by side instead of one environment's
+      // full backup wait after another.
+      if (createBackup) {
+        for (const env of envs) {
           if (!env.google_drive_folder_id) {
             throw new Error(`Environment ${env.id} (${env.type}) has no Google Drive folder ID configured`);
           }
+        }
 
-          const bullJobId = randomUUID();
-          const backupExec = await this.prisma.jobExecution.create({
-            data: {
-              queue_name: QUEUES.BACKUPS,
-              job_type: JOB_TYPES.BACKUP_CREATE,
-              bull_job_id: bullJobId,
-              environment_id: env.id,
-              status: "queued",
-              payload: { environmentId: Number(env.id), type: "full" },
-            },
-          });
-
-          const backup = await this.prisma.backup.create({
-            data: {
-              environment_id: env.id,
-              type: "full",
-              status: "pending",
-            },
-          });
+        await job.updateProgress({
+          value: 0,
+          step: `Backing up ${envs.length} environment(s)`,
+        });
 
-          await this.backupsQueue.add(
-            JOB_TYPES.BACKUP_CREATE,
-            {
-              environmentId: Number(env.id),
-              type: "full",
-              jobExecutionId: Number(backupExec.id),
-              backupId: Number(backup.id),
-            },
-            { ...BACKUP_JOB_OPTIONS, jobId: bullJobId },
-          );
+        const backupExecs = await Promise.all(
+          envs.map(async (env) => {
+            const bullJobId = randomUUID();
+            const backupExec = await this.prisma.jobExecution.create({
+              data: {
+                queue_name: QUEUES.BACKUPS,
+                job_type: JOB_TYPES.BACKUP_CREATE,
+                bull_job_id: bullJobId,
+                environment_id: env.id,
+                status: "queued",
+                payload: { environmentId: Number(env.id), type: "full" },
+              },
+            });
 
-          // Poll for backup completion
-          let isDone = false;
-          const startTime = Date.now();
-          while (!isDone && (Date.now() - startTime < 15 * 60 * 1000)) {
-            const exec = await this.prisma.jobExecution.findUnique({
-              where: { id: backupExec.id },
+            const backup = await this.prisma.backup.create({
+              data: {
+                environment_id: env.id,
+                type: "full",
+                status: "pending",
+              },
             });
-            if (!exec) throw new Error("Backup execution trace deleted");
-            if (exec.status === "completed") {
-              isDone = true;
-            } else if (exec.status === "failed") {
-              throw new Error(`Backup failed: ${exec.last_error}`);
-            } else {
-              await new Promise((resolve) => setTimeout(resolve, 5000));
+
+            await this.backupsQueue.add(
+              JOB_TYPES.BACKUP_CREATE,
+              {
+                environmentId: Number(env.id),
+                type: "full",
+                jobExecutionId: Number(backupExec.id),
+                backupId: Number(backup.id),
+              },
+              { ...BACKUP_JOB_OPTIONS, jobId: bullJobId },
+            );
+            return { env, backupExec };
+          }),
+        );
+
+        // Poll for backup completion. Each backup gets 15 minutes from when
+        // a worker picks it up — time spent queued behind the other
+        // environments' backups doesn't count, within an overall cap.
+        const backupTimeoutMs = 15 * 60 * 1000;
+        const queuedAt = Date.now();
+        const overallDeadline = queuedAt + backupTimeoutMs * envs.length;
+        // Once one backup fails the archive is abandoned; stop the sibling
+        // polls rather than leaving them running after the job has failed.
+        let abandoned = false;
+        await Promise.all(
+          backupExecs.map(async ({ env, backupExec }) => {
+            let isDone = false;
+            let pollDelayMs = JOB_POLL_INITIAL_MS;
+            let startTime = queuedAt;
+            while (
+              !isDone &&
+              !abandoned &&
+              Date.now() - startTime < backupTimeoutMs &&
+              Date.now() < overallDeadline
+            ) {
+              const exec = await this.prisma.jobExecution.findUnique({
+                where: { id: backupExec.id },
+              });
+              if (!exec) {
+                abandoned = true;
+                throw new Error("Backup execution trace deleted");
+              }
+              if (exec.status === "completed") {
+                isDone = true;
+              } else if (exec.status === "failed") {
+                abandoned = true;
+                throw new Error(`Backup failed: ${exec.last_error}`);
+              } else {
+                if (exec.status === "queued") startTime = Date.now();
+                await new Promise((resolve) => setTimeout(resolve, pollDelayMs));
+                pollDelayMs = Math.min(pollDelayMs * 2, JOB_POLL_MAX_MS);
+              }
+            }
+            if (abandoned) return;
+            if (!isDone) {
+              abandoned = true;
+              throw new Error(`Backup of environment ${env.id} (${env.type}) timed out after 15 minutes`);
             }
-          }
-          if (!isDone) {
-            throw new Error(`Backup timed out after 15 minutes`);
-          }
 
-          currentStep++;
+            currentStep++;
+            await job.updateProgress({
+              value: Math.round((currentStep / totalSteps) * 100),
+              step: `Backed up environment: ${env.type}`,
+            });
+          }),
+        );
+      }
+
+      // Environments of one project usually share a server: resolve its SSH
+      // key, executor and CyberPanel login once for the whole archive rather
+      // than per env.
+      const executors = new Map<bigint, ReturnType<typeof createRemoteExecutor>>();
+      const executorFor = async (server: (typeof envs)[number]["server"]) => {
+        let executor = executors.get(server.id);
+        if (!executor) {
+          executor = createRemoteExecutor(await this.sshKey.getSshConfig(server));
+          executors.set(server.id, executor);
         }
+        return executor;
+      };
+      const cpCredsByServer = new Map<bigint, CpCreds>();
+      const cpCredsFor = (server: (typeof envs)[number]["server"]) => {
+        let creds = cpCredsByServer.get(server.id);
+        if (!creds) {
+          creds = JSON.parse(
+            this.encryption.decrypt(server.cyberpanel_login as string),
+          ) as CpCreds;
+          cpCredsByServer.set(server.id, creds);
+        }
+        return creds;
+      };
 
+      for (const env of envs) {
         // Step 2: Delete from CyberPanel
         if (deleteFromCyberpanel) {
           await job.updateProgress({
@@ -723,8 +868,7 @@ export class CreateBedrockProcessor extends WorkerHost {
 
           const server = env.server;
           if (server.cyberpanel_login) {
-            const raw = this.encryption.decrypt(server.cyberpanel_login as string);
-            const cpCreds = JSON.parse(raw) as CpCreds;
+            const cpCreds = cpCredsFor(server);
             const domain = this.getDomainFromUrl(env.url);
 
             this.logger.log(`Deleting CyberPanel website ${domain} for env ${env.id}`);
@@ -754,36 +898,9 @@ export class CreateBedrockProcessor extends WorkerHost {
               }
 
               this.logger.log(`Dropping database ${dbName} and user ${dbUser} on server ${server.id}`);
-              const sshConfig = await this.sshKey.getSshConfig(server);
-              const executor = createRemoteExecutor(sshConfig);
+              const executor = await executorFor(server);
 
-              this.logger.log(`Attempting CyberPanel CLI database deletion for ${dbName}`);
-              const cpCliResult = await executor.execute(`cyberpanel deleteDatabase --databaseName ${shellQuote(dbName)}`);
-              if (cpCliResult.code === 0) {
-                this.logger.log(`Successfully deleted database ${dbName} via CyberPanel CLI`);
-              } else {
-                this.logger.warn(`CyberPanel CLI database deletion failed (code ${cpCliResult.code}): ${cpCliResult.stderr || cpCliResult.stdout}. Falling back to manual MySQL cleanup.`);
-
-                // 1. Drop the actual database
-                await executor.execute(`mysql -e ${shellQuote(`DROP DATABASE IF EXISTS \`${dbName}\`;`)}`).catch((err) => {
-                  this.logger.warn(`Failed to drop database \`${dbName}\`: ${err instanceof Error ? err.message : String(err)}`);
-                });
-
-                // 2. Drop the local MySQL user
-                await executor.execute(`mysql -e ${shellQuote(`DROP USER IF EXISTS '${dbUser}'@'localhost';`)}`).catch((err) => {
-                  this.logger.warn(`Failed to drop MySQL user '${dbUser}': ${err instanceof Error ? err.message : String(err)}`);
-                });
-
-                // 3. Delete metadata from CyberPanel's internal MySQL system database
-                await executor.execute(`mysql -e ${shellQuote(`DELETE FROM cyberpanel.databases_databases WHERE dbname='${dbName}';`)}`).catch((err) => {
-                  this.logger.warn(`Failed to delete record from cyberpanel.databases_databases for '${dbName}': ${err instanceof Error ? err.message : String(err)}`);
-                });
-
-                // 4. Flush privileges to ensure changes take effect
-                await executor.execute(`mysql -e ${shellQuote("FLUSH PRIVILEGES;")}`).catch((err) => {
-                  this.logger.warn(`Failed to flush MySQL privileges: ${err instanceof Error ? err.message : String(err)}`);
-                });
-              }
+              await this.dropSiteDatabase(executor, dbName, dbUser);
 
               this.logger.log(`Successfully completed cleanup for database ${dbName} and user ${dbUser} on server ${server.id}`);
             } catch (dbErr) {
@@ -956,6 +1073,7 @@ export class CreateBedrockProcessor extends WorkerHost {
 
         // Poll for restore completion
         let isDone = false;
+        let pollDelayMs = JOB_POLL_INITIAL_MS;
         const startTime = Date.now();
         while (!isDone && (Date.now() - startTime < 15 * 60 * 1000)) {
           const exec = await this.prisma.jobExecution.findUnique({
@@ -967,7 +1085,8 @@ export class CreateBedrockProcessor extends WorkerHost {
           } else if (exec.status === "failed") {
             throw new Error(`Backup restore failed: ${exec.last_error}`);
           } else {
-            await new Promise((resolve) => setTimeout(resolve, 5000));
+            await new Promise((resolve) => setTimeout(resolve, pollDelayMs));
+            pollDelayMs = Math.min(pollDelayMs * 2, JOB_POLL_MAX_MS);
           }
         }
         if (!isDone) {
@@ -1067,33 +1186,7 @@ export class CreateBedrockProcessor extends WorkerHost {
               const sshConfig = await this.sshKey.getSshConfig(server);
               const executor = createRemoteExecutor(sshConfig);
 
-              this.logger.log(`Attempting CyberPanel CLI database deletion for ${dbName}`);
-              const cpCliResult = await executor.execute(`cyberpanel deleteDatabase --databaseName ${shellQuote(dbName)}`);
-              if (cpCliResult.code === 0) {
-                this.logger.log(`Successfully deleted database ${dbName} via CyberPanel CLI`);
-              } else {
-                this.logger.warn(`CyberPanel CLI database deletion failed (code ${cpCliResult.code}): ${cpCliResult.stderr || cpCliResult.stdout}. Falling back to manual MySQL cleanup.`);
-
-                // 1. Drop the actual database
-                await executor.execute(`mysql -e ${shellQuote(`DROP DATABASE IF EXISTS \`${dbName}\`;`)}`).catch((err) => {
-                  this.logger.warn(`Failed to drop database \`${dbName}\`: ${err instanceof Error ? err.message : String(err)}`);
-                });
-
-                // 2. Drop the local MySQL user
-                await executor.execute(`mysql -e ${shellQuote(`DROP USER IF EXISTS '${dbUser}'@'localhost';`)}`).catch((err) => {
-                  this.logger.warn(`Failed to drop MySQL user '${dbUser}': ${err instanceof Error ? err.message : String(err)}`);
-                });
-
-                // 3. Delete metadata from CyberPanel's internal MySQL system database
-                await executor.execute(`mysql -e ${shellQuote(`DELETE FROM cyberpanel.databases_databases WHERE dbname='${dbName}';`)}`).catch((err) => {
-                  this.logger.warn(`Failed to delete record from cyberpanel.databases_databases for '${dbName}': ${err instanceof Error ? err.message : String(err)}`);
-                });
-
-                // 4. Flush privileges to ensure changes take effect
-                await executor.execute(`mysql -e ${shellQuote("FLUSH PRIVILEGES;")}`).catch((err) => {
-                  this.logger.warn(`Failed to flush MySQL privileges: ${err instanceof Error ? err.message : String(err)}`);
-                });
-              }
+              await this.dropSiteDatabase(executor, dbName, dbUser);
 
               this.logger.log(`Successfully completed cleanup for database ${dbName} and user ${dbUser} on server ${server.id}`);
             } catch (dbErr) {
@@ -6,7 +6,10 @@ import { EncryptionModule } from "../../encryption/encryption.module";
 
 @Module({
   imports: [
-    BullModule.registerQueue({ name: QUEUES.CUSTOM_PLUGINS }),
+    BullModule.registerQueue(
+      { name: QUEUES.CUSTOM_PLUGINS },
+      { name: QUEUES.PLUGIN_SCANS },
+    ),
     EncryptionModule,
   ],
   providers: [CustomPluginProcessor],
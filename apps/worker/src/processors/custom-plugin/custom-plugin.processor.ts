@@ -1,6 +1,6 @@
-import { Processor, WorkerHost } from "@nestjs/bullmq";
+import { InjectQueue, Processor, WorkerHost } from "@nestjs/bullmq";
 import { Logger } from "@nestjs/common";
-import { Job } from "bullmq";
+import { Job, Queue } from "bullmq";
 import { join } from "path";
 import { PrismaService } from "../../prisma/prisma.service";
 import { SshKeyService } from "../../services/ssh-key.service";
@@ -28,6 +28,8 @@ export class CustomPluginProcessor extends WorkerHost {
     private readonly config: ConfigService,
     private readonly sshKey: SshKeyService,
     private readonly encryption: EncryptionService,
+    @InjectQueue(QUEUES.PLUGIN_SCANS)
+    private readonly pluginScansQueue: Queue,
   ) {
     super();
   }
@@ -262,17 +264,11 @@ export class CustomPluginProcessor extends WorkerHost {
           bull_job_id: scanBullJobId,
         },
       });
-      const { Queue } = await import("bullmq");
-      const redisUrl = this.config.get<string>("redis.url")!;
-      const scanQueue = new Queue(QUEUES.PLUGIN_SCANS, {
-        connection: { url: redisUrl },
-      });
-      await scanQueue.add(
+      await this.pluginScansQueue.add(
         JOB_TYPES.PLUGIN_SCAN_RUN,
         { environmentId, jobExecutionId: Number(scanExec.id) },
         { jobId: scanBullJobId },
       );
-      await scanQueue.close();
 
       await job.updateProgress(100);
 
@@ -379,6 +379,65 @@ describe("MonitorProcessor", () => {
     expect(prisma.jobExecution.update).not.toHaveBeenCalled();
   });
 
+  describe("checkHttp", () => {
+    it("returns the HEAD response when it is a working status", async () => {
+      const requestSpy = jest
+        .spyOn(processor as any, "requestOnce")
+        .mockResolvedValue({ statusCode: 200, body: "", responseMs: 10 });
+
+      const result = await (processor as any).checkHttp(
+        "https://example.test/",
+        1_000,
+        false,
+      );
+
+      expect(result.statusCode).toBe(200);
+      expect(requestSpy).toHaveBeenCalledTimes(1);
+      expect(requestSpy).toHaveBeenCalledWith(
+        "https://example.test/",
+        "HEAD",
+        1_000,
+      );
+    });
+
+    it("confirms a non-working HEAD response with a GET", async () => {
+      const requestSpy = jest
+        .spyOn(processor as any, "requestOnce")
+        .mockResolvedValueOnce({ statusCode: 405, body: "", responseMs: 5 })
+        .mockResolvedValueOnce({ statusCode: 200, body: "ok", responseMs: 20 });
+
+      const result = await (processor as any).checkHttp(
+        "https://example.test/",
+        1_000,
+        false,
+      );
+
+      expect(result.statusCode).toBe(200);
+      expect(requestSpy).toHaveBeenLastCalledWith(
+        "https://example.test/",
+        "GET",
+        1_000,
+        false,
+      );
+    });
+
+    it("goes straight to GET when the body is needed for a keyword check", async () => {
+      const requestSpy = jest
+        .spyOn(processor as any, "requestOnce")
+        .mockResolvedValue({ statusCode: 200, body: "hello", responseMs: 10 });
+
+      await (processor as any).checkHttp("https://example.test/", 1_000, true);
+
+      expect(requestSpy).toHaveBeenCalledTimes(1);
+      expect(requestSpy).toHaveBeenCalledWith(
+        "https://example.test/",
+        "GET",
+        1_000,
+        true,
+      );
+    });
+  });
+
   it("stores Lighthouse scores for audit jobs", async () => {
     jest.spyOn(processor as any, "runLighthouseAudit").mockResolvedValue({
       provider: "local",
@@ -33,6 +33,18 @@ interface LighthouseAuditPayload {
   jobExecutionId?: number;
 }
 
+// Process-wide keep-alive agents: repeated checks against the same site (and
+// the 5 s confirmation retry) reuse the pooled TCP/TLS session instead of
+// paying a full handshake on every request. Sites usually close idle sockets
+// between ticks; the reconnect then resumes the agent's cached TLS session,
+// so keep one per monitored host rather than Node's default 100.
+const HTTP_AGENT = new http.Agent({ keepAlive: true, maxSockets: 8 });
+const HTTPS_AGENT = new https.Agent({
+  keepAlive: true,
+  maxSockets: 8,
+  maxCachedSessions: 2_000,
+});
+
 // concurrency=3: HTTP pings are I/O-bound and fast — 3 concurrent is safe.
 @Processor(QUEUES.MONITORS, { concurrency: 3 })
 export class MonitorProcessor extends WorkerHost {
@@ -104,9 +116,11 @@ export class MonitorProcessor extends WorkerHost {
 
     const url = monitor.environment.url;
     const start = Date.now();
+    // Only download the response body when the keyword check needs it
+    const needsBody = Boolean(monitor.check_keyword && monitor.keyword);
 
     try {
-      const result = await this.checkHttp(url, timeout);
+      const result = await this.checkHttp(url, timeout, needsBody);
       statusCode = result.statusCode;
       responseTimeMs = result.responseMs;
       responseBody = result.body;
@@ -124,7 +138,7 @@ export class MonitorProcessor extends WorkerHost {
       await new Promise((resolve) => setTimeout(resolve, 5_000));
       const retryStart = Date.now();
       try {
-        const retryResult = await this.checkHttp(url, timeout);
+        const retryResult = await this.checkHttp(url, timeout, needsBody);
         statusCode = retryResult.statusCode;
         responseTimeMs = retryResult.responseMs;
         responseBody = retryResult.body;
@@ -625,26 +639,57 @@ export class MonitorProcessor extends WorkerHost {
     };
   }
 
-  private checkHttp(url: string, timeout: number): Promise<HttpCheckResult> {
+  /**
+   * Probe a URL for uptime. When the body is not needed a HEAD request is
+   * sent first; any non-working HEAD response (405, 501, or servers that
+   * answer HEAD differently) is confirmed with a full GET before reporting.
+   */
+  private async checkHttp(
+    url: string,
+    timeout: number,
+    needsBody = true,
+  ): Promise<HttpCheckResult> {
+    if (!needsBody) {
+      const head = await this.requestOnce(url, "HEAD", timeout);
+      if (isHttpStatusWorking(head.statusCode)) return head;
+    }
+    return this.requestOnce(url, "GET", timeout, needsBody);
+  }
+
+  private requestOnce(
+    url: string,
+    method: "HEAD" | "GET",
+    timeout: number,
+    keepBody = true,
+  ): Promise<HttpCheckResult> {
     return new Promise((resolve, reject) => {
-      const mod = url.startsWith("https") ? https : http;
+      const isHttps = url.startsWith("https");
+      const mod = isHttps ? https : http;
       const chunks: Buffer[] = [];
       const start = Date.now();
-      const req = mod.get(url, { timeout }, (res) => {
-        res.on("data", (c: Buffer) => chunks.push(c));
-        res.on("end", () =>
-          resolve({
-            statusCode: res.statusCode ?? 0,
-            body: Buffer.concat(chunks).toString(),
-            responseMs: Date.now() - start,
-          }),
-        );
-      });
+      const req = mod.request(
+        url,
+        { method, timeout, agent: isHttps ? HTTPS_AGENT : HTTP_AGENT },
+        (res) => {
+          // Without a keyword check the body is drained, never buffered or
+          // decoded — large pages would otherwise be copied for nothing.
+          if (keepBody) res.on("data", (c: Buffer) => chunks.push(c));
+          else res.resume();
+          res.on("end", () =>
+            resolve({
+              statusCode: res.statusCode ?? 0,
+              body: Buffer.concat(chunks).toString(),
+              responseMs: Date.now() - start,
+            }),
+          );
+        },
+      );
       req.on("error", reject);
       req.on("timeout", () => {
         req.destroy();
         reject(new Error("Request timed out"));
       });
+      req.end();
     });
   }
 
@@ -3,7 +3,13 @@
 import { PluginScanProcessor } from "./plugin-scan.processor";
 
 function makeProcessor(prisma: any) {
-  return new PluginScanProcessor(prisma, {} as any, {} as any) as any;
+  return new PluginScanProcessor(
+    prisma,
+    {} as any,
+    {} as any,
+    {} as any,
+    {} as any,
+  ) as any;
 }
 
 describe("PluginScanProcessor custom plugin reconciliation", () => {
@@ -1,4 +1,4 @@
-import { Processor, WorkerHost } from "@nestjs/bullmq";
+import { InjectQueue, Processor, WorkerHost } from "@nestjs/bullmq";
 import { Logger } from "@nestjs/common";
 import { Job, Queue } from "bullmq";
 import { join } from "path";
@@ -18,6 +18,7 @@ import {
   buildWpCliPrefix,
   shellQuote,
   pushRemoteScript,
+  waitForPreflightBackup,
 } from "../../utils/processor-utils";
 
 function normalizeGithubRepoUrl(
@@ -104,6 +105,10 @@ export class PluginScanProcessor extends WorkerHost {
     private readonly prisma: PrismaService,
     private readonly config: ConfigService,
     private readonly sshKey: SshKeyService,
+    @InjectQueue(QUEUES.PLUGIN_SCANS)
+    private readonly pluginScansQueue: Queue,
+    @InjectQueue(QUEUES.BACKUPS)
+    private readonly backupsQueue: Queue,
   ) {
     super();
   }
@@ -377,14 +382,10 @@ export class PluginScanProcessor extends WorkerHost {
           },
         });
 
-        const redisUrl = this.config.get<string>("redis.url")!;
-        const backupQueue = new Queue(QUEUES.BACKUPS, {
-          connection: { url: redisUrl },
-        });
         const { randomUUID } = await import("crypto");
         const backupBullJobId = randomUUID();
 
-        await backupQueue.add(
+        await this.backupsQueue.add(
           JOB_TYPES.BACKUP_CREATE,
           {
             environmentId,
@@ -394,31 +395,13 @@ export class PluginScanProcessor extends WorkerHost {
           },
           { jobId: backupBullJobId },
         );
-        await backupQueue.close();
 
         await this.prisma.jobExecution.update({
           where: { id: backupExec.id },
           data: { bull_job_id: backupBullJobId },
         });
 
-        let attempts = 0;
-        let backupFailed = false;
-        while (attempts < 120) {
-          // wait up to 20 minutes (10s intervals)
-          const exec = await this.prisma.jobExecution.findUnique({
-            where: { id: backupExec.id },
-          });
-          if (exec?.status === "completed") break;
-          if (exec?.status === "failed") {
-            backupFailed = true;
-            throw new Error("Pre-flight backup failed: " + exec.last_error);
-          }
-          await new Promise((r) => setTimeout(r, 10000));
-          attempts++;
-        }
-        if (attempts >= 120 && !backupFailed) {
-          throw new Error("Pre-flight backup timed out after 20 minutes");
-        }
+        await waitForPreflightBackup(this.prisma, backupExec.id);
 
         await tracker.track({
           step: "Pre-flight backup completed successfully",
@@ -776,17 +759,11 @@ export class PluginScanProcessor extends WorkerHost {
           },
         });
 
-        const { Queue } = await import("bullmq");
-        const redisUrl = this.config.get<string>("redis.url")!;
-        const scanQueue = new Queue(QUEUES.PLUGIN_SCANS, {
-          connection: { url: redisUrl },
-        });
-        await scanQueue.add(
+        await this.pluginScansQueue.add(
           JOB_TYPES.PLUGIN_SCAN_RUN,
           { environmentId, jobExecutionId: Number(scanExec.id) },
           { jobId: scanBullJobId },
         );
-        await scanQueue.close();
       }
 
       await job.updateProgress(100);
@@ -13,7 +13,11 @@ import {
   PluginScheduledUpdatePayload,
 } from "@bedrock-forge/shared";
 import { ConfigService } from "@nestjs/config";
-import { shellQuote, pushRemoteScript } from "../../utils/processor-utils";
+import {
+  shellQuote,
+  pushRemoteScript,
+  waitForPreflightBackup,
+} from "../../utils/processor-utils";
 
 @Processor(QUEUES.PLUGIN_UPDATES, { concurrency: 1 })
 export class PluginUpdateProcessor extends WorkerHost {
@@ -29,6 +33,8 @@ export class PluginUpdateProcessor extends WorkerHost {
     private readonly pluginScansQueue: Queue,
     @InjectQueue(QUEUES.NOTIFICATIONS)
     private readonly notificationsQueue: Queue,
+    @InjectQueue(QUEUES.BACKUPS)
+    private readonly backupsQueue: Queue,
   ) {
     super();
   }
@@ -160,14 +166,10 @@ export class PluginUpdateProcessor extends WorkerHost {
           },
         });
 
-        const redisUrl = this.config.get<string>("redis.url")!;
-        const backupQueue = new Queue(QUEUES.BACKUPS, {
-          connection: { url: redisUrl },
-        });
         const { randomUUID } = await import("crypto");
         const backupBullJobId = randomUUID();
 
-        await backupQueue.add(
+        await this.backupsQueue.add(
           JOB_TYPES.BACKUP_CREATE,
           {
             environmentId,
@@ -177,31 +179,13 @@ export class PluginUpdateProcessor extends WorkerHost {
           },
           { jobId: backupBullJobId },
         );
-        await backupQueue.close();
 
         await this.prisma.jobExecution.update({
           where: { id: backupExec.id },
           data: { bull_job_id: backupBullJobId },
         });
 
-        let attempts = 0;
-        let backupFailed = false;
-        while (attempts < 120) {
-          // wait up to 20 minutes (10s intervals)
-          const exec = await this.prisma.jobExecution.findUnique({
-            where: { id: backupExec.id },
-          });
-          if (exec?.status === "completed") break;
-          if (exec?.status === "failed") {
-            backupFailed = true;
-            throw new Error("Pre-flight backup failed: " + exec.last_error);
-          }
-          await new Promise((r) => setTimeout(r, 10000));
-          attempts++;
-        }
-        if (attempts >= 120 && !backupFailed) {
-          throw new Error("Pre-flight backup timed out after 20 minutes");
-        }
+        await waitForPreflightBackup(this.prisma, backupExec.id);
 
         await tracker.track({
           step: "Pre-flight backup completed successfully",
@@ -250,10 +234,11 @@ export class PluginUpdateProcessor extends WorkerHost {
         `php ${shellQuote(remoteScript)} --action=update-all` +
         ` --docroot=${shellQuote(env.root_path)}`;
       const composerStart = Date.now();
-      const result = await executor.execute(
-        composerCmd,
-        { timeout: 10 * 60 * 1000 }, // 10-minute timeout for composer
-      );
+      const result = await executor.execute(composerCmd, {
+        timeout: 10 * 60 * 1000, // 10-minute timeout for composer
+        // Surface composer progress live instead of only after it exits
+        onOutput: (chunk) => this.logger.debug(chunk.trimEnd()),
+      });
 
       await tracker.trackCommand(
         "composer-manager.php --action=update-all",
@@ -6,8 +6,7 @@ import { PrismaService } from "../../prisma/prisma.service";
 import { EncryptionService } from "../../encryption/encryption.service";
 import { QUEUES, JOB_TYPES } from "@bedrock-forge/shared";
 
-// eslint-disable-next-line @typescript-eslint/no-require-imports
-const PdfPrinter = require("pdfmake/js/Printer.js").default as new (
+type PdfPrinterCtor = new (
   fonts: Record<string, Record<string, string>>,
   vfs: unknown,
   urlResolver: { resolve: () => void; resolved: () => Promise<void> },
@@ -17,6 +16,18 @@ const PdfPrinter = require("pdfmake/js/Printer.js").default as new (
   ) => Promise<NodeJS.EventEmitter & { end: () => void }>;
 };
 
+let pdfPrinter: PdfPrinterCtor | null = null;
+
+/**
+ * pdfmake pulls in pdfkit and its font metrics; load it on the first report
+ * render instead of at worker startup, since most runs never build a PDF.
+ */
+function loadPdfPrinter(): PdfPrinterCtor {
+  // eslint-disable-next-line @typescript-eslint/no-require-imports
+  pdfPrinter ??= require("pdfmake/js/Printer.js").default as PdfPrinterCtor;
+  return pdfPrinter;
+}
+
 const NOOP_RESOLVER = { resolve: () => {}, resolved: () => Promise.resolve() };
 const FONTS = {
   Helvetica: {
@@ -911,6 +922,7 @@ export class ReportProcessor extends WorkerHost {
       const docDef = buildSecurityDocDef(scans, ackCount, now, {
         label: scopeLabel,
       });
+      const PdfPrinter = loadPdfPrinter();
       const printer = new PdfPrinter(FONTS, undefined, NOOP_RESOLVER);
       const doc = await printer.createPdfKitDocument(docDef);
       const pdfBuffer = await new Promise<Buffer>((resolve, reject) => {
@@ -1036,6 +1048,7 @@ export class ReportProcessor extends WorkerHost {
     backups: BackupRow[],
     monitors: MonitorRow[],
   ): Promise<Buffer> {
+    const PdfPrinter = loadPdfPrinter();
     const printer = new PdfPrinter(FONTS, undefined, NOOP_RESOLVER);
     const docDef = buildDocDef(
       dateRange,
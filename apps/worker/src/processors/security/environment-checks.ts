@@ -8,6 +8,70 @@ type Executor = {
   ): Promise<{ stdout: string; stderr: string; code: number }>;
 };
 
+// ─── HTTP probes ─────────────────────────────────────────────────────────────
+
+const BEDROCK_APP_PROBES: {
+  path: string;
+  title: string;
+  severity: "critical" | "high" | "medium";
+  description: string;
+}[] = [
+  {
+    path: "/app/.env",
+    title: "Bedrock /app/.env is publicly accessible",
+    severity: "critical",
+    description:
+      "The Bedrock app path exposes an .env file over HTTP. This can disclose database credentials, API keys, and salts.",
+  },
+  {
+    path: "/app/debug.log",
+    title: "Bedrock /app/debug.log is publicly accessible",
+    severity: "high",
+    description:
+      "The Bedrock app path exposes debug.log over HTTP. Logs can include credentials, paths, plugin errors, and stack traces.",
+  },
+  {
+    path: "/app/error_log",
+    title: "Bedrock /app/error_log is publicly accessible",
+    severity: "high",
+    description:
+      "The Bedrock app path exposes an error_log file over HTTP. Logs can include sensitive runtime details.",
+  },
+  {
+    path: "/app/composer.json",
+    title: "Bedrock /app/composer.json is publicly accessible",
+    severity: "medium",
+    description:
+      "Composer metadata is reachable through the Bedrock app path. This reveals package names and versions useful for targeted attacks.",
+  },
+  {
+    path: "/app/dsd",
+    title: "Unexpected Bedrock /app file is publicly accessible",
+    severity: "medium",
+    description:
+      "A non-static, extensionless file under the Bedrock app path returned HTTP 200. Direct app file access should be denied unless it is a known public asset.",
+  },
+];
+
+/**
+ * Every path whose HTTP status the WP audit checks. They are fetched by one
+ * curl in one exec: curl reuses the connection between URLs on the same
+ * host, so the audit pays for one SSH round-trip and one TLS handshake
+ * instead of one of each per path.
+ */
+const HTTP_PROBE_PATHS = [
+  "/xmlrpc.php",
+  "/readme.html",
+  "/.git/HEAD",
+  "/wp-content/debug.log",
+  "/.env",
+  ...BEDROCK_APP_PROBES.map((probe) => probe.path),
+  "/?author=1",
+];
+
+/** Per-URL curl limit; the exec timeout scales with the number of paths. */
+const HTTP_PROBE_MAX_TIME_S = 10;
+
 // ─── WP_AUDIT ────────────────────────────────────────────────────────────────
 
 export async function runWpAudit(
@@ -327,13 +391,34 @@ export async function runWpAudit(
 
   if (siteUrl && siteUrl.startsWith("http")) {
     const cleanUrl = siteUrl.replace(/\/$/, "");
-    const probeStatus = async (path: string): Promise<string> => {
+    // One `<status> <redirect url>` line per path, in order. curl still
+    // prints a line (status 000) for a URL it could not fetch; a missing
+    // line is treated the same way.
+    let probeResults: Promise<Map<string, [string, string]>> | undefined;
+    const fetchProbes = async (): Promise<Map<string, [string, string]>> => {
+      const args = HTTP_PROBE_PATHS.map(
+        (path) => `-o /dev/null ${q(cleanUrl + path)}`,
+      ).join(" ");
       const { stdout } = await exec.execute(
-        `curl -s -o /dev/null -w "%{http_code}" --max-time 10 "${cleanUrl}${path}" 2>/dev/null || echo 000`,
-        { timeout: 15000 },
+        `curl -s --max-time ${HTTP_PROBE_MAX_TIME_S} -w '%{http_code} %{redirect_url}\\n' ${args} 2>/dev/null || true`,
+        {
+          timeout: (HTTP_PROBE_PATHS.length * HTTP_PROBE_MAX_TIME_S + 5) * 1000,
+        },
+      );
+      const lines = stdout.split("\n");
+      return new Map(
+        HTTP_PROBE_PATHS.map((path, i): [string, [string, string]] => {
+          const [code = "", redirect = ""] = (lines[i] ?? "").split(" ");
+          return [path, [code.trim() || "000", redirect.trim()]];
+        }),
       );
-      return stdout.trim();
     };
+    const probeResult = async (path: string): Promise<[string, string]> => {
+      probeResults ??= fetchProbes();
+      return (await probeResults).get(path) ?? ["000", ""];
+    };
+    const probeStatus = async (path: string): Promise<string> =>
+      (await probeResult(path))[0];
 
     // xmlrpc.php exposed — common DDoS amplification and brute-force vector
     const xmlrpcCode = await probeStatus("/xmlrpc.php");
@@ -455,50 +540,7 @@ export async function runWpAudit(
       );
     }
 
-    const bedrockAppProbes: {
-      path: string;
-      title: string;
-      severity: "critical" | "high" | "medium";
-      description: string;
-    }[] = [
-      {
-        path: "/app/.env",
-        title: "Bedrock /app/.env is publicly accessible",
-        severity: "critical",
-        description:
-          "The Bedrock app path exposes an .env file over HTTP. This can disclose database credentials, API keys, and salts.",
-      },
-      {
-        path: "/app/debug.log",
-        title: "Bedrock /app/debug.log is publicly accessible",
-        severity: "high",
-        description:
-          "The Bedrock app path exposes debug.log over HTTP. Logs can include credentials, paths, plugin errors, and stack traces.",
-      },
-      {
-        path: "/app/error_log",
-        title: "Bedrock /app/error_log is publicly accessible",
-        severity: "high",
-        description:
-          "The Bedrock app path exposes an error_log file over HTTP. Logs can include sensitive runtime details.",
-      },
-      {
-        path: "/app/composer.json",
-        title: "Bedrock /app/composer.json is publicly accessible",
-        severity: "medium",
-        description:
-          "Composer metadata is reachable through the Bedrock app path. This reveals package names and versions useful for targeted attacks.",
-      },
-      {
-        path: "/app/dsd",
-        title: "Unexpected Bedrock /app file is publicly accessible",
-        severity: "medium",
-        description:
-          "A non-static, extensionless file under the Bedrock app path returned HTTP 200. Direct app file access should be denied unless it is a known public asset.",
-      },
-    ];
-
-    for (const probe of bedrockAppProbes) {
+    for (const probe of BEDROCK_APP_PROBES) {
       const code = await probeStatus(probe.path);
       if (code !== "200") {
         continue;
@@ -520,15 +562,10 @@ export async function runWpAudit(
     }
 
     // User enumeration via ?author= redirect — leaks WordPress usernames
-    const { stdout: authorStatus } = await exec.execute(
-      `curl -s -o /dev/null -w "%{http_code}" --max-time 10 --max-redirs 0 "${cleanUrl}/?author=1" 2>/dev/null || echo 000`,
-      { timeout: 15000 },
-    );
-    if (["301", "302"].includes(authorStatus.trim())) {
-      const { stdout: authorLocation } = await exec.execute(
-        `curl -sI --max-time 10 "${cleanUrl}/?author=1" 2>/dev/null | grep -i "^location:" | head -1 || true`,
-        { timeout: 15000 },
-      );
+    // curl does not follow redirects here, so the Location comes back as
+    // the redirect URL of the batched probe.
+    const [authorStatus, authorLocation] = await probeResult("/?author=1");
+    if (["301", "302"].includes(authorStatus)) {
       if (authorLocation.toLowerCase().includes("/author/")) {
         findings.push(
           makeFinding(
@@ -733,7 +770,7 @@ export async function runProjectMalware(
 
   // 4. .htaccess injection scoped to this environment
   const { stdout: htaccessMatches } = await exec.execute(
-    `find ${q(rootPath)} -name ".htaccess" -exec grep -lE "eval|base64_decode|RewriteRule.*https?://" {} \\; 2>/dev/null | head -10 || true`,
+    `find ${q(rootPath)} -name ".htaccess" -exec grep -lE "eval|base64_decode|RewriteRule.*https?://" {} + 2>/dev/null | head -10 || true`,
     { timeout: 30000 },
   );
   const htFiles = htaccessMatches
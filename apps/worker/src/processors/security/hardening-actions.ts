@@ -14,16 +14,86 @@ import type {
   ServerHardeningActionType,
 } from "@bedrock-forge/shared";
 
-/** Duck-typed executor interface — matches RemoteExecutorService.execute() */
+/**
+ * Duck-typed executor interface — matches RemoteExecutorService.execute(),
+ * executeScript(), and pushFile().
+ */
 type Executor = {
   execute(
     cmd: string,
     opts?: { timeout?: number },
   ): Promise<{ stdout: string; stderr: string; code: number }>;
+  executeScript(
+    script: string,
+    opts?: { timeout?: number },
+  ): Promise<{ stdout: string; stderr: string; code: number }>;
+  pushFile(file: {
+    content: string | Buffer;
+    remotePath: string;
+    mode?: number;
+  }): Promise<void>;
 };
 
 // ─── Helpers ─────────────────────────────────────────────────────────────────
 
+/**
+ * Refresh the apt package lists only when none were updated in the last hour,
+ * so back-to-back installs (fail2ban then auditd, or a retried action) pay
+ * for `apt-get update` at most once, and a long-idle server doesn't fail the
+ * install on stale 404ing package URLs.
+ */
+const APT_UPDATE_IF_STALE =
+  "find /var/lib/apt/lists -maxdepth 1 -type f -name '*Packages*' -mmin -60 2>/dev/null | grep -q . || apt-get update -qq 2>&1";
+
+/**
+ * Non-interactive, quiet install: no debconf prompts that would hang the
+ * exec, no pty progress output. dpkg runs under eatmydata when the server
+ * has it, skipping the fsync after every unpacked file. Recommended packages
+ * stay on — fail2ban relies on them for its firewall and journal backends.
+ */
+const APT_INSTALL =
+  "DEBIAN_FRONTEND=noninteractive $(command -v eatmydata) apt-get install -y -qq -o Dpkg::Use-Pty=0";
+
+/** Package installs include a possible list refresh, so allow them longer. */
+const APT_INSTALL_TIMEOUT_MS = 5 * 60 * 1000;
+
+/** Each `ufw deny` reloads the firewall; a batch of 50 can exceed 30 s. */
+const UFW_BATCH_TIMEOUT_MS = 2 * 60 * 1000;
+
+/**
+ * Join dependent steps into one script that runs under `set -eo pipefail`:
+ * one SSH round-trip for the whole sequence, and the first failing step
+ * aborts the rest with its exit code. Run through `bash -c` so pipefail is
+ * available whatever the login shell is.
+ */
+function batchSteps(steps: string[]): string {
+  const script = ["set -eo pipefail", ...steps].join("\n");
+  return `bash -c '${script.replace(/'/g, "'\\''")}'`;
+}
+
+/**
+ * Script steps that wait for a unit to settle after `systemctl start` and
+ * fail unless it ends up active. Type=simple daemons are reported started
+ * before they finish initialising (or crash on a bad config), so poll
+ * `is-active` with a short backoff and echo the final `state=<state>`.
+ */
+function awaitUnitActive(unit: string): string[] {
+  return [
+    "state=unknown",
+    "for delay in 1 1 2 3 5; do",
+    `  state=$(systemctl is-active ${unit} 2>/dev/null) && break`,
+    "  sleep $delay",
+    "done",
+    'echo "state=$state"',
+    '[ "$state" = active ]',
+  ];
+}
+
+/** Final unit state echoed by {@link awaitUnitActive}, if it was reached. */
+function unitState(stdout: string): string | null {
+  return /^state=(\S+)$/m.exec(stdout)?.[1] ?? null;
+}
+
 async function run(
   exec: Executor,
   cmd: string,
@@ -31,6 +101,99 @@ async function run(
   return exec.execute(cmd);
 }
 
+interface SshdOption {
+  action: string;
+  directive: string;
+  value: string;
+  /** ERE matched after the directive when the current value is acceptable. */
+  satisfied: string;
+  already: string;
+  done: string;
+}
+
+const X11_FORWARDING_OPTION: SshdOption = {
+  action: "DISABLE_X11_FORWARDING",
+  directive: "X11Forwarding",
+  value: "no",
+  satisfied: "no",
+  already: "X11Forwarding already disabled",
+  done: "X11Forwarding set to no, sshd reloaded",
+};
+
+// Consider already hardened if MaxAuthTries <= 3
+const MAX_AUTH_TRIES_OPTION: SshdOption = {
+  action: "SET_MAX_AUTH_TRIES",
+  directive: "MaxAuthTries",
+  value: "3",
+  satisfied: "[1-3]$",
+  already: "MaxAuthTries already set to 3 or lower",
+  done: "MaxAuthTries set to 3, sshd reloaded",
+};
+
+const PASSWORD_AUTH_OPTION: SshdOption = {
+  action: "DISABLE_PASSWORD_AUTH",
+  directive: "PasswordAuthentication",
+  value: "no",
+  satisfied: "no",
+  already: "PasswordAuthentication already disabled",
+  done: "PasswordAuthentication set to no, sshd reloaded",
+};
+
+/** sshd actions applied together by {@link applyServerHardeningActions}. */
+const BATCHED_SSHD_OPTIONS: SshdOption[] = [
+  X11_FORWARDING_OPTION,
+  MAX_AUTH_TRIES_OPTION,
+];
+
+/**
+ * Check and edit any number of sshd_config directives in a single exec, then
+ * reload sshd once if anything changed. Each directive echoes
+ * `unchanged:<directive>` or `edited:<directive>`, so every action still
+ * gets its own skip/applied/failed result, and a failure can be attributed
+ * to the edit or to the reload.
+ */
+async function setSshdOptions(
+  exec: Executor,
+  opts: SshdOption[],
+): Promise<HardeningActionResult[]> {
+  const steps = ["changed=0"];
+  for (const { directive, value, satisfied } of opts) {
+    steps.push(
+      `if grep -qE "^${directive}\\s+${satisfied}" /etc/ssh/sshd_config; then`,
+      `  echo unchanged:${directive}`,
+      "else",
+      `  grep -qE "^${directive}" /etc/ssh/sshd_config ` +
+        `&& sed -i "s/^${directive}.*/${directive} ${value}/" /etc/ssh/sshd_config ` +
+        `|| echo "${directive} ${value}" >> /etc/ssh/sshd_config`,
+      `  echo edited:${directive}`,
+      "  changed=1",
+      "fi",
+    );
+  }
+  steps.push(
+    '[ "$changed" = 0 ] || systemctl reload sshd 2>&1 || systemctl reload ssh 2>&1',
+  );
+
+  const res = await run(exec, batchSteps(steps));
+  const lines = res.stdout.split("\n").map((l) => l.trim());
+  const reloadOutput = lines
+    .filter((l) => !/^(unchanged|edited):/.test(l))
+    .join("\n")
+    .trim();
+  return opts.map((opt) => {
+    if (lines.includes(`unchanged:${opt.directive}`))
+      return skip(opt.action, opt.already);
+    if (!lines.includes(`edited:${opt.directive}`))
+      return fail(opt.action, res.stderr || "sshd_config edit failed");
+    if (res.code !== 0)
+      return fail(
+        opt.action,
+        `Config written but sshd reload failed: ${reloadOutput}`,
+      );
+    return ok(opt.action, opt.done);
+  });
+}
+
 /** Validates that a string is a well-formed IPv4 address (defense-in-depth). */
 function isValidIPv4(ip: string): boolean {
   const parts = ip.split(".");
@@ -42,15 +205,35 @@ function isValidIPv4(ip: string): boolean {
   });
 }
 
-function ipv4InCidr(ip: string, cidr: string): boolean {
-  const [network, bitsRaw = "32"] = cidr.split("/");
-  if (!isValidIPv4(ip) || !isValidIPv4(network)) return ip === cidr;
-  const bits = Number(bitsRaw);
-  if (!Number.isInteger(bits) || bits < 0 || bits > 32) return false;
-  const value = ip.split(".").reduce((n, part) => (n << 8) + Number(part), 0) >>> 0;
-  const base = network.split(".").reduce((n, part) => (n << 8) + Number(part), 0) >>> 0;
-  const mask = bits === 0 ? 0 : (0xffffffff << (32 - bits)) >>> 0;
-  return (value & mask) === (base & mask);
+function ipv4ToInt(ip: string): number {
+  return ip.split(".").reduce((n, part) => (n << 8) + Number(part), 0) >>> 0;
+}
+
+/**
+ * Parse a trusted IP/CIDR list once into a matcher, so checking many IPs
+ * doesn't re-split and re-validate every entry per IP. Entries that are not
+ * IPv4 networks only match by exact string.
+ */
+function compileCidrMatcher(cidrs: string[]): (ip: string) => boolean {
+  const exact = new Set<string>();
+  const ranges: Array<{ base: number; mask: number }> = [];
+  for (const cidr of cidrs) {
+    const [network, bitsRaw = "32"] = cidr.split("/");
+    if (!isValidIPv4(network)) {
+      exact.add(cidr);
+      continue;
+    }
+    const bits = Number(bitsRaw);
+    if (!Number.isInteger(bits) || bits < 0 || bits > 32) continue;
+    const mask = bits === 0 ? 0 : (0xffffffff << (32 - bits)) >>> 0;
+    ranges.push({ base: (ipv4ToInt(network) & mask) >>> 0, mask });
+  }
+  return (ip) => {
+    if (exact.has(ip)) return true;
+    if (!isValidIPv4(ip)) return false;
+    const value = ipv4ToInt(ip);
+    return ranges.some(({ base, mask }) => (value & mask) >>> 0 === base);
+  };
 }
 
 function ok(action: string, detail: string): HardeningActionResult {
@@ -65,6 +248,98 @@ function fail(action: string, detail: string): HardeningActionResult {
   return { action, status: "failed", detail };
 }
 
+// ─── .htaccess blocks ────────────────────────────────────────────────────────
+//
+// The rule blocks don't depend on the target, so they are built and
+// shell-quoted once at module load rather than on every action run.
+
+/** Single-quote a block for use as one `printf '%s\\n'` argument. */
+function quoteBlock(block: string): string {
+  return `'${block.replace(/'/g, "'\\''")}'`;
+}
+
+const DENY_ALL_RULES = [
+  "  <IfModule mod_authz_core.c>",
+  "    Require all denied",
+  "  </IfModule>",
+  "  <IfModule !mod_authz_core.c>",
+  "    Order Deny,Allow",
+  "    Deny from all",
+  "  </IfModule>",
+].join("\n");
+
+const PHP_UPLOADS_BLOCK = quoteBlock(
+  '<FilesMatch "\\.(php|php5|phtml)$">\n  Deny from all\n</FilesMatch>',
+);
+
+const SECURITY_HEADERS_BLOCK = [
+  "",
+  "# Security headers",
+  "<IfModule mod_headers.c>",
+  '  Header always set X-Frame-Options "SAMEORIGIN"',
+  '  Header always set X-Content-Type-Options "nosniff"',
+  '  Header always set X-XSS-Protection "1; mode=block"',
+  '  Header always set Referrer-Policy "strict-origin-when-cross-origin"',
+  "</IfModule>",
+].join("\\n");
+
+const DEBUG_LOG_BLOCK = quoteBlock(
+  [
+    "",
+    "# _bf_debuglog_block_ Block access to WordPress log files",
+    '<FilesMatch "\\.(log)$">',
+    DENY_ALL_RULES,
+    "</FilesMatch>",
+  ].join("\n"),
+);
+
+const SENSITIVE_FILES_BLOCK = quoteBlock(
+  [
+    "",
+    "# _bf_sensitive_block_ Deny access to backup, config, and package files",
+    '<FilesMatch "\\.(env|bak|sql|gz|tar|zip|log)$">',
+    DENY_ALL_RULES,
+    "</FilesMatch>",
+    '<FilesMatch "^(composer\\.(json|lock)|package\\.json|yarn\\.lock|\\.htpasswd)$">',
+    DENY_ALL_RULES,
+    "</FilesMatch>",
+  ].join("\n"),
+);
+
+const APP_PATH_GUARD_BLOCK = quoteBlock(
+  [
+    "",
+    "# _bf_app_path_guard_ Deny unsafe direct file access in wp-content/app",
+    "Options -Indexes",
+    '<FilesMatch "^\\.">',
+    DENY_ALL_RULES,
+    "</FilesMatch>",
+    '<FilesMatch "\\.(php|php3|php4|php5|phtml|phar|pl|py|jsp|asp|aspx|cgi|sh|log|ini|conf|bak|sql|env|gz|tar|zip)$">',
+    DENY_ALL_RULES,
+    "</FilesMatch>",
+    '<FilesMatch "^(composer\\.(json|lock)|package\\.json|yarn\\.lock|pnpm-lock\\.yaml|\\.htpasswd)$">',
+    DENY_ALL_RULES,
+    "</FilesMatch>",
+    "<IfModule mod_rewrite.c>",
+    "  RewriteEngine On",
+    "  RewriteCond %{REQUEST_FILENAME} -f",
+    "  RewriteCond %{REQUEST_URI} !\\.(css|js|mjs|map|json|jpg|jpeg|png|gif|webp|svg|ico|woff|woff2|ttf|eot|otf|pdf|txt|xml|mp4|webm|mp3|wav|avif)$ [NC]",
+    "  RewriteRule ^ - [F,L]",
+    "</IfModule>",
+  ].join("\n"),
+);
+
+const USER_ENUMERATION_BLOCK = quoteBlock(
+  [
+    "",
+    "# Block WordPress user enumeration via ?author= queries",
+    "<IfModule mod_rewrite.c>",
+    "  RewriteCond %{QUERY_STRING} ^author=\\d",
+    "  RewriteRule ^ /? [L,R=301]",
+    "</IfModule>",
+  ].join("\n"),
+);
+
 // ─── Server hardening actions ─────────────────────────────────────────────────
 
 async function fixWorldWritable(
@@ -81,7 +356,7 @@ async function fixWorldWritable(
 
   const fix = await run(
     exec,
-    "find /home -xdev -type f -perm -002 -exec chmod o-w {} \\;",
+    "find /home -xdev -type f -perm -002 -exec chmod o-w {} +",
   );
   if (fix.code !== 0) return fail(action, fix.stderr || "chmod failed");
 
@@ -89,71 +364,6 @@ async function fixWorldWritable(
   return ok(action, `Removed world-writable bit from ${count} file(s)`);
 }
 
-async function disableX11Forwarding(
-  exec: Executor,
-): Promise<HardeningActionResult> {
-  const action = "DISABLE_X11_FORWARDING";
-  const check = await run(
-    exec,
-    'grep -qE "^X11Forwarding\\s+no" /etc/ssh/sshd_config',
-  );
-  if (check.code === 0) return skip(action, "X11Forwarding already disabled");
-
-  // Replace any existing X11Forwarding line, or append if absent
-  const sed = await run(
-    exec,
-    'grep -qE "^X11Forwarding" /etc/ssh/sshd_config ' +
-      '&& sed -i "s/^X11Forwarding.*/X11Forwarding no/" /etc/ssh/sshd_config ' +
-      '|| echo "X11Forwarding no" >> /etc/ssh/sshd_config',
-  );
-  if (sed.code !== 0)
-    return fail(action, sed.stderr || "sshd_config edit failed");
-
-  const reload = await run(
-    exec,
-    "systemctl reload sshd 2>&1 || systemctl reload ssh 2>&1",
-  );
-  if (reload.code !== 0)
-    return fail(
-      action,
-      `Config written but sshd reload failed: ${reload.stdout}`,
-    );
-
-  return ok(action, "X11Forwarding set to no, sshd reloaded");
-}
-
-async function setMaxAuthTries(exec: Executor): Promise<HardeningActionResult> {
-  const action = "SET_MAX_AUTH_TRIES";
-  // Consider already hardened if MaxAuthTries <= 3
-  const check = await run(
-    exec,
-    'grep -qE "^MaxAuthTries\\s+[1-3]$" /etc/ssh/sshd_config',
-  );
-  if (check.code === 0)
-    return skip(action, "MaxAuthTries already set to 3 or lower");
-
-  const sed = await run(
-    exec,
-    'grep -qE "^MaxAuthTries" /etc/ssh/sshd_config ' +
-      '&& sed -i "s/^MaxAuthTries.*/MaxAuthTries 3/" /etc/ssh/sshd_config ' +
-      '|| echo "MaxAuthTries 3" >> /etc/ssh/sshd_config',
-  );
-  if (sed.code !== 0)
-    return fail(action, sed.stderr || "sshd_config edit failed");
-
-  const reload = await run(
-    exec,
-    "systemctl reload sshd 2>&1 || systemctl reload ssh 2>&1",
-  );
-  if (reload.code !== 0)
-    return fail(
-      action,
-      `Config written but sshd reload failed: ${reload.stdout}`,
-    );
-
-  return ok(action, "MaxAuthTries set to 3, sshd reloaded");
-}
-
 async function fixSshDirPerms(exec: Executor): Promise<HardeningActionResult> {
   const action = "FIX_SSH_DIR_PERMS";
   // Fix /root/.ssh and all /home/*/.ssh directories
@@ -168,34 +378,8 @@ async function fixSshDirPerms(exec: Executor): Promise<HardeningActionResult> {
 async function disablePasswordAuth(
   exec: Executor,
 ): Promise<HardeningActionResult> {
-  const action = "DISABLE_PASSWORD_AUTH";
-  const check = await run(
-    exec,
-    'grep -qE "^PasswordAuthentication\\s+no" /etc/ssh/sshd_config',
-  );
-  if (check.code === 0)
-    return skip(action, "PasswordAuthentication already disabled");
-
-  const sed = await run(
-    exec,
-    'grep -qE "^PasswordAuthentication" /etc/ssh/sshd_config ' +
-      '&& sed -i "s/^PasswordAuthentication.*/PasswordAuthentication no/" /etc/ssh/sshd_config ' +
-      '|| echo "PasswordAuthentication no" >> /etc/ssh/sshd_config',
-  );
-  if (sed.code !== 0)
-    return fail(action, sed.stderr || "sshd_config edit failed");
-
-  const reload = await run(
-    exec,
-    "systemctl reload sshd 2>&1 || systemctl reload ssh 2>&1",
-  );
-  if (reload.code !== 0)
-    return fail(
-      action,
-      `Config written but sshd reload failed: ${reload.stdout}`,
-    );
-
-  return ok(action, "PasswordAuthentication set to no, sshd reloaded");
+  const [result] = await setSshdOptions(exec, [PASSWORD_AUTH_OPTION]);
+  return result;
 }
 
 async function installFail2ban(exec: Executor, trustedCidrs: string[]): Promise<HardeningActionResult> {
@@ -203,9 +387,18 @@ async function installFail2ban(exec: Executor, trustedCidrs: string[]): Promise<
   const safeCidrs = trustedCidrs.filter((entry) => /^[0-9a-fA-F:.]+(?:\/\d{1,3})?$/.test(entry));
   if (safeCidrs.length > 0) {
     const content = `[DEFAULT]\nignoreip = 127.0.0.0/8 ::1 ${safeCidrs.join(" ")}\n`;
-    const encoded = Buffer.from(content).toString("base64");
-    const configured = await run(exec, `printf %s ${encoded} | base64 -d > /etc/fail2ban/jail.d/bedrock-forge-trusted.conf`);
-    if (configured.code !== 0) return fail(action, "Failed to configure trusted management networks");
+    // Written over SFTP on the pooled connection rather than piped through
+    // a shell: no base64 round-trip and no command-line length limit as the
+    // trusted list grows.
+    try {
+      await exec.pushFile({
+        remotePath: "/etc/fail2ban/jail.d/bedrock-forge-trusted.conf",
+        content,
+        mode: 0o644,
+      });
+    } catch {
+      return fail(action, "Failed to configure trusted management networks");
+    }
   }
   const statusCheck = await run(
     exec,
@@ -217,24 +410,33 @@ async function installFail2ban(exec: Executor, trustedCidrs: string[]): Promise<
       return skip(action, "fail2ban is running and trusted networks were synchronized");
     }
 
-  const exists = await run(
-    exec,
-    "which fail2ban-client 2>/dev/null && echo found || echo missing",
+  // Install (when missing), enable, start, and wait for the unit to come up
+  // in one exec; a failed install stops the script before systemctl runs
+  // against a missing unit.
+  const setup = await exec.execute(
+    batchSteps([
+      "if ! command -v fail2ban-client >/dev/null 2>&1; then",
+      `  ${APT_UPDATE_IF_STALE} || true`,
+      `  ${APT_INSTALL} fail2ban 2>&1`,
+      "fi",
+      "systemctl enable fail2ban 2>&1",
+      "systemctl start fail2ban 2>&1",
+      ...awaitUnitActive("fail2ban"),
+    ]),
+    { timeout: APT_INSTALL_TIMEOUT_MS },
   );
-  if (exists.stdout.includes("missing")) {
-    const install = await run(exec, "apt-get install -y fail2ban 2>&1");
-    if (install.code !== 0)
-      return fail(action, install.stderr || "apt install fail2ban failed");
-  }
-
-  const enable = await run(
-    exec,
-    "systemctl enable fail2ban 2>&1 && systemctl start fail2ban 2>&1",
-  );
-  if (enable.code !== 0)
-    return fail(action, enable.stderr || "Failed to enable/start fail2ban");
+  const state = unitState(setup.stdout);
+  if (setup.code !== 0)
+    return fail(
+      action,
+      state
+        ? `fail2ban was started but did not stay active (state: ${state})`
+        : setup.stderr ||
+            setup.stdout.trim().split("\n").pop() ||
+            "Failed to install/enable/start fail2ban",
+    );
 
-  return ok(action, "fail2ban installed, enabled, and started");
+  return ok(action, "fail2ban installed, enabled, and confirmed active");
 }
 
 async function installAuditd(exec: Executor): Promise<HardeningActionResult> {
@@ -246,27 +448,33 @@ async function installAuditd(exec: Executor): Promise<HardeningActionResult> {
   if (statusCheck.stdout.trim().startsWith("active"))
     return skip(action, "auditd is already running");
 
-  const exists = await run(
-    exec,
-    "which auditd 2>/dev/null && echo found || echo missing",
+  // Install (when missing), enable, start, and wait for the unit to come up
+  // in one exec; a failed install stops the script before systemctl runs
+  // against a missing unit.
+  const setup = await exec.execute(
+    batchSteps([
+      "if ! command -v auditd >/dev/null 2>&1; then",
+      `  ${APT_UPDATE_IF_STALE} || true`,
+      `  ${APT_INSTALL} auditd audispd-plugins 2>&1`,
+      "fi",
+      "systemctl enable auditd 2>&1",
+      "systemctl start auditd 2>&1",
+      ...awaitUnitActive("auditd"),
+    ]),
+    { timeout: APT_INSTALL_TIMEOUT_MS },
   );
-  if (exists.stdout.includes("missing")) {
-    const install = await run(
-      exec,
-      "apt-get install -y auditd audispd-plugins 2>&1",
+  const state = unitState(setup.stdout);
+  if (setup.code !== 0)
+    return fail(
+      action,
+      state
+        ? `auditd was started but did not stay active (state: ${state})`
+        : setup.stderr ||
+            setup.stdout.trim().split("\n").pop() ||
+            "Failed to install/enable/start auditd",
     );
-    if (install.code !== 0)
-      return fail(action, install.stderr || "apt install auditd failed");
-  }
 
-  const enable = await run(
-    exec,
-    "systemctl enable auditd 2>&1 && systemctl start auditd 2>&1",
-  );
-  if (enable.code !== 0)
-    return fail(action, enable.stderr || "Failed to enable/start auditd");
-
-  return ok(action, "auditd installed, enabled, and started");
+  return ok(action, "auditd installed, enabled, and confirmed active");
 }
 
 async function blockBruteForceIps(
@@ -303,28 +511,44 @@ async function blockBruteForceIps(
     return skip(action, "No IPs with ≥50 failed login attempts found");
 
   // Validate every IP before it reaches a shell command
+  const isTrusted = compileCidrMatcher(trustedCidrs);
   const validIps = ips.filter((ip) => {
     if (isValidIPv4(ip)) return true;
     // Should never happen given the server-side grep regex, but guard anyway
     return false;
-  }).filter((ip) => !trustedCidrs.some((cidr) => ipv4InCidr(ip, cidr)));
+  }).filter((ip) => !isTrusted(ip));
   if (validIps.length === 0)
     return skip(action, "No valid IPv4 addresses extracted from auth log");
 
+  // Read the ruleset once and add every missing deny rule in a single exec,
+  // rather than a status probe plus a deny call per IP (up to 100 round-trips).
+  const status = await run(exec, "ufw status 2>/dev/null || true");
+  const toBlock = validIps.filter((ip) => !status.stdout.includes(ip));
+
   let blocked = 0;
   const failed: string[] = [];
-  for (const ip of validIps) {
-    const already = await run(
-      exec,
-      `ufw status 2>/dev/null | grep -qF "${ip}" && echo yes || echo no`,
-    );
-    if (already.stdout.trim() === "yes") continue;
-    const deny = await run(exec, `ufw deny from ${ip} to any 2>&1 || true`);
-    if (deny.code === 0 || deny.stdout.includes("Rule added")) {
-      blocked++;
-    } else {
-      failed.push(ip);
+  if (toBlock.length > 0) {
+    const script = toBlock
+      .map(
+        (ip, i) =>
+          `ufw deny from ${ip} to any >/dev/null 2>&1 && echo "denied ${i}" || echo "failed ${i}"`,
+      )
+      .join("\n");
+    const result = await exec.execute(script, {
+      timeout: UFW_BATCH_TIMEOUT_MS,
+    });
+    const reported = new Set<number>();
+    for (const line of result.stdout.split("\n")) {
+      const m = line.trim().match(/^(denied|failed) (\d+)$/);
+      if (!m) continue;
+      reported.add(Number(m[2]));
+      if (m[1] === "denied") blocked++;
+      else failed.push(toBlock[Number(m[2])]);
     }
+    // A batch cut short (timeout, dropped channel) leaves IPs unreported.
+    toBlock.forEach((ip, i) => {
+      if (!reported.has(i)) failed.push(ip);
+    });
   }
 
   if (failed.length > 0)
@@ -433,9 +657,6 @@ async function blockPhpUploads(
 ): Promise<HardeningActionResult> {
   const action = "BLOCK_PHP_UPLOADS";
   const htaccess = `${webRoot}/wp-content/uploads/.htaccess`;
-  const block =
-    '<FilesMatch "\\.(php|php5|phtml)$">\n  Deny from all\n</FilesMatch>';
-
   // Ensure the uploads directory exists
   const mkDir = await run(exec, `mkdir -p "${webRoot}/wp-content/uploads"`);
   if (mkDir.code !== 0)
@@ -449,7 +670,7 @@ async function blockPhpUploads(
 
   const write = await run(
     exec,
-    `printf '%s\\n' '${block.replace(/'/g, "'\\''")}' >> "${htaccess}"`,
+    `printf '%s\\n' ${PHP_UPLOADS_BLOCK} >> "${htaccess}"`,
   );
   if (write.code !== 0)
     return fail(action, write.stderr || "Failed to write .htaccess");
@@ -515,18 +736,10 @@ async function addSecurityHeaders(
   );
   if (check.code === 0) return skip(action, "Security headers already present");
 
-  const headersBlock = [
-    "",
-    "# Security headers",
-    "<IfModule mod_headers.c>",
-    '  Header always set X-Frame-Options "SAMEORIGIN"',
-    '  Header always set X-Content-Type-Options "nosniff"',
-    '  Header always set X-XSS-Protection "1; mode=block"',
-    '  Header always set Referrer-Policy "strict-origin-when-cross-origin"',
-    "</IfModule>",
-  ].join("\\n");
-
-  const write = await run(exec, `echo -e "${headersBlock}" >> "${htaccess}"`);
+  const write = await run(
+    exec,
+    `echo -e "${SECURITY_HEADERS_BLOCK}" >> "${htaccess}"`,
+  );
   if (write.code !== 0)
     return fail(action, write.stderr || "Failed to write .htaccess");
 
@@ -629,23 +842,9 @@ async function blockDebugLog(
     `rm -f "${wpContentDir}/debug.log" "${wpContentDir}/debug.log.1" 2>/dev/null || true`,
   );
 
-  const block = [
-    "",
-    "# _bf_debuglog_block_ Block access to WordPress log files",
-    '<FilesMatch "\\.(log)$">',
-    "  <IfModule mod_authz_core.c>",
-    "    Require all denied",
-    "  </IfModule>",
-    "  <IfModule !mod_authz_core.c>",
-    "    Order Deny,Allow",
-    "    Deny from all",
-    "  </IfModule>",
-    "</FilesMatch>",
-  ].join("\n");
-
   const write = await run(
     exec,
-    `printf '%s\\n' '${block.replace(/'/g, "'\\''")}' >> "${htaccess}"`,
+    `printf '%s\\n' ${DEBUG_LOG_BLOCK} >> "${htaccess}"`,
   );
   if (write.code !== 0)
     return fail(action, write.stderr || "Failed to write .htaccess");
@@ -678,59 +877,19 @@ async function blockSensitiveFiles(
   if (mkDir.code !== 0)
     return fail(action, mkDir.stderr || "Cannot create wp-content dir");
 
-  const denyBlock = [
-    "  <IfModule mod_authz_core.c>",
-    "    Require all denied",
-    "  </IfModule>",
-    "  <IfModule !mod_authz_core.c>",
-    "    Order Deny,Allow",
-    "    Deny from all",
-    "  </IfModule>",
-  ].join("\n");
-  const block = [
-    "",
-    "# _bf_sensitive_block_ Deny access to backup, config, and package files",
-    '<FilesMatch "\\.(env|bak|sql|gz|tar|zip|log)$">',
-    denyBlock,
-    "</FilesMatch>",
-    '<FilesMatch "^(composer\\.(json|lock)|package\\.json|yarn\\.lock|\\.htpasswd)$">',
-    denyBlock,
-    "</FilesMatch>",
-  ].join("\n");
-
   if (rootCheck.code !== 0) {
     const writeRoot = await run(
       exec,
-      `printf '%s\\n' '${block.replace(/'/g, "'\\''")}' >> "${htaccess}"`,
+      `printf '%s\\n' ${SENSITIVE_FILES_BLOCK} >> "${htaccess}"`,
     );
     if (writeRoot.code !== 0)
       return fail(action, writeRoot.stderr || "Failed to write .htaccess");
   }
 
   if (appCheck.code !== 0) {
-    const appGuard = [
-      "",
-      "# _bf_app_path_guard_ Deny unsafe direct file access in wp-content/app",
-      "Options -Indexes",
-      '<FilesMatch "^\\.">',
-      denyBlock,
-      "</FilesMatch>",
-      '<FilesMatch "\\.(php|php3|php4|php5|phtml|phar|pl|py|jsp|asp|aspx|cgi|sh|log|ini|conf|bak|sql|env|gz|tar|zip)$">',
-      denyBlock,
-      "</FilesMatch>",
-      '<FilesMatch "^(composer\\.(json|lock)|package\\.json|yarn\\.lock|pnpm-lock\\.yaml|\\.htpasswd)$">',
-      denyBlock,
-      "</FilesMatch>",
-      "<IfModule mod_rewrite.c>",
-      "  RewriteEngine On",
-      "  RewriteCond %{REQUEST_FILENAME} -f",
-      "  RewriteCond %{REQUEST_URI} !\\.(css|js|mjs|map|json|jpg|jpeg|png|gif|webp|svg|ico|woff|woff2|ttf|eot|otf|pdf|txt|xml|mp4|webm|mp3|wav|avif)$ [NC]",
-      "  RewriteRule ^ - [F,L]",
-      "</IfModule>",
-    ].join("\n");
     const writeApp = await run(
       exec,
-      `printf '%s\\n' '${appGuard.replace(/'/g, "'\\''")}' >> "${appHtaccess}"`,
+      `printf '%s\\n' ${APP_PATH_GUARD_BLOCK} >> "${appHtaccess}"`,
     );
     if (writeApp.code !== 0)
       return fail(
@@ -792,17 +951,9 @@ async function blockUserEnumeration(
   const check = await run(exec, `grep -q "author=" "${htaccess}" 2>/dev/null`);
   if (check.code === 0)
     return skip(action, "User enumeration block already present");
-  const block = [
-    "",
-    "# Block WordPress user enumeration via ?author= queries",
-    "<IfModule mod_rewrite.c>",
-    "  RewriteCond %{QUERY_STRING} ^author=\\d",
-    "  RewriteRule ^ /? [L,R=301]",
-    "</IfModule>",
-  ].join("\n");
   const write = await run(
     exec,
-    `printf '%s\\n' '${block.replace(/'/g, "'\\''")}' >> "${htaccess}"`,
+    `printf '%s\\n' ${USER_ENUMERATION_BLOCK} >> "${htaccess}"`,
   );
   if (write.code !== 0)
     return fail(action, write.stderr || "Failed to write .htaccess");
@@ -814,8 +965,10 @@ async function forceReinstallCore(
   webRoot: string,
 ): Promise<HardeningActionResult> {
   const action = "FORCE_REINSTALL_CORE";
-  const cmd = `wp core download --version=$(wp core version --path="${webRoot}" --skip-plugins --allow-root) --force --path="${webRoot}" --skip-plugins --allow-root`;
-  const runCmd = await run(exec, cmd);
+  // --skip-content fetches the no-content build (core only, no bundled
+  // themes/plugins): a smaller download, and wp-content is left untouched.
+  const cmd = `wp core download --version=$(wp core version --path="${webRoot}" --skip-plugins --allow-root) --skip-content --force --path="${webRoot}" --skip-plugins --allow-root`;
+  const runCmd = await exec.execute(cmd, { timeout: 5 * 60 * 1000 });
   if (runCmd.code !== 0)
     return fail(action, runCmd.stderr || "wp core download failed");
   return ok(action, "WordPress core files reinstalled successfully");
@@ -835,6 +988,43 @@ async function updateAllPlugins(
 
 // ─── Malware Quarantine ──────────────────────────────────────────────────────
 
+const QUARANTINE_DIR = "/var/lib/bedrock-forge/quarantine";
+
+/**
+ * Move every existing file in `files` into the quarantine directory with one
+ * uploaded script (a long scan hit list would not fit in an exec request).
+ * Files that no longer exist are skipped silently; files that fail to move
+ * are reported back by path.
+ */
+async function moveToQuarantine(
+  exec: Executor,
+  files: string[],
+): Promise<{ quarantined: number; failedFiles: string[] }> {
+  const timestamp = Math.floor(Date.now() / 1000);
+  const lines = [`mkdir -p ${QUARANTINE_DIR}`];
+  files.forEach((file, i) => {
+    const base = file.split("/").pop() || "malware";
+    const qFile = `'${file.replace(/'/g, "'\\''")}'`;
+    // The index keeps same-named files (index.php, wp-config.php) from
+    // overwriting each other within one batch.
+    const qQuarantinePath = `'${`${QUARANTINE_DIR}/${base}.${timestamp}.${i}.bak`.replace(/'/g, "'\\''")}'`;
+    lines.push(
+      `if [ -f ${qFile} ]; then mv ${qFile} ${qQuarantinePath} >/dev/null 2>&1 && echo "moved ${i}" || echo "failed ${i}"; fi`,
+    );
+  });
+
+  const result = await exec.executeScript(lines.join("\n"));
+  let quarantined = 0;
+  const failedFiles: string[] = [];
+  for (const line of result.stdout.split("\n")) {
+    const m = line.trim().match(/^(moved|failed) (\d+)$/);
+    if (!m) continue;
+    if (m[1] === "moved") quarantined++;
+    else failedFiles.push(files[Number(m[2])]);
+  }
+  return { quarantined, failedFiles };
+}
+
 async function quarantineMalwareServer(
   exec: Executor,
   malwareFiles: string[],
@@ -845,33 +1035,7 @@ async function quarantineMalwareServer(
     return skip(action, "No malware or suspicious files identified in previous scans to quarantine");
   }
 
-  // Ensure quarantine directory exists
-  await run(exec, "mkdir -p /var/lib/bedrock-forge/quarantine");
-
-  let quarantined = 0;
-  const failedFiles: string[] = [];
-
-  for (const file of malwareFiles) {
-    const qFile = `'${file.replace(/'/g, "'\\''")}'`;
-    // Check if file exists
-    const check = await run(exec, `test -f ${qFile}`);
-    if (check.code !== 0) {
-      continue; // Already removed or doesn't exist anymore
-    }
-
-    // Move it to quarantine
-    const base = file.split('/').pop() || 'malware';
-    const timestamp = Math.floor(Date.now() / 1000);
-    const quarantinePath = `/var/lib/bedrock-forge/quarantine/${base}.${timestamp}.bak`;
-    const qQuarantinePath = `'${quarantinePath.replace(/'/g, "'\\''")}'`;
-
-    const mv = await run(exec, `mv ${qFile} ${qQuarantinePath} 2>&1`);
-    if (mv.code !== 0) {
-      failedFiles.push(file);
-    } else {
-      quarantined++;
-    }
-  }
+  const { quarantined, failedFiles } = await moveToQuarantine(exec, malwareFiles);
 
   if (quarantined === 0 && failedFiles.length > 0) {
     return fail(action, `Failed to quarantine malware files: ${failedFiles.join(", ")}`);
@@ -900,33 +1064,7 @@ async function quarantineMalwareEnv(
     return skip(action, "No malware or suspicious files identified in previous scans within this environment to quarantine");
   }
 
-  // Ensure quarantine directory exists
-  await run(exec, "mkdir -p /var/lib/bedrock-forge/quarantine");
-
-  let quarantined = 0;
-  const failedFiles: string[] = [];
-
-  for (const file of envMalwareFiles) {
-    const qFile = `'${file.replace(/'/g, "'\\''")}'`;
-    // Check if file exists
-    const check = await run(exec, `test -f ${qFile}`);
-    if (check.code !== 0) {
-      continue; // Already removed or doesn't exist anymore
-    }
-
-    // Move it to quarantine
-    const base = file.split('/').pop() || 'malware';
-    const timestamp = Math.floor(Date.now() / 1000);
-    const quarantinePath = `/var/lib/bedrock-forge/quarantine/${base}.${timestamp}.bak`;
-    const qQuarantinePath = `'${quarantinePath.replace(/'/g, "'\\''")}'`;
-
-    const mv = await run(exec, `mv ${qFile} ${qQuarantinePath} 2>&1`);
-    if (mv.code !== 0) {
-      failedFiles.push(file);
-    } else {
-      quarantined++;
-    }
-  }
+  const { quarantined, failedFiles } = await moveToQuarantine(exec, envMalwareFiles);
 
   if (quarantined === 0 && failedFiles.length > 0) {
     return fail(action, `Failed to quarantine malware files: ${failedFiles.join(", ")}`);
@@ -948,6 +1086,24 @@ export async function applyServerHardeningActions(
   malwareFiles: string[] = [],
 ): Promise<HardeningActionResult[]> {
   const results: HardeningActionResult[] = [];
+  // Requested sshd directives are applied in one exec with one reload, the
+  // first time any of them comes up; later ones read their result from it.
+  let sshdBatch: Promise<HardeningActionResult[]> | undefined;
+  const sshdResult = async (
+    action: string,
+  ): Promise<HardeningActionResult> => {
+    sshdBatch ??= setSshdOptions(
+      exec,
+      BATCHED_SSHD_OPTIONS.filter((opt) =>
+        actions.includes(opt.action as ServerHardeningActionType),
+      ),
+    );
+    const batch = await sshdBatch;
+    return (
+      batch.find((r) => r.action === action) ??
+      fail(action, "sshd batch returned no result")
+    );
+  };
 
   for (const action of actions) {
     try {
@@ -956,10 +1112,8 @@ export async function applyServerHardeningActions(
           results.push(await fixWorldWritable(exec));
           break;
         case "DISABLE_X11_FORWARDING":
-          results.push(await disableX11Forwarding(exec));
-          break;
         case "SET_MAX_AUTH_TRIES":
-          results.push(await setMaxAuthTries(exec));
+          results.push(await sshdResult(action));
           break;
         case "FIX_SSH_DIR_PERMS":
           results.push(await fixSshDirPerms(exec));
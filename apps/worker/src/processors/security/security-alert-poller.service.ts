@@ -5,18 +5,35 @@ import type { Job } from "bullmq";
 import { PrismaService } from "../../prisma/prisma.service";
 import { SshKeyService } from "../../services/ssh-key.service";
 import { createRemoteExecutor } from "@bedrock-forge/remote-executor";
-import { QUEUES, JOB_TYPES } from "@bedrock-forge/shared";
+import { QUEUES, JOB_TYPES, mapWithConcurrency } from "@bedrock-forge/shared";
 
 const FAILED_LOGIN_SPIKE_THRESHOLD = 10;
 const MAX_RAW_LOG_EXCERPT = 500;
-
-type FileSnapshotEntry = {
-  hash: string;
+const MAX_SNAPSHOT_FILES = 10_000;
+const HASH_BATCH_SIZE = 250;
+// Batches run as parallel SSH execs so sha256sum uses several server cores;
+// kept well under the pool's per-server connection cap.
+const HASH_CONCURRENCY = 4;
+// Servers are independent and each poll is mostly SSH latency, so several are
+// polled at once; the poll then takes as long as the slowest server rather
+// than the sum of all of them.
+const SERVER_POLL_CONCURRENCY = 8;
+
+type FileMetadata = {
   size: number;
   mtime: number;
+  // Inode change time — unlike mtime it cannot be set back with `touch`, so
+  // an unchanged (size, mtime, ctime) triple is safe to reuse a hash for.
+  // Optional because snapshots stored before it was recorded lack it.
+  ctime?: number;
+};
+
+type FileSnapshotEntry = FileMetadata & {
+  hash: string;
 };
 
 type FileSnapshot = Record<string, FileSnapshotEntry>;
+type FileListing = Record<string, Required<FileMetadata>>;
 
 type FileChangeBatch = {
   added: string[];
@@ -76,11 +93,12 @@ export class SecurityAlertPollerService {
       },
     });
 
-    for (const setting of settings) {
-      if (!data.force && (!setting.enabled || !this.isAlertDue(setting, now))) {
-        continue;
-      }
+    const due = settings.filter(
+      (setting) =>
+        data.force || (setting.enabled && this.isAlertDue(setting, now)),
+    );
 
+    await mapWithConcurrency(due, SERVER_POLL_CONCURRENCY, async (setting) => {
       try {
         const executor = createRemoteExecutor(
           await this.sshKey.getSshConfig(setting.server),
@@ -126,7 +144,7 @@ export class SecurityAlertPollerService {
           `Security alert poll failed for server ${Number(setting.server_id)}: ${err instanceof Error ? err.message : String(err)}`,
         );
       }
-    }
+    });
   }
 
   private isAlertDue(
@@ -232,8 +250,12 @@ export class SecurityAlertPollerService {
       this.buildFileSnapshotCommand(watchPaths),
       { timeout: 120_000 },
     );
-    const nextSnapshot = this.parseFileSnapshot(result.stdout);
     const previousSnapshot = this.asFileSnapshot(setting.file_snapshot);
+    const nextSnapshot = await this.hashFileListing(
+      executor,
+      this.parseFileListing(result.stdout),
+      previousSnapshot,
+    );
     const changes = this.compareSnapshots(previousSnapshot, nextSnapshot);
 
     await this.prisma.serverSecurityAlertSetting.update({
@@ -282,6 +304,10 @@ export class SecurityAlertPollerService {
     ].join(" ");
   }
 
+  /**
+   * List candidate files with size, mtime and ctime in a single `find` per
+   * watch path. Hashing is a separate step so unchanged files can skip it.
+   */
   private buildFileSnapshotCommand(paths: string[]): string {
     const args = paths.map((path) => this.shellGlobArg(path)).join(" ");
     const excludes = [
@@ -298,6 +324,7 @@ export class SecurityAlertPollerService {
     ]
       .map((pattern) => `-path ${this.shellQuote(pattern)}`)
       .join(" -o ");
+    const printf = this.shellQuote("%s\\t%T@\\t%C@\\t%p\\n");
 
     return [
       "bash -lc",
@@ -306,23 +333,66 @@ shopt -s nullglob
 for target in ${args}; do
   [ -e "$target" ] || continue
   if [ -d "$target" ]; then
-    find "$target" \\( ${excludes} \\) -prune -o -type f -size -5M -exec sh -c '
-      for file do
-        hash=$(sha256sum "$file" 2>/dev/null | awk "{print \\$1}") || continue
-        meta=$(stat -c "%s	%Y" "$file" 2>/dev/null) || continue
-        printf "%s	%s	%s\\n" "$hash" "$meta" "$file"
-      done
-    ' sh {} +
+    find "$target" \\( ${excludes} \\) -prune -o -type f -size -5M -printf ${printf} 2>/dev/null
   elif [ -f "$target" ]; then
-    hash=$(sha256sum "$target" 2>/dev/null | awk "{print \\$1}") || continue
-    meta=$(stat -c "%s	%Y" "$target" 2>/dev/null) || continue
-    printf "%s	%s	%s\\n" "$hash" "$meta" "$target"
+    find "$target" -maxdepth 0 -type f -printf ${printf} 2>/dev/null
   fi
 done
 `),
     ].join(" ");
   }
 
+  private buildHashCommand(paths: string[]): string {
+    return `sha256sum -- ${paths.map((path) => this.shellQuote(path)).join(" ")} 2>/dev/null`;
+  }
+
+  /**
+   * Build the next snapshot from a metadata listing. Files whose size, mtime
+   * and ctime all match the previous snapshot keep their stored hash; only
+   * new or changed files are read and hashed on the server, in batches
+   * spread across a few concurrent execs.
+   */
+  private async hashFileListing(
+    executor: ReturnType<typeof createRemoteExecutor>,
+    listing: FileListing,
+    previous: FileSnapshot | null,
+  ): Promise<FileSnapshot> {
+    const snapshot: FileSnapshot = {};
+    const toHash: string[] = [];
+
+    for (const [path, meta] of Object.entries(listing)) {
+      const prev = previous?.[path];
+      if (
+        prev &&
+        prev.size === meta.size &&
+        prev.mtime === meta.mtime &&
+        prev.ctime === meta.ctime
+      ) {
+        snapshot[path] = { ...meta, hash: prev.hash };
+      } else {
+        toHash.push(path);
+      }
+    }
+
+    const batches: string[][] = [];
+    for (let i = 0; i < toHash.length; i += HASH_BATCH_SIZE) {
+      batches.push(toHash.slice(i, i + HASH_BATCH_SIZE));
+    }
+
+    await mapWithConcurrency(batches, HASH_CONCURRENCY, async (batch) => {
+      const result = await executor.execute(this.buildHashCommand(batch), {
+        timeout: 120_000,
+      });
+      // Files that vanished between listing and hashing are simply absent.
+      for (const [path, hash] of this.parseHashOutput(result.stdout)) {
+        const meta = listing[path];
+        if (meta) snapshot[path] = { ...meta, hash };
+      }
+    });
+
+    return snapshot;
+  }
+
   private parseSuccessfulLogins(output: string) {
     return output
       .split("\n")
@@ -356,26 +426,42 @@ done
     return counts;
   }
 
-  private parseFileSnapshot(output: string): FileSnapshot {
-    const snapshot: FileSnapshot = {};
+  private parseFileListing(output: string): FileListing {
+    const listing: FileListing = {};
     let count = 0;
     for (const line of output.split("\n")) {
       if (!line.trim()) continue;
-      const [hash, sizeRaw, mtimeRaw, ...pathParts] = line.split("\t");
+      const [sizeRaw, mtimeRaw, ctimeRaw, ...pathParts] = line.split("\t");
       const path = pathParts.join("\t");
       const size = Number(sizeRaw);
-      const mtime = Number(mtimeRaw);
-      if (!hash || !path || Number.isNaN(size) || Number.isNaN(mtime)) continue;
-      if (count >= 10000) {
+      const mtime = Math.floor(Number(mtimeRaw));
+      const ctime = Math.floor(Number(ctimeRaw));
+      if (!path || Number.isNaN(size) || Number.isNaN(mtime) || Number.isNaN(ctime))
+        continue;
+      if (count >= MAX_SNAPSHOT_FILES) {
         this.logger.warn(
           "File snapshot exceeded MAX_FILES limit (10,000 files). Truncating snapshot to avoid database size blowup.",
         );
         break;
       }
-      snapshot[path] = { hash, size, mtime };
+      listing[path] = { size, mtime, ctime };
       count++;
     }
-    return snapshot;
+    return listing;
+  }
+
+  /** Parse `sha256sum` output, undoing its escaping of `\\` and newlines. */
+  private parseHashOutput(output: string): Array<[string, string]> {
+    const hashes: Array<[string, string]> = [];
+    for (const line of output.split("\n")) {
+      const match = line.match(/^(\\?)([0-9a-f]{64}) [ *](.+)$/);
+      if (!match) continue;
+      const path = match[1]
+        ? match[3].replace(/\\(\\|n)/g, (_, c: string) => (c === "n" ? "\n" : "\\"))
+        : match[3];
+      hashes.push([path, match[2]]);
+    }
+    return hashes;
   }
 
   private compareSnapshots(
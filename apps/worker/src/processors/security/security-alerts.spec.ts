@@ -52,4 +52,127 @@ describe("Security alert snapshot comparison", () => {
     expect(command).toContain("*/logs/*");
     expect(command).toContain("*/uploads/*");
   });
+
+  it("only hashes files whose size, mtime or ctime changed", async () => {
+    const service = makeService();
+    const hashA = "a".repeat(64);
+    const hashB = "b".repeat(64);
+    const executor = {
+      execute: jest.fn().mockResolvedValue({
+        code: 0,
+        stdout: `${hashB}  /etc/sudoers\n`,
+        stderr: "",
+      }),
+    };
+
+    const listing = service.parseFileListing(
+      "10\t1.5\t1.5\t/etc/ssh/sshd_config\n22\t2.0\t2.0\t/etc/sudoers\n",
+    );
+    const snapshot = await service.hashFileListing(executor, listing, {
+      "/etc/ssh/sshd_config": { hash: hashA, size: 10, mtime: 1, ctime: 1 },
+      "/etc/sudoers": { hash: "old", size: 20, mtime: 1, ctime: 1 },
+    });
+
+    expect(executor.execute).toHaveBeenCalledTimes(1);
+    expect(executor.execute.mock.calls[0][0]).toContain("'/etc/sudoers'");
+    expect(executor.execute.mock.calls[0][0]).not.toContain("sshd_config");
+    expect(snapshot).toEqual({
+      "/etc/ssh/sshd_config": { hash: hashA, size: 10, mtime: 1, ctime: 1 },
+      "/etc/sudoers": { hash: hashB, size: 22, mtime: 2, ctime: 2 },
+    });
+  });
+
+  it("rehashes entries from snapshots recorded without ctime", async () => {
+    const service = makeService();
+    const executor = {
+      execute: jest.fn().mockResolvedValue({ code: 0, stdout: "", stderr: "" }),
+    };
+
+    await service.hashFileListing(
+      executor,
+      service.parseFileListing("10\t1\t1\t/etc/crontab\n"),
+      { "/etc/crontab": { hash: "a", size: 10, mtime: 1 } },
+    );
+
+    expect(executor.execute).toHaveBeenCalledTimes(1);
+  });
+
+  it("unescapes sha256sum output for unusual file names", () => {
+    const service = makeService();
+    const hash = "c".repeat(64);
+
+    expect(
+      service.parseHashOutput(`\\${hash}  /tmp/odd\\nname\n${hash}  /tmp/plain\n`),
+    ).toEqual([
+      ["/tmp/odd\nname", hash],
+      ["/tmp/plain", hash],
+    ]);
+  });
+
+  it("spreads large hash sets across a bounded number of parallel execs", async () => {
+    const service = makeService();
+    let inFlight = 0;
+    let maxInFlight = 0;
+    const executor = {
+      execute: jest.fn().mockImplementation(async () => {
+        inFlight++;
+        maxInFlight = Math.max(maxInFlight, inFlight);
+        await new Promise((resolve) => setImmediate(resolve));
+        inFlight--;
+        return { code: 0, stdout: "", stderr: "" };
+      }),
+    };
+    const listing = Object.fromEntries(
+      Array.from({ length: 2_000 }, (_, i) => [
+        `/var/www/site/file-${i}.php`,
+        { size: 1, mtime: 1, ctime: 1 },
+      ]),
+    );
+
+    await service.hashFileListing(executor, listing, null);
+
+    expect(executor.execute).toHaveBeenCalledTimes(8);
+    expect(maxInFlight).toBe(4);
+  });
+
+  it("polls due servers concurrently up to a fixed limit", async () => {
+    let inFlight = 0;
+    let maxInFlight = 0;
+    const settings = Array.from({ length: 20 }, (_, i) => ({
+      id: BigInt(i + 1),
+      server_id: BigInt(i + 1),
+      enabled: true,
+      last_checked_at: null,
+      interval_minutes: 5,
+      ssh_login_alerts_enabled: false,
+      file_change_alerts_enabled: false,
+      server: { id: BigInt(i + 1), name: `s${i}`, ip_address: "10.0.0.1" },
+    }));
+    const prisma = {
+      serverSecurityAlertSetting: {
+        findMany: jest.fn().mockResolvedValue(settings),
+        update: jest.fn().mockResolvedValue({}),
+      },
+      maintenanceWindow: { count: jest.fn().mockResolvedValue(0) },
+    };
+    const sshKey = {
+      getSshConfig: jest.fn().mockImplementation(async () => {
+        inFlight++;
+        maxInFlight = Math.max(maxInFlight, inFlight);
+        await new Promise((resolve) => setImmediate(resolve));
+        inFlight--;
+        return { host: "10.0.0.1", port: 22, username: "root", privateKey: "k" };
+      }),
+    };
+    const service = new SecurityAlertPollerService(
+      prisma as any,
+      sshKey as any,
+      {} as any,
+    );
+
+    await service.processAlertPoll({ data: {} } as any);
+
+    expect(prisma.serverSecurityAlertSetting.update).toHaveBeenCalledTimes(20);
+    expect(maxInFlight).toBe(8);
+  });
 });
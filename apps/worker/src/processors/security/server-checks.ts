@@ -1,4 +1,7 @@
-import type { SecurityFinding } from "@bedrock-forge/shared";
+import {
+  mapWithConcurrency,
+  type SecurityFinding,
+} from "@bedrock-forge/shared";
 import { makeFinding } from "./scoring";
 
 type Executor = {
@@ -8,18 +11,20 @@ type Executor = {
   ): Promise<{ stdout: string; stderr: string; code: number }>;
 };
 
+// Independent per-user reads are dispatched this many at a time on separate
+// pooled connections, so N home users cost ~N/4 round trips instead of N.
+const AUDIT_READ_CONCURRENCY = 4;
+
 // ─── SSH_AUDIT ────────────────────────────────────────────────────────────────
 
 export async function runSshAudit(exec: Executor): Promise<SecurityFinding[]> {
   const findings: SecurityFinding[] = [];
 
   // 1. Collect authorized_keys for root and all home users
-  const { stdout: authKeysRoot } = await exec.execute(
-    `cat /root/.ssh/authorized_keys 2>/dev/null || true`,
-  );
-  const { stdout: homeUsers } = await exec.execute(
-    `ls /home 2>/dev/null || true`,
-  );
+  const [{ stdout: authKeysRoot }, { stdout: homeUsers }] = await Promise.all([
+    exec.execute(`cat /root/.ssh/authorized_keys 2>/dev/null || true`),
+    exec.execute(`ls /home 2>/dev/null || true`),
+  ]);
 
   const users = homeUsers
     .split("\n")
@@ -33,17 +38,24 @@ export async function runSshAudit(exec: Executor): Promise<SecurityFinding[]> {
       content: authKeysRoot,
     });
   }
-  for (const user of users) {
-    const { stdout } = await exec.execute(
-      `cat /home/${user}/.ssh/authorized_keys 2>/dev/null || true`,
-    );
-    if (stdout.trim()) {
+  const userKeys = await mapWithConcurrency(
+    users,
+    AUDIT_READ_CONCURRENCY,
+    async (user) => {
+      const { stdout } = await exec.execute(
+        `cat /home/${user}/.ssh/authorized_keys 2>/dev/null || true`,
+      );
+      return stdout;
+    },
+  );
+  users.forEach((user, i) => {
+    if (userKeys[i].trim()) {
       allKeyFiles.push({
         path: `/home/${user}/.ssh/authorized_keys`,
-        content: stdout,
+        content: userKeys[i],
       });
     }
-  }
+  });
 
   for (const { path, content } of allKeyFiles) {
     const keys = content
@@ -202,7 +214,7 @@ export async function runSshAudit(exec: Executor): Promise<SecurityFinding[]> {
 
   // 3. SSH host key file permissions — should be 600
   const { stdout: hostKeyPerms } = await exec.execute(
-    `find /etc/ssh -name "ssh_host_*_key" -not -name "*.pub" -exec stat -c '%n %a' {} \\; 2>/dev/null || true`,
+    `find /etc/ssh -name "ssh_host_*_key" -not -name "*.pub" -exec stat -c '%n %a' {} + 2>/dev/null || true`,
   );
   for (const line of hostKeyPerms.split("\n").filter(Boolean)) {
     const parts = line.trim().split(" ");
@@ -227,22 +239,20 @@ export async function runSshAudit(exec: Executor): Promise<SecurityFinding[]> {
     }
   }
 
-  // 4. .ssh directory permissions for root and home users — should be 700
-  const dirsToCheck: string[] = ["/root/.ssh"];
-  const { stdout: homeDirs } = await exec.execute(
-    `ls /home 2>/dev/null || true`,
+  // 4. .ssh directory permissions for root and home users — should be 700.
+  // A single stat over the glob lists every directory's mode in one round
+  // trip instead of one exec per home directory.
+  const { stdout: sshDirPerms } = await exec.execute(
+    `stat -c '%a %n' /root/.ssh /home/*/.ssh 2>/dev/null || true`,
   );
-  for (const u of homeDirs
+  for (const line of sshDirPerms
     .split("\n")
     .map((l) => l.trim())
     .filter(Boolean)) {
-    dirsToCheck.push(`/home/${u}/.ssh`);
-  }
-  for (const dir of dirsToCheck) {
-    const { stdout: dirPerm } = await exec.execute(
-      `stat -c '%a' ${dir} 2>/dev/null || true`,
-    );
-    const perm = dirPerm.trim();
+    const sep = line.indexOf(" ");
+    if (sep === -1) continue;
+    const perm = line.slice(0, sep);
+    const dir = line.slice(sep + 1);
     if (perm && perm !== "700") {
       findings.push(
         makeFinding(
@@ -270,12 +280,17 @@ export async function runSshAudit(exec: Executor): Promise<SecurityFinding[]> {
       .map((l) => l.trim())
       .filter((l) => l && !l.startsWith("#"));
 
-    const getValue = (key: string): string | null => {
-      const line = configLines.find((l) =>
-        l.toLowerCase().startsWith(key.toLowerCase()),
-      );
-      return line ? (line.split(/\s+/)[1] ?? null) : null;
-    };
+    // Index the config in one pass instead of rescanning it for every
+    // lookup. Keywords are case-insensitive and, as in sshd itself, the
+    // first occurrence wins.
+    const directives = new Map<string, string | null>();
+    for (const line of configLines) {
+      const [keyword, value] = line.split(/\s+/);
+      const key = keyword.toLowerCase();
+      if (!directives.has(key)) directives.set(key, value ?? null);
+    }
+    const getValue = (key: string): string | null =>
+      directives.get(key.toLowerCase()) ?? null;
 
     const permitRootLogin = getValue("PermitRootLogin");
     if (permitRootLogin === "yes") {
@@ -668,16 +683,18 @@ export async function runServerHardening(
         `${wwFiles.length} world-writable file(s) found`,
         "World-writable files can be modified by any process running on the server — a common malware propagation vector.",
         {
-          remediation: `chmod o-w <file> for each entry. Run: find /home -type f -perm -002 -exec chmod o-w {} \\;`,
+          remediation: `chmod o-w <file> for each entry. Run: find /home -type f -perm -002 -exec chmod o-w {} +`,
           metadata: { files: wwFiles },
         },
       ),
     );
   }
 
-  // 6. Suspicious cron entries — common persistence mechanism
+  // 6. Suspicious cron entries — common persistence mechanism. One cat reads
+  // the system crontabs and every user's spool file (Debian and RHEL paths)
+  // instead of forking a cat per cron.d entry and a crontab per user.
   const { stdout: cronContent } = await exec.execute(
-    `(cat /etc/crontab 2>/dev/null; ls /etc/cron.d/ 2>/dev/null | xargs -I{} cat /etc/cron.d/{} 2>/dev/null; crontab -l 2>/dev/null; for u in $(ls /home 2>/dev/null); do crontab -u "$u" -l 2>/dev/null; done) | grep -E "curl |wget |base64|/tmp/[a-zA-Z]|python[23]? -c|bash -[ic]" || true`,
+    `(cat /etc/crontab /etc/cron.d/* /var/spool/cron/crontabs/* /var/spool/cron/* 2>/dev/null; crontab -l 2>/dev/null) | grep -E "curl |wget |base64|/tmp/[a-zA-Z]|python[23]? -c|bash -[ic]" || true`,
     { timeout: 30000 },
   );
   const suspiciousCrons = cronContent
@@ -769,7 +786,7 @@ export async function runMalwareScan(
     );
     const hitLines = maldetScan
       .split("\n")
-      .filter((l) => l.toLowerCase().includes("hit") || l.includes("INFECTED"));
+      .filter((l) => /hit/i.test(l) || l.includes("INFECTED"));
     if (hitLines.length > 0) {
       findings.push(
         makeFinding(
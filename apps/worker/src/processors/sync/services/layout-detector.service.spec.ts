@@ -8,16 +8,17 @@ describe("LayoutDetectorService", () => {
     service = new LayoutDetectorService();
   });
 
-  function makeExecutor(
-    commands: Record<string, { code: number; stdout: string; stderr: string }>,
-  ) {
+  /** Simulates the remote if/elif probe against a set of existing files. */
+  function makeExecutor(existing: string[]) {
     return {
       execute: jest.fn().mockImplementation((cmd: string) => {
-        const match = Object.keys(commands).find((k) => cmd.includes(k));
-        if (match) {
-          return Promise.resolve(commands[match]);
-        }
-        return Promise.resolve({ code: 0, stdout: "missing", stderr: "" });
+        const probed = [...cmd.matchAll(/test -f '([^']+)'; then echo (\d+)/g)];
+        const hit = probed.find(([, path]) => existing.includes(path));
+        return Promise.resolve({
+          code: 0,
+          stdout: hit ? hit[2] : "missing",
+          stderr: "",
+        });
       }),
     } as any;
   }
@@ -29,9 +30,7 @@ describe("LayoutDetectorService", () => {
   }
 
   it("detects Bedrock layout", async () => {
-    const executor = makeExecutor({
-      "web/wp/wp-includes/version.php": { code: 0, stdout: "ok", stderr: "" },
-    });
+    const executor = makeExecutor(["/var/www/web/wp/wp-includes/version.php"]);
     const tracker = makeTracker();
 
     const layout = await service.detectWpLayout(
@@ -47,9 +46,7 @@ describe("LayoutDetectorService", () => {
   });
 
   it("detects standard WordPress layout", async () => {
-    const executor = makeExecutor({
-      "/var/www/wp-includes/version.php": { code: 0, stdout: "ok", stderr: "" },
-    });
+    const executor = makeExecutor(["/var/www/wp-includes/version.php"]);
     const tracker = makeTracker();
 
     const layout = await service.detectWpLayout(
@@ -63,4 +60,23 @@ describe("LayoutDetectorService", () => {
     expect(layout.corePath).toBe("/var/www");
     expect(layout.contentPath).toBe("/var/www/wp-content");
   });
+
+  it("probes every layout in a single exec and falls back to standard", async () => {
+    const executor = makeExecutor([]);
+    const tracker = makeTracker();
+
+    const layout = await service.detectWpLayout(
+      executor,
+      "/var/www",
+      tracker,
+      "target",
+    );
+
+    expect(executor.execute).toHaveBeenCalledTimes(1);
+    expect(layout).toEqual({
+      corePath: "/var/www",
+      contentPath: "/var/www/wp-content",
+      isBedrock: false,
+    });
+  });
 });
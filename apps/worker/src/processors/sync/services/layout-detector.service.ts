@@ -14,6 +14,16 @@ export type WpLayout = {
   isBedrock: boolean;
 };
 
+/**
+ * Known layouts, relative to the site root, in probe order. The first whose
+ * wp-includes/version.php exists wins.
+ */
+const LAYOUT_CANDIDATES = [
+  { core: "", content: "/wp-content", label: "standard" },
+  { core: "/web/wp", content: "/web/app", label: "bedrock (web/wp)" },
+  { core: "/wp", content: "/app", label: "bedrock (wp)" },
+] as const;
+
 @Injectable()
 export class LayoutDetectorService {
   private readonly logger = new Logger(LayoutDetectorService.name);
@@ -34,46 +44,33 @@ export class LayoutDetectorService {
     tracker: StepTracker,
     label: string,
   ): Promise<WpLayout> {
-    const candidates: Array<{ core: string; content: string; label: string }> =
-      [
-        {
-          core: rootPath,
-          content: `${rootPath}/wp-content`,
-          label: "standard",
-        },
-        {
-          core: `${rootPath}/web/wp`,
-          content: `${rootPath}/web/app`,
-          label: "bedrock (web/wp)",
-        },
-        {
-          core: `${rootPath}/wp`,
-          content: `${rootPath}/app`,
-          label: "bedrock (wp)",
-        },
-      ];
-
-    for (const candidate of candidates) {
-      try {
-        const check = await executor.execute(
-          `test -f ${shellQuote(`${candidate.core}/wp-includes/version.php`)} && echo ok || echo missing`,
-        );
-        if (check.stdout.trim() === "ok") {
-          const isBedrock = candidate.label.startsWith("bedrock");
-          await tracker.track({
-            step: `${label} WordPress layout detected`,
-            level: "info",
-            detail: `${candidate.label} — core=${candidate.core}, content=${candidate.content}`,
-          });
-          return {
-            corePath: candidate.core,
-            contentPath: candidate.content,
-            isBedrock,
-          };
-        }
-      } catch {
-        // probe failed — try next candidate
+    // Probe every candidate in one exec with an if/elif chain that echoes
+    // the index of the first hit, instead of one round trip per layout.
+    const probes = LAYOUT_CANDIDATES.map(
+      (c, i) =>
+        `test -f ${shellQuote(`${rootPath}${c.core}/wp-includes/version.php`)}; then echo ${i}`,
+    );
+    try {
+      const check = await executor.execute(
+        `if ${probes.join("; elif ")}; else echo missing; fi`,
+      );
+      const candidate = LAYOUT_CANDIDATES[parseInt(check.stdout.trim(), 10)];
+      if (candidate) {
+        const core = `${rootPath}${candidate.core}`;
+        const content = `${rootPath}${candidate.content}`;
+        await tracker.track({
+          step: `${label} WordPress layout detected`,
+          level: "info",
+          detail: `${candidate.label} — core=${core}, content=${content}`,
+        });
+        return {
+          corePath: core,
+          contentPath: content,
+          isBedrock: candidate.label.startsWith("bedrock"),
+        };
       }
+    } catch {
+      // probe failed — fall back below
     }
 
     // Fallback — assume standard layout and continue
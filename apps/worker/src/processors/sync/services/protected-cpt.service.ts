@@ -1,4 +1,5 @@
 import { Injectable, Logger } from "@nestjs/common";
+import { randomBytes } from "crypto";
 import { StepTracker } from "../../../services/step-tracker";
 import { createRemoteExecutor } from "@bedrock-forge/remote-executor";
 import { escapeMysql } from "../../../utils/cyberpanel-http";
@@ -21,6 +22,11 @@ export type ProtectedPostTypeBackup = {
 
 const POST_TYPE_REGEX = /^[A-Za-z0-9_-]+$/;
 
+// Leading slashes plus an optional wp-content/uploads/ and then app/uploads/
+// prefix, stripped in one pass.
+const UPLOAD_PREFIX_REGEX = /^\/*(?:wp-content\/uploads\/)?(?:app\/uploads\/)?/;
+const ATTACHMENT_FILE_REGEX = /s:\d+:"([^"]+\.[A-Za-z0-9]{2,8})"/g;
+
 @Injectable()
 export class ProtectedCptService {
   private readonly logger = new Logger(ProtectedCptService.name);
@@ -132,9 +138,7 @@ export class ProtectedCptService {
         ? attached.slice(0, attached.lastIndexOf("/"))
         : "";
       const metadata = meta.metadata ?? "";
-      const fileMatches = metadata.matchAll(
-        /s:\d+:"([^"]+\.[A-Za-z0-9]{2,8})"/g,
-      );
+      const fileMatches = metadata.matchAll(ATTACHMENT_FILE_REGEX);
       for (const match of fileMatches) {
         const raw = match[1];
         const candidate = raw.includes("/") || !dir ? raw : `${dir}/${raw}`;
@@ -147,12 +151,9 @@ export class ProtectedCptService {
   }
 
   normalizeUploadPath(path: string): string | null {
-    const clean = path
-      .replace(/\\/g, "/")
-      .replace(/^\/+/, "")
-      .replace(/^wp-content\/uploads\//, "")
-      .replace(/^app\/uploads\//, "")
-      .trim();
+    // Most stored paths are already POSIX; only translate when needed.
+    const posix = path.includes("\\") ? path.replace(/\\/g, "/") : path;
+    const clean = posix.replace(UPLOAD_PREFIX_REGEX, "").trim();
 
     if (!clean || clean.includes("..") || clean.endsWith("/")) return null;
     return clean;
@@ -286,7 +287,7 @@ export class ProtectedCptService {
       `CREATE TABLE \`${prefix}forge_backup_commentmeta\` AS SELECT * FROM \`${prefix}commentmeta\` WHERE comment_id IN (SELECT comment_ID FROM \`${prefix}forge_backup_comments\`);`,
     ];
 
-    const sqlFile = `/tmp/forge_post_type_backup_${Date.now()}.sql`;
+    const sqlFile = `/tmp/forge_post_type_backup_${randomBytes(12).toString("base64url")}.sql`;
     await executor.pushFile({
       remotePath: sqlFile,
       content: Buffer.from(queries.join("\n")),
@@ -423,7 +424,7 @@ export class ProtectedCptService {
       `DROP TABLE IF EXISTS \`${prefix}forge_backup_posts\`;`,
     ];
 
-    const sqlFile = `/tmp/forge_post_type_restore_${Date.now()}.sql`;
+    const sqlFile = `/tmp/forge_post_type_restore_${randomBytes(12).toString("base64url")}.sql`;
     await executor.pushFile({
       remotePath: sqlFile,
       content: Buffer.from(queries.join("\n")),
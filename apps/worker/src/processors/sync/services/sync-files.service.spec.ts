@@ -76,6 +76,27 @@ describe("SyncFilesService", () => {
       ).resolves.toBeUndefined();
     });
 
+    it("rewrites every URL pair in a single find/sed pass", async () => {
+      const executor = makeExecutorForFiles({ sedExitCode: 0 });
+      const tracker = { track: jest.fn().mockResolvedValue(undefined) } as any;
+
+      await service.replaceUrlsInFiles(
+        "https://staging.example.com",
+        "https://example.com",
+        "/var/www/html/wp-content",
+        executor as any,
+        tracker,
+        makeJob(JOB_TYPES.SYNC_CLONE, { jobExecutionId: 1 }),
+      );
+
+      const sedCalls = executor.execute.mock.calls
+        .map(([cmd]: any[]) => cmd as string)
+        .filter((cmd) => cmd.includes("sed -i"));
+      expect(sedCalls).toHaveLength(1);
+      // plain, protocol-flipped, JSON-escaped and URL-encoded variants
+      expect(sedCalls[0].match(/ -e /g)).toHaveLength(6);
+    });
+
     it("throws when any sed replacement fails", async () => {
       const executor = makeExecutorForFiles({ sedExitCode: 1 });
       const tracker = { track: jest.fn().mockResolvedValue(undefined) } as any;
@@ -114,6 +135,73 @@ describe("SyncFilesService", () => {
     });
   });
 
+  describe("pushFiles()", () => {
+    const targetEnv = {
+      root_path: "/tgt/path",
+      server: {
+        ip_address: "1.2.3.4",
+        ssh_port: 22,
+        ssh_user: "user",
+        name: "target",
+        ssh_private_key_encrypted: null,
+      },
+    };
+
+    function makeExecutors(sourceProbe: string) {
+      const sourceExecutor = {
+        execute: jest
+          .fn()
+          .mockResolvedValue({ code: 0, stdout: sourceProbe, stderr: "" }),
+      };
+      const targetExecutor = {
+        execute: jest
+          .fn()
+          .mockResolvedValue({ code: 1, stdout: "", stderr: "" }),
+      };
+      const tracker = { track: jest.fn().mockResolvedValue(undefined) };
+      return { sourceExecutor, targetExecutor, tracker };
+    }
+
+    it("skips the sync without touching the target when the source root is missing", async () => {
+      const { sourceExecutor, targetExecutor, tracker } =
+        makeExecutors("missing");
+
+      await service.pushFiles(
+        makeJob(JOB_TYPES.SYNC_CLONE, { jobExecutionId: 1 }),
+        { root_path: "/src/path" },
+        targetEnv,
+        sourceExecutor as any,
+        targetExecutor as any,
+        tracker as any,
+      );
+
+      expect(sourceExecutor.execute).toHaveBeenCalledTimes(1);
+      expect(targetExecutor.execute).not.toHaveBeenCalled();
+    });
+
+    it("does not probe the target for rsync when the source lacks it", async () => {
+      const { sourceExecutor, targetExecutor, tracker } =
+        makeExecutors("no-rsync");
+      const relaySpy = jest
+        .spyOn(service as any, "pushFilesViaTarRelay")
+        .mockResolvedValue(undefined);
+
+      await service.pushFiles(
+        makeJob(JOB_TYPES.SYNC_CLONE, { jobExecutionId: 1 }),
+        { root_path: "/src/path" },
+        targetEnv,
+        sourceExecutor as any,
+        targetExecutor as any,
+        tracker as any,
+      );
+
+      expect(relaySpy).toHaveBeenCalled();
+      expect(targetExecutor.execute).not.toHaveBeenCalledWith(
+        expect.stringContaining("command -v rsync"),
+      );
+    });
+  });
+
   describe("pushFilesViaRsync()", () => {
     function makeRsyncArgs(result: {
       code: number;
@@ -168,6 +256,142 @@ describe("SyncFilesService", () => {
       );
     });
 
+    it("passes excludes through a single --exclude-from file", async () => {
+      const { sourceExecutor, tracker } = makeRsyncArgs({ code: 0 });
+
+      await (service as any).pushFilesViaRsync(
+        makeJob(JOB_TYPES.SYNC_CLONE, { jobExecutionId: 1 }),
+        "/src/path",
+        "/tgt/path",
+        {
+          server: {
+            ip_address: "1.2.3.4",
+            ssh_port: 22,
+            ssh_user: "user",
+            ssh_private_key_encrypted: null,
+          },
+        },
+        sourceExecutor as any,
+        tracker as any,
+        ["wp-content/uploads/private"],
+      );
+
+      const excludesUpload = sourceExecutor.pushFile.mock.calls
+        .map(([arg]: any[]) => arg)
+        .find((arg: any) => arg.remotePath.includes("forge_push_excludes_"));
+      expect(excludesUpload.content.toString()).toBe(
+        "/.env\n/wp-config.php\n/.htaccess\n/storage/\n/node_modules/\n/wp-content/uploads/private\n",
+      );
+
+      const rsyncCmd = sourceExecutor.execute.mock.calls
+        .map(([cmd]: any[]) => cmd)
+        .find((cmd: string) => cmd.startsWith("rsync "));
+      expect(rsyncCmd).toContain("--exclude-from=");
+      expect(rsyncCmd).not.toContain("--exclude=");
+    });
+
+    it("uploads the key and excludes files concurrently", async () => {
+      const { sourceExecutor, tracker } = makeRsyncArgs({ code: 0 });
+      const pending: Array<() => void> = [];
+      sourceExecutor.pushFile.mockImplementation(
+        () => new Promise<void>((resolve) => pending.push(resolve)),
+      );
+
+      const run = (service as any).pushFilesViaRsync(
+        makeJob(JOB_TYPES.SYNC_CLONE, { jobExecutionId: 1 }),
+        "/src/path",
+        "/tgt/path",
+        {
+          server: {
+            ip_address: "1.2.3.4",
+            ssh_port: 22,
+            ssh_user: "user",
+            ssh_private_key_encrypted: null,
+          },
+        },
+        sourceExecutor as any,
+        tracker as any,
+        [],
+      );
+
+      await new Promise((r) => setImmediate(r));
+      expect(sourceExecutor.pushFile).toHaveBeenCalledTimes(2);
+
+      pending.forEach((resolve) => resolve());
+      await expect(run).resolves.toBeUndefined();
+    });
+
+    it("removes the key and excludes files when the rsync exec rejects", async () => {
+      const { sourceExecutor, tracker } = makeRsyncArgs({ code: 0 });
+      sourceExecutor.execute.mockImplementation((cmd: string) =>
+        cmd.startsWith("rsync ")
+          ? Promise.reject(new Error("Command timed out"))
+          : Promise.resolve({ code: 0, stdout: "", stderr: "" }),
+      );
+
+      await expect(
+        (service as any).pushFilesViaRsync(
+          makeJob(JOB_TYPES.SYNC_CLONE, { jobExecutionId: 1 }),
+          "/src/path",
+          "/tgt/path",
+          {
+            server: {
+              ip_address: "1.2.3.4",
+              ssh_port: 22,
+              ssh_user: "user",
+              ssh_private_key_encrypted: null,
+            },
+          },
+          sourceExecutor as any,
+          tracker as any,
+          [],
+        ),
+      ).rejects.toThrow("Command timed out");
+
+      const keyPath = sourceExecutor.pushFile.mock.calls[0][0].remotePath;
+      expect(sourceExecutor.execute).toHaveBeenLastCalledWith(
+        expect.stringMatching(/^rm -f .*forge_push_key_/),
+      );
+      expect(keyPath).toContain("forge_push_key_");
+    });
+
+    it("waits for the key upload before cleaning up after a failed upload", async () => {
+      const { sourceExecutor, tracker } = makeRsyncArgs({ code: 0 });
+      let finishKeyUpload!: () => void;
+      sourceExecutor.pushFile.mockImplementation((file: any) =>
+        file.mode === 0o600
+          ? new Promise<void>((resolve) => (finishKeyUpload = resolve))
+          : Promise.reject(new Error("SFTP write failed")),
+      );
+
+      const run = (service as any).pushFilesViaRsync(
+        makeJob(JOB_TYPES.SYNC_CLONE, { jobExecutionId: 1 }),
+        "/src/path",
+        "/tgt/path",
+        {
+          server: {
+            ip_address: "1.2.3.4",
+            ssh_port: 22,
+            ssh_user: "user",
+            ssh_private_key_encrypted: null,
+          },
+        },
+        sourceExecutor as any,
+        tracker as any,
+        [],
+      );
+
+      await new Promise((r) => setImmediate(r));
+      expect(sourceExecutor.execute).not.toHaveBeenCalled();
+
+      finishKeyUpload();
+      await expect(run).rejects.toThrow("SFTP write failed");
+      expect(sourceExecutor.execute).toHaveBeenCalledTimes(1);
+      expect(sourceExecutor.execute).toHaveBeenCalledWith(
+        expect.stringMatching(/^rm -f /),
+      );
+    });
+
     it("resolves with warning when rsync exits with code 23 due only to permission errors on root files", async () => {
       const { sourceExecutor, tracker } = makeRsyncArgs({
         code: 23,
@@ -1,7 +1,7 @@
 import { Injectable, Logger } from "@nestjs/common";
 import { Job } from "bullmq";
-import { stat, mkdtemp, rm } from "fs/promises";
-import { createReadStream } from "fs";
+import { randomBytes } from "crypto";
+import { mkdtemp, rm } from "fs/promises";
 import { join } from "path";
 import { tmpdir } from "os";
 import { SshKeyService } from "../../../services/ssh-key.service";
@@ -12,10 +12,12 @@ import {
   flipProtocol,
   fixCyberPanelOwnership,
 } from "../../../utils/processor-utils";
-import { WpLayout } from "./layout-detector.service";
 
 type Executor = Awaited<ReturnType<typeof createRemoteExecutor>>;
 
+/** rsync stderr lines reporting attributes it could not set (exit 23). */
+const RSYNC_PERMISSION_LINE = /Operation not permitted|failed to set permissions/;
+
 @Injectable()
 export class SyncFilesService {
   private readonly logger = new Logger(SyncFilesService.name);
@@ -60,11 +62,14 @@ export class SyncFilesService {
       detail: sourceSite,
     });
 
-    // Verify root_path exists on source
-    const checkResult = await sourceExecutor.execute(
-      `test -d ${shellQuote(sourceSite)} && echo ok || echo missing`,
+    // One probe on the source answers both "does the site exist?" and "is
+    // rsync installed?" — the target is only asked about rsync when the source
+    // has it, since the tar relay is used otherwise regardless.
+    const sourceProbe = await sourceExecutor.execute(
+      `if test -d ${shellQuote(sourceSite)}; then command -v rsync > /dev/null 2>&1 && echo rsync || echo no-rsync; else echo missing; fi`,
     );
-    if (checkResult.code !== 0 || checkResult.stdout.trim() === "missing") {
+    const sourceState = sourceProbe.stdout.trim();
+    if (sourceProbe.code !== 0 || sourceState === "missing") {
       await tracker.track({
         step: "Source site directory not found — skipping file sync",
         level: "warn",
@@ -73,18 +78,13 @@ export class SyncFilesService {
       return;
     }
 
-    // Check if rsync is available on both source and target
-    const [rsyncSrcCheck, rsyncTgtCheck] = await Promise.all([
-      sourceExecutor.execute(
-        "command -v rsync > /dev/null 2>&1 && echo ok || echo missing",
-      ),
-      targetExecutor.execute(
+    let hasRsync = false;
+    if (sourceState === "rsync") {
+      const rsyncTgtCheck = await targetExecutor.execute(
         "command -v rsync > /dev/null 2>&1 && echo ok || echo missing",
-      ),
-    ]);
-    const hasRsync =
-      rsyncSrcCheck.stdout.trim() === "ok" &&
-      rsyncTgtCheck.stdout.trim() === "ok";
+      );
+      hasRsync = rsyncTgtCheck.stdout.trim() === "ok";
+    }
 
     if (hasRsync) {
       await this.pushFilesViaRsync(
@@ -134,21 +134,18 @@ export class SyncFilesService {
     tracker: StepTracker,
     protectedFileExcludes: string[] = [],
   ): Promise<void> {
-    // Upload worker's private key to source as a temp file
-    const keyPath = `/tmp/forge_push_key_${job.id}`;
+    // Upload worker's private key to source as a temp file. The name is
+    // random rather than job-derived so it can't be guessed on a shared /tmp.
+    const tmpId = randomBytes(12).toString("base64url");
+    const keyPath = `/tmp/forge_push_key_${tmpId}`;
     const rawKey = await this.sshKey.resolvePrivateKey(targetEnv.server);
-    await sourceExecutor.pushFile({
-      remotePath: keyPath,
-      content: Buffer.from(rawKey),
-    });
-    await sourceExecutor.execute(`chmod 600 ${shellQuote(keyPath)}`);
 
     // Prepend '/' to anchor each pattern to the transfer root, so rsync won't
     // strip nested directories with the same name inside plugins or themes.
+    // Patterns go into a single --exclude-from file rather than one argv flag
+    // each, so long protected-file lists don't bloat the remote command line.
     const allExcludes = this.buildFileSyncExcludes(protectedFileExcludes);
-    const excludeFlags = allExcludes
-      .map((e) => `--exclude=${shellQuote("/" + e)}`)
-      .join(" ");
+    const excludesPath = `/tmp/forge_push_excludes_${tmpId}`;
 
     const rsyncCmd = [
       "rsync",
@@ -159,26 +156,56 @@ export class SyncFilesService {
       "--no-perms",
       "--ignore-errors",
       "--timeout=300",
-      excludeFlags,
+      `--exclude-from=${shellQuote(excludesPath)}`,
       "-e",
       shellQuote(`ssh -i ${keyPath} -p ${targetEnv.server.ssh_port} -o StrictHostKeyChecking=no -o ConnectTimeout=30`),
       `${shellQuote(sourceRoot)}/`,
       `${shellQuote(targetEnv.server.ssh_user)}@${targetEnv.server.ip_address}:${shellQuote(targetRoot)}/`,
     ].join(" ");
 
-    const loggedExcludes = allExcludes.join(", ");
-    await tracker.track({
-      step: "Syncing site files via rsync",
-      level: "info",
-      detail: `${sourceRoot} → ${targetEnv.server.ip_address}:${targetRoot} (excluding: ${loggedExcludes})`,
-      command: "rsync -az --delete --no-perms [excludes] (key redacted)",
-    });
+    let rsyncResult: Awaited<ReturnType<Executor["execute"]>>;
+    let rsyncStart: number;
+    try {
+      // The two uploads are independent, so run them side by side on pooled
+      // connections instead of paying one SFTP round trip after the other.
+      // The key is created 0600 by the SFTP open, so no chmod exec follows.
+      // Wait for both to settle before rethrowing: with Promise.all the
+      // cleanup below could run while the key upload is still in flight,
+      // and the key would land after its rm.
+      const uploads = await Promise.allSettled([
+        sourceExecutor.pushFile({
+          remotePath: keyPath,
+          content: Buffer.from(rawKey),
+          mode: 0o600,
+        }),
+        sourceExecutor.pushFile({
+          remotePath: excludesPath,
+          content: Buffer.from(
+            allExcludes.map((e) => "/" + e).join("\n") + "\n",
+          ),
+        }),
+      ]);
+      for (const upload of uploads) {
+        if (upload.status === "rejected") throw upload.reason;
+      }
 
-    const rsyncStart = Date.now();
-    const rsyncResult = await sourceExecutor.execute(rsyncCmd);
+      const loggedExcludes = allExcludes.join(", ");
+      await tracker.track({
+        step: "Syncing site files via rsync",
+        level: "info",
+        detail: `${sourceRoot} → ${targetEnv.server.ip_address}:${targetRoot} (excluding: ${loggedExcludes})`,
+        command: "rsync -az --delete --no-perms [excludes] (key redacted)",
+      });
 
-    // Cleanup key regardless of outcome
-    await sourceExecutor.execute(`rm -f ${shellQuote(keyPath)}`).catch(() => {});
+      rsyncStart = Date.now();
+      rsyncResult = await sourceExecutor.execute(rsyncCmd);
+    } finally {
+      // Cleanup key and exclude list regardless of outcome: a failed upload,
+      // rejected exec or timeout must not leave the private key behind.
+      await sourceExecutor
+        .execute(`rm -f ${shellQuote(keyPath)} ${shellQuote(excludesPath)}`)
+        .catch(() => {});
+    }
 
     await tracker.trackCommand(
       "rsync site files",
@@ -205,11 +232,7 @@ export class SyncFilesService {
     if (isPermissionOnlyPartial) {
       const permLines = rsyncOutput
         .split("\n")
-        .filter(
-          (l) =>
-            l.includes("Operation not permitted") ||
-            l.includes("failed to set permissions"),
-        )
+        .filter((l) => RSYNC_PERMISSION_LINE.test(l))
         .join(" | ")
         .slice(0, 400);
       await tracker.track({
@@ -239,11 +262,7 @@ export class SyncFilesService {
 
     return (
       meaningfulLines.length > 0 &&
-      meaningfulLines.every(
-        (line) =>
-          line.includes("Operation not permitted") ||
-          line.includes("failed to set permissions"),
-      )
+      meaningfulLines.every((line) => RSYNC_PERMISSION_LINE.test(line))
     );
   }
 
@@ -304,21 +323,28 @@ export class SyncFilesService {
     const localTarDir = await mkdtemp(join(tmpdir(), "forge-tar-"));
     const localTarPath = join(localTarDir, `content_${job.id}.tar.gz`);
     try {
-      await sourceExecutor.pullFileToPath(remoteTar, localTarPath);
+      let tarBytes = 0;
+      await sourceExecutor.pullFileToPath(
+        remoteTar,
+        localTarPath,
+        undefined,
+        (bytes) => {
+          tarBytes = bytes;
+        },
+      );
       await sourceExecutor.execute(`rm -f ${shellQuote(remoteTar)}`).catch(() => {});
-      const tarStat = await stat(localTarPath);
       await tracker.track({
-        step: `Archive pulled (${(tarStat.size / 1024 / 1024).toFixed(1)} MB) — pushing to target`,
+        step: `Archive pulled (${(tarBytes / 1024 / 1024).toFixed(1)} MB) — pushing to target`,
         level: "info",
       });
-      const tarStream = createReadStream(localTarPath);
-      await targetExecutor.pushFileFromStream(remoteTar, tarStream);
+      await targetExecutor.pushFileFromPath(localTarPath, remoteTar);
     } finally {
       await rm(localTarDir, { recursive: true, force: true });
     }
 
-    await targetExecutor.execute(`mkdir -p ${shellQuote(targetContent)}`);
-    const extractCmd = `tar -xzf ${shellQuote(remoteTar)} -C ${shellQuote(targetContent)}`;
+    // Create the destination in the same exec as the extract rather than
+    // spending a separate round trip on mkdir.
+    const extractCmd = `mkdir -p ${shellQuote(targetContent)} && tar -xzf ${shellQuote(remoteTar)} -C ${shellQuote(targetContent)}`;
     await tracker.track({
       step: "Extracting site files on target",
       level: "info",
@@ -399,32 +425,34 @@ export class SyncFilesService {
     }
 
     const fileStart = Date.now();
-    let anyError = false;
 
-    for (const [oldUrl, newUrl] of allFilePairs) {
-      const sedEscape = (s: string) =>
-        s.replace(/\\/g, "\\\\").replace(/\|/g, "\\|");
-      const oldSed = sedEscape(oldUrl);
-      const newSed = sedEscape(newUrl);
-
-      const sedExpr = `s|${oldSed}|${newSed}|g`;
-      const sedCmd = [
-        `find ${shellQuote(wpContentPath)} -type f`,
-        `\\( -name '*.css' -o -name '*.js' -o -name '*.json' -o -name '*.html'`,
-        `-o -name '*.htm' -o -name '*.svg' -o -name '*.xml' -o -name '*.txt'`,
-        `-o -name '*.php' \\)`,
-        `-exec sed -i ${shellQuote(sedExpr)} {} +`,
-      ].join(" ");
+    // Every pair goes into a single sed invocation (-e expressions run in
+    // order), so wp-content is walked and each file rewritten once rather
+    // than once per pair — the JSON/URL-encoded variants alone triple that.
+    const sedEscape = (s: string) =>
+      s.replace(/\\/g, "\\\\").replace(/\|/g, "\\|");
+    const sedArgs = allFilePairs
+      .map(
+        ([oldUrl, newUrl]) =>
+          `-e ${shellQuote(`s|${sedEscape(oldUrl)}|${sedEscape(newUrl)}|g`)}`,
+      )
+      .join(" ");
+    const sedCmd = [
+      `find ${shellQuote(wpContentPath)} -type f`,
+      `\\( -name '*.css' -o -name '*.js' -o -name '*.json' -o -name '*.html'`,
+      `-o -name '*.htm' -o -name '*.svg' -o -name '*.xml' -o -name '*.txt'`,
+      `-o -name '*.php' \\)`,
+      `-exec sed -i ${sedArgs} {} +`,
+    ].join(" ");
 
-      const sedResult = await executor.execute(sedCmd);
-      if (sedResult.code !== 0) {
-        await tracker.track({
-          step: `File URL replace failed for ${oldUrl}`,
-          level: "warn",
-          detail: sedResult.stderr.trim() || `exit ${sedResult.code}`,
-        });
-        anyError = true;
-      }
+    const sedResult = await executor.execute(sedCmd);
+    const anyError = sedResult.code !== 0;
+    if (anyError) {
+      await tracker.track({
+        step: "File URL replace failed",
+        level: "warn",
+        detail: sedResult.stderr.trim() || `exit ${sedResult.code}`,
+      });
     }
 
     await tracker.track({
@@ -440,7 +468,7 @@ export class SyncFilesService {
       throw new Error(
         `File URL replacement failed for one or more URL patterns in ${wpContentPath}. ` +
           `The target may contain stale source-domain URLs in static assets (CSS, JS). ` +
-          `Check the execution log above for per-pattern error details.`,
+          `Check the execution log above for error details.`,
       );
     }
 
@@ -1,8 +1,7 @@
 import { Processor, WorkerHost, InjectQueue } from "@nestjs/bullmq";
 import { Logger } from "@nestjs/common";
 import { Job, Queue } from "bullmq";
-import { mkdir, rm, mkdtemp } from "fs/promises";
-import { createReadStream } from "fs";
+import { rm, mkdtemp } from "fs/promises";
 import { join } from "path";
 import { tmpdir } from "os";
 import { PrismaService } from "../../prisma/prisma.service";
@@ -135,50 +134,49 @@ export class SyncProcessor extends WorkerHost {
       ),
     ]);
 
-    // Resolve credentials
+    // Resolve credentials — source and target live on independent servers,
+    // so both sides are read at the same time.
     await tracker.track({
-      step: "Reading source database credentials",
+      step: "Reading source and target database credentials",
       level: "info",
-      detail: sourceEnv.root_path,
+      detail: `${sourceEnv.root_path} → ${targetEnv.root_path}`,
     });
-    const sourceCreds = await this.syncDb.resolveCredentials(
-      sourceExecutor,
-      sourceEnv.root_path,
-      tracker,
-      "source",
-      sourceEnv.id,
-    );
-
-    await tracker.track({
-      step: "Reading target database credentials",
-      level: "info",
-      detail: targetEnv.root_path,
-    });
-    const targetCreds = await this.syncDb.resolveCredentials(
-      targetExecutor,
-      targetEnv.root_path,
-      tracker,
-      "target",
-      targetEnv.id,
-    );
+    const [sourceCreds, targetCreds] = await Promise.all([
+      this.syncDb.resolveCredentials(
+        sourceExecutor,
+        sourceEnv.root_path,
+        tracker,
+        "source",
+        sourceEnv.id,
+      ),
+      this.syncDb.resolveCredentials(
+        targetExecutor,
+        targetEnv.root_path,
+        tracker,
+        "target",
+        targetEnv.id,
+      ),
+    ]);
 
     await job.updateProgress({ value: 15, step: "Credentials resolved" });
 
     // Auto-detect URLs for search-replace — no manual input required
-    const sourceUrl = await this.syncDb.resolveWpUrl(
-      sourceExecutor,
-      sourceCreds,
-      tracker,
-      "source",
-      sourceEnv.url,
-    );
-    const targetUrl = await this.syncDb.resolveWpUrl(
-      targetExecutor,
-      targetCreds,
-      tracker,
-      "target",
-      targetEnv.url,
-    );
+    const [sourceUrl, targetUrl] = await Promise.all([
+      this.syncDb.resolveWpUrl(
+        sourceExecutor,
+        sourceCreds,
+        tracker,
+        "source",
+        sourceEnv.url,
+      ),
+      this.syncDb.resolveWpUrl(
+        targetExecutor,
+        targetCreds,
+        tracker,
+        "target",
+        targetEnv.url,
+      ),
+    ]);
 
     await job.updateProgress({ value: 20, step: "URLs resolved" });
 
@@ -273,6 +271,16 @@ export class SyncProcessor extends WorkerHost {
     });
     const localDumpDir = await mkdtemp(join(tmpdir(), "forge-sync-"));
     const localDumpPath = join(localDumpDir, `sync_${job.id}.sql`);
+    // Stage the target's MySQL client config while the dump is in transit —
+    // it only needs the target credentials, so its round trips hide under
+    // the transfer instead of following it.
+    const tgtMycnfPending = createRemoteMyCnf(
+      targetExecutor,
+      targetCreds,
+      job.id ?? "default",
+      "sync_imp",
+    );
+    tgtMycnfPending.catch(() => undefined);
     try {
       await sourceExecutor.pullFileToPath(dumpRemote, localDumpPath);
       const cleanSrcResult = await sourceExecutor.execute(
@@ -285,20 +293,21 @@ export class SyncProcessor extends WorkerHost {
         0,
       );
 
-      const readStream = createReadStream(localDumpPath);
-      await targetExecutor.pushFileFromStream(dumpRemote, readStream);
+      await targetExecutor.pushFileFromPath(localDumpPath, dumpRemote);
+    } catch (err) {
+      // Don't leave the staged credentials behind on a failed transfer
+      await tgtMycnfPending.then(
+        (path) => cleanupRemoteMyCnf(targetExecutor, path),
+        () => undefined,
+      );
+      throw err;
     } finally {
       await rm(localDumpDir, { recursive: true, force: true });
     }
     await job.updateProgress({ value: 65, step: "Dump transferred to target" });
 
     // Import on target
-    const tgtMycnf = await createRemoteMyCnf(
-      targetExecutor,
-      targetCreds,
-      job.id ?? "default",
-      "sync_imp",
-    );
+    const tgtMycnf = await tgtMycnfPending;
     try {
       if (
         targetEnv.protected_post_types &&
@@ -321,11 +330,16 @@ export class SyncProcessor extends WorkerHost {
           detail: `Will preserve: ${cloneSafeProtected.join(", ")}`,
         });
         const dbExistsRes = await targetExecutor.execute(
-          `mysql --defaults-extra-file=${shellQuote(tgtMycnf)} -e ${shellQuote(`SHOW DATABASES LIKE '${targetCreds.dbName}';`)}`,
+          `mysql --defaults-extra-file=${shellQuote(tgtMycnf)} -sN -e ${shellQuote(`SHOW DATABASES LIKE '${targetCreds.dbName}';`)}`,
           { timeout: 30_000 },
         );
+        // -sN prints bare names, one per line. Compare them exactly: `_` in
+        // the LIKE pattern is a wildcard and can match a different database.
         const dbExists =
-          dbExistsRes.code === 0 && dbExistsRes.stdout.trim().length > 0;
+          dbExistsRes.code === 0 &&
+          dbExistsRes.stdout
+            .split("\n")
+            .some((name) => name.trim() === targetCreds.dbName);
 
         if (dbExists) {
           await this.syncDb.trackProtectedTablePresence(
@@ -700,34 +714,42 @@ export class SyncProcessor extends WorkerHost {
       let filesSrcUrl: string | null = null;
       let filesTgtUrl: string | null = null;
       try {
-        const srcCreds = await this.syncDb.resolveCredentials(
-          sourceExecutor,
-          sourceEnv.root_path,
-          tracker,
-          "source (file-replace)",
-          sourceEnv.id,
-        );
-        const tgtCreds = await this.syncDb.resolveCredentials(
-          targetExecutor,
-          targetEnv.root_path,
-          tracker,
-          "target (file-replace)",
-          targetEnv.id,
-        );
-        filesSrcUrl = await this.syncDb.resolveWpUrl(
-          sourceExecutor,
-          srcCreds,
-          tracker,
-          "source (file-replace)",
-          sourceEnv.url,
-        );
-        filesTgtUrl = await this.syncDb.resolveWpUrl(
-          targetExecutor,
-          tgtCreds,
-          tracker,
-          "target (file-replace)",
-          targetEnv.url,
-        );
+        [filesSrcUrl, filesTgtUrl] = await Promise.all([
+          this.syncDb
+            .resolveCredentials(
+              sourceExecutor,
+              sourceEnv.root_path,
+              tracker,
+              "source (file-replace)",
+              sourceEnv.id,
+            )
+            .then((srcCreds) =>
+              this.syncDb.resolveWpUrl(
+                sourceExecutor,
+                srcCreds,
+                tracker,
+                "source (file-replace)",
+                sourceEnv.url,
+              ),
+            ),
+          this.syncDb
+            .resolveCredentials(
+              targetExecutor,
+              targetEnv.root_path,
+              tracker,
+              "target (file-replace)",
+              targetEnv.id,
+            )
+            .then((tgtCreds) =>
+              this.syncDb.resolveWpUrl(
+                targetExecutor,
+                tgtCreds,
+                tracker,
+                "target (file-replace)",
+                targetEnv.url,
+              ),
+            ),
+        ]);
         if (filesSrcUrl && filesTgtUrl) {
           filesUrlsChanged = filesSrcUrl !== filesTgtUrl;
         }
@@ -804,43 +826,42 @@ export class SyncProcessor extends WorkerHost {
     tracker: StepTracker,
   ): Promise<string[]> {
     await tracker.track({
-      step: "Resolving source database credentials",
+      step: "Resolving source and target database credentials",
       level: "info",
     });
-    const sourceCreds = await this.syncDb.resolveCredentials(
-      sourceExecutor,
-      sourceEnv.root_path,
-      tracker,
-      "source",
-      sourceEnv.id,
-    );
-
-    await tracker.track({
-      step: "Resolving target database credentials",
-      level: "info",
-    });
-    const targetCreds = await this.syncDb.resolveCredentials(
-      targetExecutor,
-      targetEnv.root_path,
-      tracker,
-      "target",
-      targetEnv.id,
-    );
+    const [sourceCreds, targetCreds] = await Promise.all([
+      this.syncDb.resolveCredentials(
+        sourceExecutor,
+        sourceEnv.root_path,
+        tracker,
+        "source",
+        sourceEnv.id,
+      ),
+      this.syncDb.resolveCredentials(
+        targetExecutor,
+        targetEnv.root_path,
+        tracker,
+        "target",
+        targetEnv.id,
+      ),
+    ]);
 
-    const sourceUrl = await this.syncDb.resolveWpUrl(
-      sourceExecutor,
-      sourceCreds,
-      tracker,
-      "source",
-      sourceEnv.url,
-    );
-    const targetUrl = await this.syncDb.resolveWpUrl(
-      targetExecutor,
-      targetCreds,
-      tracker,
-      "target",
-      targetEnv.url,
-    );
+    const [sourceUrl, targetUrl] = await Promise.all([
+      this.syncDb.resolveWpUrl(
+        sourceExecutor,
+        sourceCreds,
+        tracker,
+        "source",
+        sourceEnv.url,
+      ),
+      this.syncDb.resolveWpUrl(
+        targetExecutor,
+        targetCreds,
+        tracker,
+        "target",
+        targetEnv.url,
+      ),
+    ]);
 
     // Dump source
     const dumpRemote = `/tmp/forge_push_${job.id}.sql`;
@@ -905,23 +926,31 @@ export class SyncProcessor extends WorkerHost {
     });
     const localPushDir = await mkdtemp(join(tmpdir(), "forge-push-"));
     const localPushPath = join(localPushDir, `push_${job.id}.sql`);
+    // Stage the target's MySQL client config while the dump is in transit
+    const tgtMycnfPending = createRemoteMyCnf(
+      targetExecutor,
+      targetCreds,
+      job.id ?? "default",
+      "push_imp",
+    );
+    tgtMycnfPending.catch(() => undefined);
     try {
       await sourceExecutor.pullFileToPath(dumpRemote, localPushPath);
       await sourceExecutor.execute(`rm -f ${shellQuote(dumpRemote)}`).catch(() => {});
 
-      const readStream = createReadStream(localPushPath);
-      await targetExecutor.pushFileFromStream(dumpRemote, readStream);
+      await targetExecutor.pushFileFromPath(localPushPath, dumpRemote);
+    } catch (err) {
+      await tgtMycnfPending.then(
+        (path) => cleanupRemoteMyCnf(targetExecutor, path),
+        () => undefined,
+      );
+      throw err;
     } finally {
       await rm(localPushDir, { recursive: true, force: true });
     }
 
     // Import on target
-    const tgtMycnf = await createRemoteMyCnf(
-      targetExecutor,
-      targetCreds,
-      job.id ?? "default",
-      "push_imp",
-    );
+    const tgtMycnf = await tgtMycnfPending;
     try {
       if (
         targetEnv.protected_post_types &&
@@ -944,11 +973,16 @@ export class SyncProcessor extends WorkerHost {
           detail: `Will preserve: ${pushSafeProtected.join(", ")}`,
         });
         const dbExistsRes = await targetExecutor.execute(
-          `mysql --defaults-extra-file=${shellQuote(tgtMycnf)} -e ${shellQuote(`SHOW DATABASES LIKE '${targetCreds.dbName}';`)}`,
+          `mysql --defaults-extra-file=${shellQuote(tgtMycnf)} -sN -e ${shellQuote(`SHOW DATABASES LIKE '${targetCreds.dbName}';`)}`,
           { timeout: 30_000 },
         );
+        // -sN prints bare names, one per line. Compare them exactly: `_` in
+        // the LIKE pattern is a wildcard and can match a different database.
         const dbExists =
-          dbExistsRes.code === 0 && dbExistsRes.stdout.trim().length > 0;
+          dbExistsRes.code === 0 &&
+          dbExistsRes.stdout
+            .split("\n")
+            .some((name) => name.trim() === targetCreds.dbName);
 
         if (dbExists) {
           await this.syncDb.trackProtectedTablePresence(
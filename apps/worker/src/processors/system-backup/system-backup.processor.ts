@@ -317,14 +317,16 @@ export class SystemBackupProcessor extends WorkerHost {
     retentionDays: number | null,
   ) {
     if (retentionCount) {
-      // Keep the N most recent completed backups; delete the rest
-      const completed = await this.prisma.systemBackup.findMany({
+      // Keep the N most recent completed backups; delete the rest. Skipping
+      // the kept rows in the query means nothing is read while within policy.
+      const stale = await this.prisma.systemBackup.findMany({
         where: { status: "completed" },
         orderBy: { created_at: "desc" },
+        skip: retentionCount,
         select: { id: true },
       });
-      if (completed.length > retentionCount) {
-        const toDelete = completed.slice(retentionCount).map((b) => b.id);
+      if (stale.length > 0) {
+        const toDelete = stale.map((b) => b.id);
         await this.prisma.systemBackup.deleteMany({
           where: { id: { in: toDelete } },
         });
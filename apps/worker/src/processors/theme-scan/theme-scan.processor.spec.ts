@@ -3,7 +3,7 @@
 import { ThemeScanProcessor, parseThemeListJson } from "./theme-scan.processor";
 import { PrismaService } from "../../prisma/prisma.service";
 import { SshKeyService } from "../../services/ssh-key.service";
-import { ConfigService } from "@nestjs/config";
+import type { Queue } from "bullmq";
 import { JOB_TYPES } from "@bedrock-forge/shared";
 import { createRemoteExecutor } from "@bedrock-forge/remote-executor";
 
@@ -124,7 +124,6 @@ describe("ThemeScanProcessor", () => {
     (createRemoteExecutor as jest.Mock).mockReturnValue(executor);
     processor = new ThemeScanProcessor(
       prisma as unknown as PrismaService,
-      {} as ConfigService,
       {
         resolvePrivateKey: jest.fn().mockResolvedValue("private-key"),
         getSshConfig: jest.fn().mockResolvedValue({
@@ -134,6 +133,7 @@ describe("ThemeScanProcessor", () => {
           privateKey: "private-key",
         }),
       } as unknown as SshKeyService,
+      { add: jest.fn() } as unknown as Queue,
     );
   });
 
@@ -200,7 +200,6 @@ describe("ThemeScanProcessor", () => {
     (createRemoteExecutor as jest.Mock).mockReturnValue(executor);
     processor = new ThemeScanProcessor(
       prisma as unknown as PrismaService,
-      {} as ConfigService,
       {
         resolvePrivateKey: jest.fn().mockResolvedValue("private-key"),
         getSshConfig: jest.fn().mockResolvedValue({
@@ -210,6 +209,7 @@ describe("ThemeScanProcessor", () => {
           privateKey: "private-key",
         }),
       } as unknown as SshKeyService,
+      { add: jest.fn() } as unknown as Queue,
     );
 
     await processor.process(makeJob());
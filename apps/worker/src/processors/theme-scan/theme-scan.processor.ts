@@ -1,6 +1,6 @@
-import { Processor, WorkerHost } from "@nestjs/bullmq";
+import { InjectQueue, Processor, WorkerHost } from "@nestjs/bullmq";
 import { Logger } from "@nestjs/common";
-import { Job } from "bullmq";
+import { Job, Queue } from "bullmq";
 import { PrismaService } from "../../prisma/prisma.service";
 import { SshKeyService } from "../../services/ssh-key.service";
 import { StepTracker } from "../../services/step-tracker";
@@ -12,7 +12,6 @@ import {
   ThemeManagePayload,
   ThemeScanRunPayload,
 } from "@bedrock-forge/shared";
-import { ConfigService } from "@nestjs/config";
 import { buildWpCliPrefix } from "../../utils/processor-utils";
 
 /** Wrap a string in single quotes for safe shell embedding on the remote host. */
@@ -90,8 +89,9 @@ export class ThemeScanProcessor extends WorkerHost {
 
   constructor(
     private readonly prisma: PrismaService,
-    private readonly config: ConfigService,
     private readonly sshKey: SshKeyService,
+    @InjectQueue(QUEUES.THEME_SCANS)
+    private readonly themeScansQueue: Queue,
   ) {
     super();
   }
@@ -432,17 +432,11 @@ export class ThemeScanProcessor extends WorkerHost {
         },
       });
 
-      const { Queue } = await import("bullmq");
-      const redisUrl = this.config.get<string>("redis.url")!;
-      const scanQueue = new Queue(QUEUES.THEME_SCANS, {
-        connection: { url: redisUrl },
-      });
-      await scanQueue.add(
+      await this.themeScansQueue.add(
         JOB_TYPES.THEME_SCAN_RUN,
         { environmentId, jobExecutionId: Number(scanExec.id) },
         { jobId: scanBullJobId },
       );
-      await scanQueue.close();
 
       await job.updateProgress(100);
 
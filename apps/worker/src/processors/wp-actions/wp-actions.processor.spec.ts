@@ -1,9 +1,10 @@
 import { Test } from "@nestjs/testing";
+import { getQueueToken } from "@nestjs/bullmq";
 import { ConfigService } from "@nestjs/config";
 import { WpActionsProcessor, parseWpVersion, parseWpUpdatesJson } from "./wp-actions.processor";
 import { PrismaService } from "../../prisma/prisma.service";
 import { SshKeyService } from "../../services/ssh-key.service";
-import { JOB_TYPES } from "@bedrock-forge/shared";
+import { JOB_TYPES, QUEUES } from "@bedrock-forge/shared";
 import { createRemoteExecutor } from "@bedrock-forge/remote-executor";
 
 jest.mock("@bedrock-forge/remote-executor", () => ({
@@ -139,6 +140,7 @@ describe("WpActionsProcessor - processCoreCheck & processCoreUpdate", () => {
         WpActionsProcessor,
         { provide: PrismaService, useValue: prisma },
         { provide: ConfigService, useValue: { get: jest.fn().mockReturnValue("/tmp/scripts") } },
+        { provide: getQueueToken(QUEUES.WP_ACTIONS), useValue: { add: jest.fn() } },
         {
           provide: SshKeyService,
           useValue: {
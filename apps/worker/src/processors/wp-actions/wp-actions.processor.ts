@@ -1,6 +1,6 @@
-import { Processor, WorkerHost } from "@nestjs/bullmq";
+import { InjectQueue, Processor, WorkerHost } from "@nestjs/bullmq";
 import { Logger } from "@nestjs/common";
-import { Job } from "bullmq";
+import { Job, Queue } from "bullmq";
 import { join } from "path";
 import { PrismaService } from "../../prisma/prisma.service";
 import { SshKeyService } from "../../services/ssh-key.service";
@@ -99,13 +99,17 @@ export interface WpMaintenanceModePayload {
 @Processor(QUEUES.WP_ACTIONS, { concurrency: 2 })
 export class WpActionsProcessor extends WorkerHost {
   private readonly logger = new Logger(WpActionsProcessor.name);
+  private readonly scriptsPath: string;
 
   constructor(
     private readonly prisma: PrismaService,
     private readonly config: ConfigService,
     private readonly sshKey: SshKeyService,
+    @InjectQueue(QUEUES.WP_ACTIONS)
+    private readonly wpActionsQueue: Queue,
   ) {
     super();
+    this.scriptsPath = this.config.get<string>("scriptsPath")!;
   }
 
   async process(job: Job): Promise<unknown> {
@@ -150,11 +154,10 @@ export class WpActionsProcessor extends WorkerHost {
       });
       const { executor, env } = await this.connectToEnv(environmentId, tracker);
       await job.updateProgress(20);
-      const scriptsPath = this.config.get<string>("scriptsPath")!;
       const remoteScript = `/tmp/wp_actions_${job.id}.php`;
       await pushRemoteScript(
         executor,
-        join(scriptsPath, "wp-actions.php"),
+        join(this.scriptsPath, "wp-actions.php"),
         remoteScript,
       );
       await job.updateProgress(40);
@@ -215,11 +218,10 @@ export class WpActionsProcessor extends WorkerHost {
       });
       const { executor, env } = await this.connectToEnv(environmentId, tracker);
       await job.updateProgress(20);
-      const scriptsPath = this.config.get<string>("scriptsPath")!;
       const remoteScript = `/tmp/wp_debug_${job.id}.php`;
       await pushRemoteScript(
         executor,
-        join(scriptsPath, "wp-debug.php"),
+        join(this.scriptsPath, "wp-debug.php"),
         remoteScript,
       );
       const actionArg = enabled ? "enable" : "disable";
@@ -235,11 +237,6 @@ export class WpActionsProcessor extends WorkerHost {
       const parsed = safeJsonParse(result.stdout);
       await tracker.trackCommand("wp-debug.php", cmd, result, 0);
       if (enabled && revertAfterMinutes && revertAfterMinutes > 0) {
-        const { Queue } = await import("bullmq");
-        const redisUrl = this.config.get<string>("redis.url")!;
-        const wpActionsQueue = new Queue(QUEUES.WP_ACTIONS, {
-          connection: { url: redisUrl },
-        });
         const revertExec = await this.prisma.jobExecution.create({
           data: {
             queue_name: QUEUES.WP_ACTIONS,
@@ -253,7 +250,7 @@ export class WpActionsProcessor extends WorkerHost {
             } as object,
           },
         });
-        await wpActionsQueue.add(
+        await this.wpActionsQueue.add(
           JOB_TYPES.WP_DEBUG_REVERT,
           {
             environmentId,
@@ -262,7 +259,6 @@ export class WpActionsProcessor extends WorkerHost {
           },
           { ...DEFAULT_JOB_OPTIONS, delay: revertAfterMinutes * 60 * 1000 },
         );
-        await wpActionsQueue.close();
         await tracker.track({
           step: `Auto-revert scheduled in ${revertAfterMinutes}m`,
           level: "info",
@@ -294,11 +290,10 @@ export class WpActionsProcessor extends WorkerHost {
       await tracker.track({ step: `WP Logs: ${type}`, level: "info" });
       const { executor, env } = await this.connectToEnv(environmentId, tracker);
       await job.updateProgress(20);
-      const scriptsPath = this.config.get<string>("scriptsPath")!;
       const remoteScript = `/tmp/wp_logs_${job.id}.php`;
       await pushRemoteScript(
         executor,
-        join(scriptsPath, "wp-logs.php"),
+        join(this.scriptsPath, "wp-logs.php"),
         remoteScript,
       );
       const linesArg = lines ?? 100;
@@ -333,11 +328,10 @@ export class WpActionsProcessor extends WorkerHost {
       await tracker.track({ step: "WP Cron: list", level: "info" });
       const { executor, env } = await this.connectToEnv(environmentId, tracker);
       await job.updateProgress(20);
-      const scriptsPath = this.config.get<string>("scriptsPath")!;
       const remoteScript = `/tmp/wp_cron_${job.id}.php`;
       await pushRemoteScript(
         executor,
-        join(scriptsPath, "wp-cron.php"),
+        join(this.scriptsPath, "wp-cron.php"),
         remoteScript,
       );
       const cmd = `php ${shellQuote(remoteScript)} --docroot=${shellQuote(env.root_path ?? "")}`;
@@ -375,11 +369,10 @@ export class WpActionsProcessor extends WorkerHost {
       });
       const { executor, env } = await this.connectToEnv(environmentId, tracker);
       await job.updateProgress(20);
-      const scriptsPath = this.config.get<string>("scriptsPath")!;
       const remoteScript = `/tmp/wp_cleanup_${job.id}.php`;
       await pushRemoteScript(
         executor,
-        join(scriptsPath, "wp-cleanup.php"),
+        join(this.scriptsPath, "wp-cleanup.php"),
         remoteScript,
       );
       const dryRunArg = dryRun ? " --dry-run" : "";
@@ -620,11 +613,6 @@ export class WpActionsProcessor extends WorkerHost {
       }
 
       if (enabled && revertAfterMinutes && revertAfterMinutes > 0) {
-        const { Queue } = await import("bullmq");
-        const redisUrl = this.config.get<string>("redis.url")!;
-        const wpActionsQueue = new Queue(QUEUES.WP_ACTIONS, {
-          connection: { url: redisUrl },
-        });
         const revertExec = await this.prisma.jobExecution.create({
           data: {
             queue_name: QUEUES.WP_ACTIONS,
@@ -639,7 +627,7 @@ export class WpActionsProcessor extends WorkerHost {
             } as object,
           },
         });
-        await wpActionsQueue.add(
+        await this.wpActionsQueue.add(
           JOB_TYPES.WP_MAINTENANCE_MODE,
           {
             environmentId,
@@ -648,7 +636,6 @@ export class WpActionsProcessor extends WorkerHost {
           },
           { ...DEFAULT_JOB_OPTIONS, delay: revertAfterMinutes * 60 * 1000 },
         );
-        await wpActionsQueue.close();
         await tracker.track({
           step: `Maintenance auto-disable scheduled in ${revertAfterMinutes}m`,
           level: "info",
@@ -10,6 +10,31 @@ import type { Readable } from "stream";
 
 const execFileAsync = promisify(execFile);
 
+/**
+ * Drive resumable-upload chunk size. rclone's 8 MiB default means one HTTPS
+ * round trip per 8 MiB of backup; 64 MiB chunks keep the connection busy on
+ * multi-GB archives at the cost of 64 MiB of buffer for the single transfer.
+ */
+const DRIVE_UPLOAD_CHUNK_SIZE = "64M";
+
+/** Upper bound for a single multi-GB transfer in either direction. */
+const TRANSFER_TIMEOUT_MS = 2 * 60 * 60 * 1_000;
+
+/**
+ * One-line transfer stats every 30 s at NOTICE level, so a long upload
+ * reports progress on stderr without switching the whole run to -v.
+ */
+const TRANSFER_STATS_ARGS = [
+  "--stats",
+  "30s",
+  "--stats-one-line",
+  "--stats-log-level",
+  "NOTICE",
+];
+
+/** stderr lines kept for the error message when a transfer fails. */
+const STDERR_TAIL_LINES = 20;
+
 /** Parsed components of a stored gdrive file_path. */
 export interface GdriveFilePath {
   folderId: string;
@@ -117,19 +142,18 @@ export class RcloneService {
     this.logger.log(
       `Uploading ${localFilePath} → gdrive:${folderId}/${filename}`,
     );
-    await execFileAsync(
-      "rclone",
-      [
-        "copyto",
-        "--config",
-        this.configPath,
-        "--drive-root-folder-id",
-        folderId,
-        localFilePath,
-        `${this.remoteName}:${filename}`,
-      ],
-      { timeout: 2 * 60 * 60 * 1_000 }, // 2-hour max for large file uploads
-    );
+    await this.runTransfer([
+      "copyto",
+      "--config",
+      this.configPath,
+      "--drive-root-folder-id",
+      folderId,
+      "--drive-chunk-size",
+      DRIVE_UPLOAD_CHUNK_SIZE,
+      ...TRANSFER_STATS_ARGS,
+      localFilePath,
+      `${this.remoteName}:${filename}`,
+    ]);
     return `gdrive:${folderId}/${filename}`;
   }
 
@@ -142,19 +166,16 @@ export class RcloneService {
     const { folderId, filename } = RcloneService.parseFilePath(filePath);
     this.logger.log(`Downloading gdrive:${folderId}/${filename} → ${localDir}`);
     await mkdir(localDir, { recursive: true });
-    await execFileAsync(
-      "rclone",
-      [
-        "copy",
-        "--config",
-        this.configPath,
-        "--drive-root-folder-id",
-        folderId,
-        `${this.remoteName}:${filename}`,
-        localDir,
-      ],
-      { timeout: 2 * 60 * 60 * 1_000 }, // 2-hour max for large file downloads
-    );
+    await this.runTransfer([
+      "copy",
+      "--config",
+      this.configPath,
+      "--drive-root-folder-id",
+      folderId,
+      ...TRANSFER_STATS_ARGS,
+      `${this.remoteName}:${filename}`,
+      localDir,
+    ]);
   }
 
   /**
@@ -200,6 +221,54 @@ export class RcloneService {
     return { child, stream: child.stdout as Readable };
   }
 
+  /**
+   * Run a long rclone transfer with its output streamed rather than buffered:
+   * stats lines are logged as they arrive and only the last few stderr lines
+   * are kept for the error message, so a multi-hour upload never accumulates
+   * its whole log in memory or trips execFile's maxBuffer.
+   */
+  private runTransfer(args: string[]): Promise<void> {
+    return new Promise((resolve, reject) => {
+      const child = spawn("rclone", args, {
+        stdio: ["ignore", "ignore", "pipe"],
+      });
+      const tail: string[] = [];
+      let partial = "";
+
+      const timer = setTimeout(() => {
+        child.kill("SIGTERM");
+        reject(new Error(`rclone ${args[0]} timed out`));
+      }, TRANSFER_TIMEOUT_MS);
+
+      child.stderr?.setEncoding("utf8");
+      child.stderr?.on("data", (chunk: string) => {
+        const lines = (partial + chunk).split("\n");
+        partial = lines.pop() ?? "";
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          this.logger.debug(`rclone ${args[0]}: ${line.trim()}`);
+          tail.push(line);
+          if (tail.length > STDERR_TAIL_LINES) tail.shift();
+        }
+      });
+
+      child.on("error", (err) => {
+        clearTimeout(timer);
+        reject(err);
+      });
+      child.on("close", (code) => {
+        clearTimeout(timer);
+        if (code === 0) return resolve();
+        if (partial.trim()) tail.push(partial);
+        reject(
+          new Error(
+            `rclone ${args[0]} exited with code ${code}: ${tail.join("\n")}`,
+          ),
+        );
+      });
+    });
+  }
+
   get remote(): string {
     return this.remoteName;
   }
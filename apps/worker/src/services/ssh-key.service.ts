@@ -3,6 +3,13 @@ import { PrismaService } from "../prisma/prisma.service";
 import { EncryptionService } from "../encryption/encryption.service";
 import { SshServerConfig } from "@bedrock-forge/remote-executor";
 
+/**
+ * How long a decrypted global key is reused before app_settings is read
+ * again. Most servers fall back to the global key, so without this every
+ * job that opens an SSH connection paid a DB round-trip for the same row.
+ */
+const GLOBAL_KEY_TTL_MS = 60_000;
+
 /**
  * SshKeyService
  *
@@ -22,6 +29,7 @@ import { SshServerConfig } from "@bedrock-forge/remote-executor";
 @Injectable()
 export class SshKeyService {
   private readonly logger = new Logger(SshKeyService.name);
+  private globalKey: { value: string; expiresAt: number } | null = null;
 
   constructor(
     private readonly prisma: PrismaService,
@@ -50,6 +58,25 @@ export class SshKeyService {
       }
     }
 
+    const globalKey = await this.loadGlobalKey();
+    if (globalKey) return globalKey;
+
+    throw new Error(
+      `No valid SSH key available for server "${server.name}". ` +
+        "Set a PEM-formatted private key on the server edit page, " +
+        "or configure a global SSH key in Settings → SSH Key.",
+    );
+  }
+
+  /**
+   * Decrypted global key, or null when it is unset or invalid. Only a valid
+   * key is cached, so a key added in Settings is picked up on the next job.
+   */
+  private async loadGlobalKey(): Promise<string | null> {
+    if (this.globalKey && this.globalKey.expiresAt > Date.now()) {
+      return this.globalKey.value;
+    }
+
     const globalSetting = await this.prisma.appSetting.findUnique({
       where: { key: "global_ssh_private_key" },
     });
@@ -57,18 +84,17 @@ export class SshKeyService {
       try {
         const decrypted = this.enc.decrypt(globalSetting.value);
         if (decrypted && decrypted.trimStart().startsWith("-----BEGIN")) {
+          this.globalKey = {
+            value: decrypted,
+            expiresAt: Date.now() + GLOBAL_KEY_TTL_MS,
+          };
           return decrypted;
         }
       } catch {
-        // Global key is also corrupted — fall through to the throw below
+        // Global key is also corrupted — caller throws
       }
     }
-
-    throw new Error(
-      `No valid SSH key available for server "${server.name}". ` +
-        "Set a PEM-formatted private key on the server edit page, " +
-        "or configure a global SSH key in Settings → SSH Key.",
-    );
+    return null;
   }
 
   async getSshConfig(server: {
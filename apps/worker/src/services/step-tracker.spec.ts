@@ -0,0 +1,63 @@
+import { Logger } from "@nestjs/common";
+import { StepTracker } from "./step-tracker";
+
+describe("StepTracker", () => {
+  let prisma: { jobExecution: { update: jest.Mock } };
+  let tracker: StepTracker;
+
+  const logger = {
+    log: jest.fn(),
+    warn: jest.fn(),
+    error: jest.fn(),
+  } as unknown as Logger;
+
+  const loggedWrites = () =>
+    prisma.jobExecution.update.mock.calls.filter(
+      ([arg]) => arg.data.execution_log !== undefined,
+    );
+
+  beforeEach(() => {
+    jest.useFakeTimers();
+    prisma = { jobExecution: { update: jest.fn().mockResolvedValue({}) } };
+    tracker = new StepTracker(prisma as any, BigInt(1), logger, "job-1");
+  });
+
+  afterEach(() => {
+    jest.useRealTimers();
+  });
+
+  it("coalesces rapid info steps into one trailing write", async () => {
+    await tracker.track({ step: "one", level: "info" });
+    await tracker.track({ step: "two", level: "info" });
+    await tracker.track({ step: "three", level: "info" });
+
+    expect(loggedWrites()).toHaveLength(1);
+
+    await jest.advanceTimersByTimeAsync(500);
+
+    const writes = loggedWrites();
+    expect(writes).toHaveLength(2);
+    expect(writes[1][0].data.execution_log).toHaveLength(3);
+  });
+
+  it("persists error steps immediately", async () => {
+    await tracker.track({ step: "one", level: "info" });
+    await tracker.track({ step: "boom", level: "error" });
+
+    const writes = loggedWrites();
+    expect(writes).toHaveLength(2);
+    expect(writes[1][0].data.execution_log).toHaveLength(2);
+  });
+
+  it("drops the trailing write once the job is completed", async () => {
+    await tracker.track({ step: "one", level: "info" });
+    await tracker.track({ step: "two", level: "info" });
+    await tracker.complete({ executionLog: [] });
+
+    await jest.advanceTimersByTimeAsync(500);
+
+    const writes = loggedWrites();
+    expect(writes).toHaveLength(2);
+    expect(writes[1][0].data.status).toBe("completed");
+  });
+});
@@ -16,6 +16,13 @@ export interface ExecutionLogEntry {
 }
 
 const MAX_OUTPUT_LENGTH = 500;
+/**
+ * Minimum gap between execution_log writes for info/warn steps. Each write
+ * re-serialises the whole log, so chatty jobs (hundreds of steps) would
+ * otherwise pay O(n²) JSON encoding and one DB round-trip per step. Steps
+ * inside the window are persisted by a single trailing write instead.
+ */
+const FLUSH_MIN_INTERVAL_MS = 500;
 const SECRET_PATTERNS = [
   // MYSQL_PWD='...' or MYSQL_PWD="..."
   /MYSQL_PWD='[^']*'/g,
@@ -54,6 +61,8 @@ function truncate(s: string): string {
  */
 export class StepTracker {
   private entries: ExecutionLogEntry[] = [];
+  private lastFlushAt = 0;
+  private pendingFlush: NodeJS.Timeout | null = null;
   private readonly jobId: string | number;
   private readonly job: {
     id?: string | number;
@@ -129,7 +138,18 @@ export class StepTracker {
     else if (full.level === "warn") this.logger.warn(logLine);
     else this.logger.log(logLine);
 
-    await this.flush();
+    // Errors are persisted immediately so the failure reason is visible even
+    // if the process dies right after; routine steps are coalesced.
+    const sinceLastFlush = Date.now() - this.lastFlushAt;
+    if (full.level === "error" || sinceLastFlush >= FLUSH_MIN_INTERVAL_MS) {
+      await this.flush();
+    } else if (!this.pendingFlush) {
+      this.pendingFlush = setTimeout(() => {
+        this.pendingFlush = null;
+        this.flush().catch(() => undefined);
+      }, FLUSH_MIN_INTERVAL_MS - sinceLastFlush);
+      this.pendingFlush.unref();
+    }
   }
 
   /**
@@ -156,6 +176,8 @@ export class StepTracker {
 
   /** Persist the current entries array to the database. Fire-and-forget safe. */
   async flush(): Promise<void> {
+    this.cancelPendingFlush();
+    this.lastFlushAt = Date.now();
     await this.prisma.jobExecution
       .update({
         where: { id: this.jobExecutionId },
@@ -175,6 +197,9 @@ export class StepTracker {
     progress?: number;
     executionLog?: any;
   }): Promise<void> {
+    // The completion write below carries the final log; a trailing flush
+    // firing afterwards could overwrite a caller-supplied executionLog.
+    this.cancelPendingFlush();
     await this.prisma.jobExecution.update({
       where: { id: this.jobExecutionId },
       data: {
@@ -219,6 +244,13 @@ export class StepTracker {
     return (await redis.get(`forge:cancel:${this.jobId}`)) === "1";
   }
 
+  private cancelPendingFlush(): void {
+    if (this.pendingFlush) {
+      clearTimeout(this.pendingFlush);
+      this.pendingFlush = null;
+    }
+  }
+
   /** Return a snapshot of all entries (for inspection / test assertions). */
   getEntries(): ExecutionLogEntry[] {
     return [...this.entries];
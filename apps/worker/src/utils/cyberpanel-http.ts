@@ -1,5 +1,13 @@
-import { request as httpRequest, IncomingMessage } from "node:http";
-import { request as httpsRequest, RequestOptions } from "node:https";
+import {
+  Agent as HttpAgent,
+  request as httpRequest,
+  IncomingMessage,
+} from "node:http";
+import {
+  Agent as HttpsAgent,
+  request as httpsRequest,
+  RequestOptions,
+} from "node:https";
 
 /** Credentials for a CyberPanel admin API connection. */
 export interface CpCreds {
@@ -8,17 +16,31 @@ export interface CpCreds {
   password: string;
 }
 
+// Process-wide keep-alive agents: a provisioning run makes several calls to
+// the same panel (verifyLogin, createWebsite, submitDBCreation, …), and each
+// one would otherwise pay a fresh TCP + TLS handshake.
+const HTTP_AGENT = new HttpAgent({ keepAlive: true, maxSockets: 8 });
+const HTTPS_AGENT = new HttpsAgent({ keepAlive: true, maxSockets: 8 });
+
+/** How much of a response body is quoted in HTTP and parse error messages. */
+const ERROR_BODY_PREVIEW_LENGTH = 300;
+
+const MYSQL_SPECIAL_CHARS = /[\\'\0\n\r]/g;
+const MYSQL_ESCAPES: Record<string, string> = {
+  "\\": "\\\\",
+  "'": "\\'",
+  "\0": "\\0",
+  "\n": "\\n",
+  "\r": "\\r",
+};
+
 /**
  * Escape a value for safe interpolation into a MySQL string literal.
  * Used when building inline SQL — always paired with explicit quoting.
  */
 export function escapeMysql(str: string): string {
-  return str
-    .replace(/\\/g, "\\\\")
-    .replace(/'/g, "\\'")
-    .replace(/\0/g, "\\0")
-    .replace(/\n/g, "\\n")
-    .replace(/\r/g, "\\r");
+  // One regex pass with a lookup instead of five chained replace() scans.
+  return str.replace(MYSQL_SPECIAL_CHARS, (ch) => MYSQL_ESCAPES[ch]);
 }
 
 /**
@@ -55,6 +77,7 @@ export function callCpApi(
         "Content-Type": "application/json",
         "Content-Length": Buffer.byteLength(payload),
       },
+      agent: isHttps ? HTTPS_AGENT : HTTP_AGENT,
       // Default: verify TLS certificates. Set CYBERPANEL_TLS_VERIFY=false only
       // when the CyberPanel instance uses a self-signed cert that cannot be
       // replaced — understand that this opens the connection to MITM attacks.
@@ -67,19 +90,32 @@ export function callCpApi(
 
     function handleResp(res: IncomingMessage) {
       const chunks: Buffer[] = [];
-      res.on("data", (c: Buffer) => chunks.push(c));
-      res.on("end", () => {
-        const raw = Buffer.concat(chunks).toString();
 
-        // Reject early on non-2xx HTTP status (e.g. 401 HTML auth page)
-        if (res.statusCode && (res.statusCode < 200 || res.statusCode >= 300)) {
+      // Non-2xx (e.g. a 401 HTML auth page, a 502 from a proxy) is decided
+      // from the status line alone: keep only the start of the body for the
+      // error message and drain the rest unbuffered, so the keep-alive
+      // socket is still reusable afterwards.
+      if (res.statusCode && (res.statusCode < 200 || res.statusCode >= 300)) {
+        let kept = 0;
+        res.on("data", (c: Buffer) => {
+          if (kept >= ERROR_BODY_PREVIEW_LENGTH) return;
+          chunks.push(c);
+          kept += c.length;
+        });
+        res.on("end", () => {
+          const preview = Buffer.concat(chunks)
+            .toString()
+            .slice(0, ERROR_BODY_PREVIEW_LENGTH);
           reject(
-            new Error(
-              `CyberPanel ${endpoint} HTTP ${res.statusCode}: ${raw.slice(0, 300)}`,
-            ),
+            new Error(`CyberPanel ${endpoint} HTTP ${res.statusCode}: ${preview}`),
           );
-          return;
-        }
+        });
+        return;
+      }
+
+      res.on("data", (c: Buffer) => chunks.push(c));
+      res.on("end", () => {
+        const raw = Buffer.concat(chunks).toString();
 
         try {
           const data = JSON.parse(raw) as Record<string, unknown>;
@@ -95,7 +131,7 @@ export function callCpApi(
         } catch (e) {
           reject(
             new Error(
-              `CyberPanel ${endpoint} response parse error: ${e}\nBody: ${raw.slice(0, 300)}`,
+              `CyberPanel ${endpoint} response parse error: ${e}\nBody: ${raw.slice(0, ERROR_BODY_PREVIEW_LENGTH)}`,
             ),
           );
         }
@@ -1,11 +1,13 @@
 import {
   shellQuote,
   flipProtocol,
+  fixCyberPanelOwnership,
   createRemoteMyCnf,
   cleanupRemoteMyCnf,
   isValidTableName,
   sanitizeTableList,
   pushRemoteScript,
+  buildWpCliPrefix,
   WpCliBuilder,
   ComposerCommandBuilder,
 } from "./processor-utils";
@@ -63,6 +65,55 @@ describe("flipProtocol", () => {
   });
 });
 
+describe("fixCyberPanelOwnership", () => {
+  it("detects the owner and applies all fixes in two execs", async () => {
+    const mockExecutor = {
+      execute: jest
+        .fn()
+        .mockResolvedValueOnce({ code: 0, stdout: "root\nsiteuser", stderr: "" })
+        .mockResolvedValueOnce({ code: 0, stdout: "", stderr: "" }),
+    } as any;
+
+    await fixCyberPanelOwnership(mockExecutor, "/home/example.com/public_html/");
+
+    expect(mockExecutor.execute).toHaveBeenCalledTimes(2);
+    const batch = mockExecutor.execute.mock.calls[1][0] as string;
+    expect(batch).toContain(
+      "chown -R 'siteuser:siteuser' '/home/example.com/public_html'",
+    );
+    expect(batch).toContain(
+      "chown 'siteuser:nogroup' '/home/example.com/public_html'",
+    );
+    expect(batch).toContain("chmod 750 '/home/example.com/public_html'");
+  });
+
+  it("reports each failed step from the batch", async () => {
+    const tracker = { track: jest.fn().mockResolvedValue(undefined) } as any;
+    const mockExecutor = {
+      execute: jest
+        .fn()
+        .mockResolvedValueOnce({ code: 0, stdout: "siteuser", stderr: "" })
+        .mockResolvedValueOnce({
+          code: 0,
+          stdout: "__BF_STEP_FAILED__2",
+          stderr: "chmod: denied",
+        }),
+    } as any;
+
+    await fixCyberPanelOwnership(mockExecutor, "/home/example.com/public_html", tracker);
+
+    expect(tracker.track).toHaveBeenCalledWith(
+      expect.objectContaining({
+        step: "chmod 750 on docroot failed",
+        level: "warn",
+      }),
+    );
+    expect(tracker.track).not.toHaveBeenCalledWith(
+      expect.objectContaining({ step: "chown user:nogroup on docroot failed" }),
+    );
+  });
+});
+
 describe("createRemoteMyCnf & cleanupRemoteMyCnf", () => {
   let mockExecutor: jest.Mocked<any>;
 
@@ -90,9 +141,10 @@ describe("createRemoteMyCnf & cleanupRemoteMyCnf", () => {
     expect(mockExecutor.pushFile).toHaveBeenCalledWith({
       remotePath,
       content: expect.any(Buffer),
+      mode: 0o600,
     });
-    expect(mockExecutor.execute).toHaveBeenCalledWith(
-      `chmod 600 '${remotePath}'`,
+    expect(mockExecutor.execute).not.toHaveBeenCalledWith(
+      expect.stringContaining("chmod"),
     );
   });
 
@@ -133,6 +185,60 @@ describe("pushRemoteScript", () => {
       content: expect.any(Buffer),
     });
   });
+
+  it("reads each local script from disk only once", async () => {
+    const { readFile } = jest.requireMock("fs/promises");
+    const mockExecutor = {
+      pushFile: jest.fn().mockResolvedValue(undefined),
+    } as any;
+    readFile.mockClear();
+
+    await pushRemoteScript(mockExecutor, "/local/cached.php", "/remote/a.php");
+    await pushRemoteScript(mockExecutor, "/local/cached.php", "/remote/b.php");
+
+    expect(readFile).toHaveBeenCalledTimes(1);
+    expect(mockExecutor.pushFile).toHaveBeenCalledTimes(2);
+  });
+});
+
+describe("buildWpCliPrefix", () => {
+  const makeExecutor = (serverKey: string) =>
+    ({
+      serverKey,
+      execute: jest.fn().mockImplementation(async (cmd: string) => {
+        if (cmd.startsWith("stat")) {
+          return { code: 0, stdout: "site_user\n", stderr: "" };
+        }
+        if (cmd.startsWith("which wp")) {
+          return { code: 0, stdout: "/usr/local/bin/wp\n", stderr: "" };
+        }
+        return { code: 0, stdout: "", stderr: "" };
+      }),
+    }) as any;
+
+  it("reuses the probed prefix for the same server and path", async () => {
+    const first = makeExecutor("203.0.113.5:22");
+    const second = makeExecutor("203.0.113.5:22");
+
+    const a = await buildWpCliPrefix(first, "/home/a.com/public_html");
+    const b = await buildWpCliPrefix(second, "/home/a.com/public_html");
+
+    expect(b).toEqual(a);
+    expect(a.prefix).toBe("sudo -u site_user");
+    expect(a.wpBin).toBe("/usr/local/bin/wp");
+    expect(second.execute).not.toHaveBeenCalled();
+  });
+
+  it("probes again for a different server", async () => {
+    await buildWpCliPrefix(
+      makeExecutor("203.0.113.6:22"),
+      "/home/b.com/public_html",
+    );
+    const other = makeExecutor("203.0.113.7:22");
+    await buildWpCliPrefix(other, "/home/b.com/public_html");
+
+    expect(other.execute).toHaveBeenCalled();
+  });
 });
 
 describe("WpCliBuilder", () => {
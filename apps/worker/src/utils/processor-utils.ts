@@ -1,5 +1,6 @@
 import { RemoteExecutorService } from "@bedrock-forge/remote-executor";
 import { StepTracker } from "../services/step-tracker";
+import type { PrismaService } from "../prisma/prisma.service";
 import { readFile } from "fs/promises";
 import { randomBytes } from "crypto";
 
@@ -11,6 +12,37 @@ export function shellQuote(value: string): string {
   return "'" + value.replace(/'/g, "'\\''") + "'";
 }
 
+// A pre-flight backup is waited on for up to 20 minutes. The poll interval
+// starts at 1 s and doubles up to 10 s, so a quick db_only backup is picked
+// up within a second or two instead of on the next fixed 10 s tick.
+const PREFLIGHT_BACKUP_TIMEOUT_MS = 20 * 60 * 1000;
+const PREFLIGHT_POLL_INITIAL_MS = 1_000;
+const PREFLIGHT_POLL_MAX_MS = 10_000;
+
+/**
+ * Wait for a pre-flight backup's JobExecution to complete.
+ * Throws if it fails or is still running after 20 minutes.
+ */
+export async function waitForPreflightBackup(
+  prisma: PrismaService,
+  executionId: bigint,
+): Promise<void> {
+  const deadline = Date.now() + PREFLIGHT_BACKUP_TIMEOUT_MS;
+  let pollDelayMs = PREFLIGHT_POLL_INITIAL_MS;
+  while (Date.now() < deadline) {
+    const exec = await prisma.jobExecution.findUnique({
+      where: { id: executionId },
+    });
+    if (exec?.status === "completed") return;
+    if (exec?.status === "failed") {
+      throw new Error("Pre-flight backup failed: " + exec.last_error);
+    }
+    await new Promise((r) => setTimeout(r, pollDelayMs));
+    pollDelayMs = Math.min(pollDelayMs * 2, PREFLIGHT_POLL_MAX_MS);
+  }
+  throw new Error("Pre-flight backup timed out after 20 minutes");
+}
+
 /**
  * Flip http↔https on a URL string.
  * Returns null if the URL doesn't start with http:// or https://.
@@ -50,30 +82,20 @@ export async function fixCyberPanelOwnership(
     }
   };
 
-  // Detect the site owner from the parent directory (e.g. /home/<domain>)
-  const parentStat = await executor
-    .execute(`stat -c '%U' ${shellQuote(parentDir)} 2>/dev/null`)
+  // Detect the site owner from the parent directory (e.g. /home/<domain>),
+  // falling back to the docroot itself when the parent is root-owned or
+  // unreadable. Both are stat'ed in one exec — one output line per path,
+  // empty when the stat fails — so the fallback costs no extra round trip.
+  const ownerStat = await executor
+    .execute(
+      `for p in ${shellQuote(parentDir)} ${shellQuote(root)}; do stat -c '%U' "$p" 2>/dev/null || echo; done`,
+    )
     .catch(() => ({ code: 1, stdout: "", stderr: "" }));
-  let owner: string | null =
-    parentStat.code === 0 &&
-    parentStat.stdout.trim() &&
-    parentStat.stdout.trim() !== "root"
-      ? parentStat.stdout.trim()
-      : null;
-
-  // Fallback: stat the docroot itself when parent is root-owned or unreadable
-  if (!owner) {
-    const selfStat = await executor
-      .execute(`stat -c '%U' ${shellQuote(root)} 2>/dev/null`)
-      .catch(() => ({ code: 1, stdout: "", stderr: "" }));
-    if (
-      selfStat.code === 0 &&
-      selfStat.stdout.trim() &&
-      selfStat.stdout.trim() !== "root"
-    ) {
-      owner = selfStat.stdout.trim();
-    }
-  }
+  const owner: string | null =
+    ownerStat.stdout
+      .split("\n")
+      .map((line) => line.trim())
+      .find((line) => line !== "" && line !== "root") ?? null;
 
   if (!owner) {
     await log(
@@ -90,38 +112,43 @@ export async function fixCyberPanelOwnership(
     root,
   );
 
-  // Step 1 — inner files: user:user (recursive)
-  await executor
-    .execute(`chown -R ${shellQuote(`${owner}:${owner}`)} ${shellQuote(root)}`)
-    .catch(async (e: unknown) => {
-      await log(
-        "chown -R failed — inner files may have wrong ownership",
-        "warn",
-        e instanceof Error ? e.message : String(e),
-      );
-    });
-
-  // Step 2 — docroot folder itself: user:nogroup (non-recursive override)
-  await executor
-    .execute(`chown ${shellQuote(`${owner}:nogroup`)} ${shellQuote(root)}`)
-    .catch(async (e: unknown) => {
-      await log(
-        "chown user:nogroup on docroot failed",
-        "warn",
-        e instanceof Error ? e.message : String(e),
-      );
-    });
-
-  // Step 3 — enforce correct mode on the docroot
-  await executor
-    .execute(`chmod 750 ${shellQuote(root)}`)
-    .catch(async (e: unknown) => {
-      await log(
-        "chmod 750 on docroot failed",
-        "warn",
-        e instanceof Error ? e.message : String(e),
-      );
-    });
+  // All three steps run in a single exec. They are joined with `;` rather
+  // than `&&` so a failure in one still lets the others run, and each step
+  // echoes a marker on failure so it can be reported individually.
+  const steps: Array<{ cmd: string; failure: string }> = [
+    // Step 1 — inner files: user:user (recursive)
+    {
+      cmd: `chown -R ${shellQuote(`${owner}:${owner}`)} ${shellQuote(root)}`,
+      failure: "chown -R failed — inner files may have wrong ownership",
+    },
+    // Step 2 — docroot folder itself: user:nogroup (non-recursive override)
+    {
+      cmd: `chown ${shellQuote(`${owner}:nogroup`)} ${shellQuote(root)}`,
+      failure: "chown user:nogroup on docroot failed",
+    },
+    // Step 3 — enforce correct mode on the docroot
+    {
+      cmd: `chmod 750 ${shellQuote(root)}`,
+      failure: "chmod 750 on docroot failed",
+    },
+  ];
+  const batch = steps
+    .map(({ cmd }, i) => `${cmd} || echo __BF_STEP_FAILED__${i}`)
+    .join("; ");
+  try {
+    const result = await executor.execute(batch);
+    for (const [i, { failure }] of steps.entries()) {
+      if (result.stdout.includes(`__BF_STEP_FAILED__${i}`)) {
+        await log(failure, "warn", result.stderr || undefined);
+      }
+    }
+  } catch (e: unknown) {
+    await log(
+      "Ownership fix failed — docroot may have wrong ownership",
+      "warn",
+      e instanceof Error ? e.message : String(e),
+    );
+  }
 
   await log(
     `Ownership fixed: ${owner}:nogroup on docroot, ${owner}:${owner} on contents`,
@@ -129,6 +156,22 @@ export async function fixCyberPanelOwnership(
   );
 }
 
+export interface WpCliPrefix {
+  prefix: string;
+  allowRootFlag: string;
+  lsphpBin: string | null;
+  wpBin: string | null;
+}
+
+// The WP-CLI invocation for a site only changes when its owner or PHP build
+// does, but every scan/update job re-probed it with up to seven SSH execs.
+// Results are reused per server + path for WP_CLI_PREFIX_TTL_MS.
+const WP_CLI_PREFIX_TTL_MS = 10 * 60 * 1000;
+const wpCliPrefixCache = new Map<
+  string,
+  { expiresAt: number; value: WpCliPrefix }
+>();
+
 /**
  * Detect the owner of a WordPress installation directory and return the
  * appropriate WP-CLI invocation prefix.
@@ -146,16 +189,36 @@ export async function fixCyberPanelOwnership(
  *   When both are set, callers should invoke: `${prefix} ${lsphpBin} ${wpBin} args`
  *   to bypass the phar shebang entirely. If only `lsphpBin` is set (wp not found
  *   in PATH), fall back to `env WP_CLI_PHP=${lsphpBin} wp`.
+ *
+ * Results are cached per server and path for a few minutes.
  */
 export async function buildWpCliPrefix(
   executor: RemoteExecutorService,
   wpPath: string,
-): Promise<{
-  prefix: string;
-  allowRootFlag: string;
-  lsphpBin: string | null;
-  wpBin: string | null;
-}> {
+): Promise<WpCliPrefix> {
+  const serverKey = executor.serverKey;
+  if (!serverKey) return probeWpCliPrefix(executor, wpPath);
+
+  const key = `${serverKey}:${wpPath}`;
+  const cached = wpCliPrefixCache.get(key);
+  if (cached && cached.expiresAt > Date.now()) return { ...cached.value };
+
+  const value = await probeWpCliPrefix(executor, wpPath);
+  // Without a wp binary the probes most likely failed outright (they all
+  // swallow errors) — don't pin those fallback defaults for the whole TTL.
+  if (value.wpBin) {
+    wpCliPrefixCache.set(key, {
+      expiresAt: Date.now() + WP_CLI_PREFIX_TTL_MS,
+      value,
+    });
+  }
+  return { ...value };
+}
+
+async function probeWpCliPrefix(
+  executor: RemoteExecutorService,
+  wpPath: string,
+): Promise<WpCliPrefix> {
   let prefix = "";
   let allowRootFlag = "--allow-root";
   try {
@@ -286,17 +349,22 @@ export async function createRemoteMyCnf(
   // Housekeeping: clean any orphaned cnf files older than 60 minutes
   await executor.execute(`find /tmp -name "${prefix}_mycnf_*.cnf" -mmin +60 -delete 2>/dev/null || true`).catch(() => {});
 
-  const rand = randomBytes(16).toString("hex");
+  // 96 random bits as 16 url-safe chars (vs 32 hex chars for 128 bits) —
+  // plenty to keep concurrent jobs apart, and shorter on every command line
+  // that references the file.
+  const rand = randomBytes(12).toString("base64url");
   const remotePath = `/tmp/${prefix}_mycnf_${jobId}_${rand}.cnf`;
   let content = `[client]\nuser=${creds.dbUser}\npassword=${creds.dbPassword ?? ""}\nhost=${creds.dbHost}\n`;
   if (creds.dbName) {
     content += `database=${creds.dbName}\n`;
   }
+  // Created 0600 by the SFTP open itself: no follow-up chmod round trip,
+  // and the password is never briefly world-readable.
   await executor.pushFile({
     remotePath,
     content: Buffer.from(content),
+    mode: 0o600,
   });
-  await executor.execute(`chmod 600 ${shellQuote(remotePath)}`);
   return remotePath;
 }
 
@@ -333,6 +401,23 @@ export function sanitizeTableList(tables: string[]): string[] {
   return safe;
 }
 
+/**
+ * Helper scripts ship with the worker image and never change while it runs,
+ * so each one is read from disk once and its bytes reused for every job.
+ * A failed read is evicted so the next job retries it.
+ */
+const scriptContentCache = new Map<string, Promise<Buffer>>();
+
+function readScriptContent(localScriptPath: string): Promise<Buffer> {
+  let content = scriptContentCache.get(localScriptPath);
+  if (!content) {
+    content = readFile(localScriptPath);
+    scriptContentCache.set(localScriptPath, content);
+    content.catch(() => scriptContentCache.delete(localScriptPath));
+  }
+  return content;
+}
+
 /**
  * Push a local helper script from the scripts directory to the remote server.
  */
@@ -341,7 +426,7 @@ export async function pushRemoteScript(
   localScriptPath: string,
   remoteScriptPath: string,
 ): Promise<void> {
-  const content = await readFile(localScriptPath);
+  const content = await readScriptContent(localScriptPath);
   await executor.pushFile({
     remotePath: remoteScriptPath,
     content,
@@ -39,6 +39,9 @@ jest.mock("ssh2", () => {
         mockClients.push(this);
       }
     },
+    utils: {
+      parseKey: jest.fn((pem: string) => ({ type: "ssh-ed25519", pem })),
+    },
   };
 });
 
@@ -77,6 +80,95 @@ describe("SSH Execution & Pooling Integration", () => {
       expect(client2).toBe(client1);
     });
 
+    it("authenticates with the configured key only", async () => {
+      await pool.getConnection("server1", config);
+
+      const connectConfig = mockClients[0].connect.mock.calls[0][0];
+      expect(connectConfig.authHandler).toEqual([
+        {
+          type: "publickey",
+          username: "test",
+          key: { type: "ssh-ed25519", pem: "fake-key" },
+        },
+      ]);
+      expect(connectConfig.agent).toBeUndefined();
+    });
+
+    it("parses each private key once across connections", async () => {
+      const { utils } = jest.requireMock("ssh2");
+      const otherKey = { ...config, privateKey: "other-key" };
+
+      await pool.getConnection("server1", otherKey);
+      await pool.getConnection("server1", otherKey);
+      await pool.getConnection("server2", otherKey);
+
+      expect(utils.parseKey).toHaveBeenCalledTimes(1);
+      const [first, second] = mockClients.map(
+        (c) => c.connect.mock.calls[0][0].authHandler[0].key,
+      );
+      expect(second).toBe(first);
+    });
+
+    it("pins later connections to the host key trusted on first use", async () => {
+      const onHostKeyFingerprint = jest.fn();
+      const tofuConfig = { ...config, onHostKeyFingerprint };
+      const verifyHost = (clientIdx: number, hostKey: string) => {
+        const { hostVerifier } = mockClients[clientIdx].connect.mock.calls[0][0];
+        const verify = jest.fn();
+        hostVerifier(Buffer.from(hostKey), verify);
+        return verify.mock.calls[0][0];
+      };
+
+      await pool.getConnection("server1", tofuConfig);
+      await pool.getConnection("server1", tofuConfig);
+      await pool.getConnection("server1", tofuConfig);
+
+      expect(verifyHost(0, "host-key-a")).toBe(true);
+      expect(verifyHost(1, "host-key-a")).toBe(true);
+      expect(verifyHost(2, "host-key-b")).toBe(false);
+      expect(onHostKeyFingerprint).toHaveBeenCalledTimes(1);
+    });
+
+    it("trusts a re-added server afresh once the first key is persisted", async () => {
+      const onHostKeyFingerprint = jest.fn().mockResolvedValue(undefined);
+      const tofuConfig = { ...config, onHostKeyFingerprint };
+      const verifyHost = (clientIdx: number, hostKey: string) => {
+        const { hostVerifier } = mockClients[clientIdx].connect.mock.calls[0][0];
+        const verify = jest.fn();
+        hostVerifier(Buffer.from(hostKey), verify);
+        return verify.mock.calls[0][0];
+      };
+
+      await pool.getConnection("server1", tofuConfig);
+      expect(verifyHost(0, "host-key-a")).toBe(true);
+      await new Promise((r) => setImmediate(r));
+
+      // Rebuilt on the same host:port with its stored fingerprint reset.
+      await pool.getConnection("server1", tofuConfig);
+      expect(verifyHost(1, "host-key-b")).toBe(true);
+      expect(onHostKeyFingerprint).toHaveBeenCalledTimes(2);
+    });
+
+    it("forgets a learned host key when the server is closed", async () => {
+      const tofuConfig = {
+        ...config,
+        onHostKeyFingerprint: () => new Promise<void>(() => {}),
+      };
+      const verifyHost = (clientIdx: number, hostKey: string) => {
+        const { hostVerifier } = mockClients[clientIdx].connect.mock.calls[0][0];
+        const verify = jest.fn();
+        hostVerifier(Buffer.from(hostKey), verify);
+        return verify.mock.calls[0][0];
+      };
+
+      await pool.getConnection("server1", tofuConfig);
+      expect(verifyHost(0, "host-key-a")).toBe(true);
+      pool.closeServer("server1");
+
+      await pool.getConnection("server1", tofuConfig);
+      expect(verifyHost(1, "host-key-b")).toBe(true);
+    });
+
     it("creates a new connection if none are idle and capacity allows", async () => {
       const client1 = await pool.getConnection("server1", config);
       const client2 = await pool.getConnection("server1", config);
@@ -96,6 +188,18 @@ describe("SSH Execution & Pooling Integration", () => {
       expect(pool.getPoolStats("server1").total).toBe(0);
     });
 
+    it("removes connection from pool when the socket closes without 'end'", async () => {
+      const client = await pool.getConnection("server1", config);
+      pool.releaseConnection("server1", client);
+
+      client.emit("close");
+
+      await new Promise((r) => process.nextTick(r));
+      expect(pool.getPoolStats("server1").total).toBe(0);
+      const fresh = await pool.getConnection("server1", config);
+      expect(fresh).not.toBe(client);
+    });
+
     it("times out if pool is at max capacity and no connection is released", async () => {
       // Connect up to MAX_POOL_SIZE (15)
       for (let i = 0; i < 15; i++) {
@@ -125,6 +229,20 @@ describe("SSH Execution & Pooling Integration", () => {
       const resolvedClient = await p;
       expect(resolvedClient).toBe(clients[0]);
     });
+
+    it("opens a fresh connection for a waiter when a pooled one drops", async () => {
+      const clients: any[] = [];
+      for (let i = 0; i < 15; i++) {
+        clients.push(await pool.getConnection("server1", config));
+      }
+
+      const p = pool.getConnection("server1", config);
+      pool.destroyConnection("server1", clients[0]);
+
+      const resolvedClient = await p;
+      expect(clients).not.toContain(resolvedClient);
+      expect(pool.getPoolStats("server1").total).toBe(15);
+    });
   });
 
   // ─── 2. Execution & Error Handling Tests ───────────────────────────────────
@@ -154,6 +272,37 @@ describe("SSH Execution & Pooling Integration", () => {
       expect(res).toEqual(execResult);
     });
 
+    it("streams output chunks to onOutput as they arrive", async () => {
+      const mockStream = new EventEmitter() as any;
+      mockStream.stderr = new EventEmitter();
+      const euro = Buffer.from("€");
+
+      const client = await pool.getConnection("127.0.0.1:22", config);
+      const mockClientInstance = mockClients.find((c) => c === (client as any))!;
+      mockClientInstance.exec = jest.fn().mockImplementation((_cmd: string, cb: (err: any, stream: any) => void) => {
+        cb(null, mockStream);
+        process.nextTick(() => {
+          mockStream.emit("data", Buffer.concat([Buffer.from("a"), euro.subarray(0, 1)]));
+          mockStream.stderr.emit("data", Buffer.from("warn"));
+          mockStream.emit("data", euro.subarray(1));
+          process.nextTick(() => {
+            mockStream.emit("close", 0);
+          });
+        });
+      });
+      pool.releaseConnection("127.0.0.1:22", client);
+
+      const onOutput = jest.fn();
+      const res = await executor.execute("composer update", { onOutput });
+
+      expect(onOutput.mock.calls).toEqual([
+        ["a", "stdout"],
+        ["warn", "stderr"],
+        ["€", "stdout"],
+      ]);
+      expect(res).toEqual({ stdout: "a€", stderr: "warn", code: 0 });
+    });
+
     it("handles command execution timeouts", async () => {
       const mockStream = new EventEmitter() as any;
       mockStream.stderr = new EventEmitter();
@@ -199,6 +348,7 @@ describe("SSH Execution & Pooling Integration", () => {
           return stream;
         }),
         end: jest.fn(),
+        on: jest.fn(),
       };
 
       const client = await pool.getConnection("127.0.0.1:22", config);
@@ -222,6 +372,7 @@ describe("SSH Execution & Pooling Integration", () => {
       const mockSftp = {
         createReadStream: jest.fn().mockReturnValue(mockStream),
         end: jest.fn(),
+        on: jest.fn(),
       };
 
       const client = await pool.getConnection("127.0.0.1:22", config);
@@ -245,7 +396,139 @@ describe("SSH Execution & Pooling Integration", () => {
 
       const result = await p;
       expect(result.toString()).toBe("chunk");
-      expect(mockSftp.end).toHaveBeenCalled();
+      // A successful transfer leaves the session open for the next one
+      expect(mockSftp.end).not.toHaveBeenCalled();
+    });
+
+    it("reuses one SFTP session per pooled connection", async () => {
+      const mockSftp = {
+        createWriteStream: jest.fn().mockImplementation(() => {
+          const stream = new EventEmitter() as any;
+          stream.end = jest.fn(() => process.nextTick(() => stream.emit("close")));
+          return stream;
+        }),
+        end: jest.fn(),
+        on: jest.fn(),
+      };
+      const client = await pool.getConnection("127.0.0.1:22", config);
+      const mockClientInstance = mockClients.find((c) => c === (client as any))!;
+      mockClientInstance.sftp = jest.fn().mockImplementation((cb: (err: any, sftp: any) => void) => {
+        cb(null, mockSftp);
+      });
+      pool.releaseConnection("127.0.0.1:22", client);
+
+      await executor.pushFile({ remotePath: "/tmp/a", content: "a" });
+      await executor.pushFile({ remotePath: "/tmp/b", content: "b" });
+
+      expect(mockClientInstance.sftp).toHaveBeenCalledTimes(1);
+      expect(mockSftp.createWriteStream).toHaveBeenCalledTimes(2);
+    });
+
+    it("uploads a script over SFTP and runs it in a single exec", async () => {
+      const written: string[] = [];
+      const mockSftp = {
+        createWriteStream: jest.fn().mockImplementation(() => {
+          const stream = new EventEmitter() as any;
+          stream.write = jest.fn((chunk: Buffer) => written.push(chunk.toString()));
+          stream.end = jest.fn((chunk?: Buffer) => {
+            if (chunk) written.push(chunk.toString());
+            process.nextTick(() => stream.emit("close"));
+          });
+          return stream;
+        }),
+        end: jest.fn(),
+        on: jest.fn(),
+      };
+      const client = await pool.getConnection("127.0.0.1:22", config);
+      const mockClientInstance = mockClients.find((c) => c === (client as any))!;
+      mockClientInstance.sftp = jest.fn().mockImplementation((cb: (err: any, sftp: any) => void) => {
+        cb(null, mockSftp);
+      });
+      pool.releaseConnection("127.0.0.1:22", client);
+
+      const result = await executor.executeScript("echo one\necho two");
+
+      const [remotePath, opts] = mockSftp.createWriteStream.mock.calls[0];
+      expect(remotePath).toMatch(/^\/tmp\/forge_script_[0-9a-f]{16}\.sh$/);
+      expect(opts.mode).toBe(0o700);
+      expect(written.join("")).toBe("echo one\necho two");
+      expect(mockClientInstance.exec).toHaveBeenCalledTimes(1);
+      const [cmd] = mockClientInstance.exec.mock.calls[0];
+      expect(cmd).toBe(
+        `bash ${remotePath}; rc=$?; rm -f ${remotePath}; exit $rc`,
+      );
+      expect(result.code).toBe(0);
+    });
+
+    it("uploads local files with pipelined fastPut writes", async () => {
+      const onProgress = jest.fn();
+      const mockSftp = {
+        fastPut: jest
+          .fn()
+          .mockImplementation((_l: string, _r: string, opts: any, cb: any) => {
+            opts.step(32768, 32768, 65536);
+            opts.step(65536, 32768, 65536);
+            cb();
+          }),
+        end: jest.fn(),
+        on: jest.fn(),
+      };
+      const client = await pool.getConnection("127.0.0.1:22", config);
+      const mockClientInstance = mockClients.find((c) => c === (client as any))!;
+      mockClientInstance.sftp = jest.fn().mockImplementation((cb: (err: any, sftp: any) => void) => {
+        cb(null, mockSftp);
+      });
+      pool.releaseConnection("127.0.0.1:22", client);
+
+      await executor.pushFileFromPath(
+        "/tmp/local",
+        "/remote/file",
+        1_000,
+        onProgress,
+      );
+
+      const [localPath, remotePath, opts] = mockSftp.fastPut.mock.calls[0];
+      expect(localPath).toBe("/tmp/local");
+      expect(remotePath).toBe("/remote/file");
+      expect(opts.concurrency).toBe(64);
+      expect(opts.chunkSize).toBe(32 * 1024);
+      expect(onProgress).toHaveBeenLastCalledWith(65536);
+      expect(mockSftp.end).not.toHaveBeenCalled();
+    });
+
+    it("downloads to disk with pipelined fastGet reads", async () => {
+      const onProgress = jest.fn();
+      const mockSftp = {
+        fastGet: jest
+          .fn()
+          .mockImplementation((_r: string, _l: string, opts: any, cb: any) => {
+            opts.step(32768, 32768, 65536);
+            opts.step(65536, 32768, 65536);
+            cb();
+          }),
+        end: jest.fn(),
+        on: jest.fn(),
+      };
+      const client = await pool.getConnection("127.0.0.1:22", config);
+      const mockClientInstance = mockClients.find((c) => c === (client as any))!;
+      mockClientInstance.sftp = jest.fn().mockImplementation((cb: (err: any, sftp: any) => void) => {
+        cb(null, mockSftp);
+      });
+      pool.releaseConnection("127.0.0.1:22", client);
+
+      await (executor as any).sftpGetToFile(
+        client,
+        "/remote/file",
+        "/tmp/local",
+        1_000,
+        onProgress,
+      );
+
+      const opts = mockSftp.fastGet.mock.calls[0][2];
+      expect(opts.concurrency).toBe(64);
+      expect(opts.chunkSize).toBe(32 * 1024);
+      expect(onProgress).toHaveBeenLastCalledWith(65536);
+      expect(mockSftp.end).not.toHaveBeenCalled();
     });
   });
 });
@@ -1,5 +1,57 @@
 import { WpDbCredentials } from "@bedrock-forge/shared";
 
+/** Single- and double-quoted `define('KEY', 'value')` patterns for one key. */
+type DefinePatterns = { single: RegExp; double: RegExp };
+
+/** Single-quoted, double-quoted and unquoted `KEY=value` patterns for one key. */
+type EnvPatterns = { single: RegExp; double: RegExp; unquoted: RegExp };
+
+// Patterns are compiled once per key and reused: the parser only ever looks
+// up the same handful of keys (DB_NAME … DATABASE_URL), and a parse() that
+// falls through to .env format would otherwise build up to 23 RegExps.
+const definePatternCache = new Map<string, DefinePatterns>();
+const envPatternCache = new Map<string, EnvPatterns>();
+
+function definePatterns(key: string): DefinePatterns {
+  let patterns = definePatternCache.get(key);
+  if (!patterns) {
+    // Match: define( QUOTE KEY QUOTE , QUOTE VALUE QUOTE )
+    // The value regex [^'"]* won't work for passwords with quotes.
+    // We use a more careful approach: match everything up to the closing quote
+    // that's followed by optional whitespace and ) or ,
+    patterns = {
+      single: new RegExp(
+        `define\\s*\\(\\s*'${key}'\\s*,\\s*'((?:[^'\\\\]|\\\\.)*)'\\s*\\)`,
+        "i",
+      ),
+      double: new RegExp(
+        `define\\s*\\(\\s*"${key}"\\s*,\\s*"((?:[^"\\\\]|\\\\.)*)"\\s*\\)`,
+        "i",
+      ),
+    };
+    definePatternCache.set(key, patterns);
+  }
+  return patterns;
+}
+
+function envPatterns(key: string): EnvPatterns {
+  let patterns = envPatternCache.get(key);
+  if (!patterns) {
+    // Optional `export ` prefix (common in shell-sourced .env files)
+    const prefix = `(?:export\\s+)?${key}\\s*=\\s*`;
+    patterns = {
+      // Single-quoted value — stops only at unescaped single quote
+      single: new RegExp(`^${prefix}'((?:[^'\\\\]|\\\\.)*)'`, "im"),
+      // Double-quoted value — stops only at unescaped double quote
+      double: new RegExp(`^${prefix}"((?:[^"\\\\]|\\\\.)*)"`, "im"),
+      // Unquoted value (ends at whitespace or # comment)
+      unquoted: new RegExp(`^${prefix}([^\\s#'"]+)`, "im"),
+    };
+    envPatternCache.set(key, patterns);
+  }
+  return patterns;
+}
+
 /**
  * CredentialParserService
  *
@@ -102,25 +154,14 @@ export class CredentialParserService {
    *   Values with special chars: !, @, #, $, %, ^, &, *, (, ), -, _, +, =, [, ], {, }, |, ;, :, ', ", ,, ., <, >, ?, /, `, ~
    */
   private extractDefine(content: string, key: string): string | null {
-    // Match: define( QUOTE KEY QUOTE , QUOTE VALUE QUOTE )
-    // The value regex [^'"]* won't work for passwords with quotes.
-    // We use a more careful approach: match everything up to the closing quote
-    // that's followed by optional whitespace and ) or ,
-    const singleQuotePattern = new RegExp(
-      `define\\s*\\(\\s*'${key}'\\s*,\\s*'((?:[^'\\\\]|\\\\.)*)'\\s*\\)`,
-      "i",
-    );
-    const doubleQuotePattern = new RegExp(
-      `define\\s*\\(\\s*"${key}"\\s*,\\s*"((?:[^"\\\\]|\\\\.)*)"\\s*\\)`,
-      "i",
-    );
-
-    const singleMatch = content.match(singleQuotePattern);
+    const { single, double } = definePatterns(key);
+
+    const singleMatch = content.match(single);
     if (singleMatch?.[1] !== undefined) {
       return this.unescape(singleMatch[1]);
     }
 
-    const doubleMatch = content.match(doubleQuotePattern);
+    const doubleMatch = content.match(double);
     if (doubleMatch?.[1] !== undefined) {
       return this.unescape(doubleMatch[1]);
     }
@@ -145,26 +186,19 @@ export class CredentialParserService {
    * truncation (a shared [^'"] class stops at either quote type).
    */
   private extractEnv(content: string, key: string): string | null {
-    // Optional `export ` prefix (common in shell-sourced .env files)
-    const prefix = `(?:export\\s+)?${key}\\s*=\\s*`;
+    const { single, double, unquoted } = envPatterns(key);
 
-    // 1. Single-quoted value — stops only at unescaped single quote
-    const singlePattern = new RegExp(`^${prefix}'((?:[^'\\\\]|\\\\.)*)'`, "im");
-    const singleMatch = content.match(singlePattern);
+    const singleMatch = content.match(single);
     if (singleMatch?.[1] !== undefined) {
       return this.unescape(singleMatch[1]);
     }
 
-    // 2. Double-quoted value — stops only at unescaped double quote
-    const doublePattern = new RegExp(`^${prefix}"((?:[^"\\\\]|\\\\.)*)"`, "im");
-    const doubleMatch = content.match(doublePattern);
+    const doubleMatch = content.match(double);
     if (doubleMatch?.[1] !== undefined) {
       return this.unescape(doubleMatch[1]);
     }
 
-    // 3. Unquoted value (ends at whitespace or # comment)
-    const unquotedPattern = new RegExp(`^${prefix}([^\\s#'"]+)`, "im");
-    const unquotedMatch = content.match(unquotedPattern);
+    const unquotedMatch = content.match(unquoted);
     if (unquotedMatch?.[1] !== undefined) {
       return unquotedMatch[1].trim();
     }
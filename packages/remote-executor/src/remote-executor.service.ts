@@ -1,6 +1,7 @@
-import { createWriteStream } from "fs";
+import { randomBytes } from "crypto";
 import type { Readable } from "stream";
-import { Client } from "ssh2";
+import { StringDecoder } from "string_decoder";
+import { Client, type SFTPWrapper } from "ssh2";
 import {
   sshPoolManager,
   SshServerConfig,
@@ -15,6 +16,33 @@ import {
  */
 const SFTP_STALL_TIMEOUT_MS = 5 * 60 * 1_000; // 5 minutes with no data = stall
 
+/**
+ * Local → remote upload pipeline. fastPut() reads each chunk from the local
+ * file descriptor straight into the WRITE packet buffer and keeps
+ * SFTP_WRITE_CONCURRENCY writes in flight, so a file on disk is never routed
+ * through an fs.ReadStream → pipe() → SFTP write stream chain.
+ */
+const SFTP_WRITE_CONCURRENCY = 64;
+const SFTP_WRITE_CHUNK_BYTES = 32 * 1024;
+
+/**
+ * Remote → local download pipeline. fastGet() issues up to
+ * SFTP_READ_CONCURRENCY reads of SFTP_READ_CHUNK_BYTES each before waiting for
+ * a reply, i.e. ~2 MiB in flight per transfer — enough to fill a WAN link at
+ * typical RTTs for a modest amount of memory per download.
+ */
+const SFTP_READ_CONCURRENCY = 64;
+const SFTP_READ_CHUNK_BYTES = 32 * 1024;
+
+/**
+ * SFTP sessions kept open on pooled connections. Opening one costs a channel
+ * open, a subsystem request and the SFTP INIT/VERSION exchange, so each
+ * connection keeps its session for later transfers rather than paying those
+ * round trips again. Entries go away with the client (WeakMap) or when the
+ * session closes; failed transfers discard theirs so it is never reused.
+ */
+const sftpSessions = new WeakMap<Client, SFTPWrapper>();
+
 /**
  * Returns true when `err` is an SSH channel-open rejection — a sign that the
  * pooled connection is stale/exhausted and must be evicted, not returned idle.
@@ -30,6 +58,12 @@ function isChannelOpenFailure(err: unknown): boolean {
 export interface ExecuteOptions {
   timeout?: number; // ms, default 30000
   cwd?: string;
+  /**
+   * Called with each chunk of output as it arrives, before the command
+   * exits — lets long-running commands (composer, apt) surface progress.
+   * The full output is still collected into the result.
+   */
+  onOutput?: (chunk: string, source: "stdout" | "stderr") => void;
 }
 
 export interface ExecuteResult {
@@ -61,6 +95,11 @@ export class RemoteExecutorService {
     private readonly pool: SshPoolManager = sshPoolManager,
   ) {}
 
+  /** Pool key (`host:port`) — identifies the server across executor instances. */
+  get serverKey(): string {
+    return `${this.config.host}:${this.config.port}`;
+  }
+
   /**
    * Execute a shell command on the remote server.
    * Returns stdout, stderr, and exit code.
@@ -71,7 +110,26 @@ export class RemoteExecutorService {
   ): Promise<ExecuteResult> {
     const timeout = opts.timeout ?? 30_000;
     return this.withConnection((client) =>
-      this.runCommand(client, command, timeout),
+      this.runCommand(client, command, timeout, opts.onOutput),
+    );
+  }
+
+  /**
+   * Run a multi-line bash script: upload it over SFTP, run it in one exec,
+   * and delete it. The body never travels in the exec request, so a long
+   * generated script (one line per file, per rule…) isn't bounded by the
+   * remote command-line limit and needs no extra quoting. Exit code is the
+   * script's own.
+   */
+  async executeScript(
+    script: string,
+    opts: ExecuteOptions = {},
+  ): Promise<ExecuteResult> {
+    const remotePath = `/tmp/forge_script_${randomBytes(8).toString("hex")}.sh`;
+    await this.pushFile({ remotePath, content: script, mode: 0o700 });
+    return this.execute(
+      `bash ${remotePath}; rc=$?; rm -f ${remotePath}; exit $rc`,
+      opts,
     );
   }
 
@@ -131,6 +189,25 @@ export class RemoteExecutorService {
     );
   }
 
+  /**
+   * Upload a local file to the remote server via SFTP with pipelined writes
+   * read directly from the file descriptor. Prefer this over
+   * pushFileFromStream() for files already on the worker's disk (tar relays,
+   * SQL dumps).
+   *
+   * @param onProgress  optional callback invoked with cumulative bytes sent
+   */
+  async pushFileFromPath(
+    localPath: string,
+    remotePath: string,
+    timeoutMs: number = SFTP_STALL_TIMEOUT_MS,
+    onProgress?: (bytes: number) => void,
+  ): Promise<void> {
+    return this.withConnection((client) =>
+      this.sftpPutFromFile(client, localPath, remotePath, timeoutMs, onProgress),
+    );
+  }
+
   /**
    * Acquire a connection from the pool, run `fn`, and release it back.
    * If `fn` throws a channel-open failure (stale/exhausted connection), the
@@ -140,7 +217,7 @@ export class RemoteExecutorService {
   private async withConnection<T>(
     fn: (client: Client) => Promise<T>,
   ): Promise<T> {
-    const serverKey = `${this.config.host}:${this.config.port}`;
+    const serverKey = this.serverKey;
     const client = await this.pool.getConnection(serverKey, this.config);
     try {
       return await fn(client);
@@ -162,14 +239,53 @@ export class RemoteExecutorService {
     }
   }
 
+  /**
+   * Hand the callback the SFTP session cached on this pooled connection,
+   * opening (and caching) one on first use. Same callback shape as
+   * client.sftp() so transfer code reads the same either way.
+   */
+  private openSftp(
+    client: Client,
+    cb: (err: Error | undefined, sftp: SFTPWrapper) => void,
+  ): void {
+    const cached = sftpSessions.get(client);
+    if (cached) return cb(undefined, cached);
+    client.sftp((err, sftp) => {
+      if (err) return cb(err, sftp);
+      sftpSessions.set(client, sftp);
+      sftp.on("close", () => {
+        if (sftpSessions.get(client) === sftp) sftpSessions.delete(client);
+      });
+      cb(undefined, sftp);
+    });
+  }
+
+  /**
+   * Close the session after a failed or stalled transfer — it may still have
+   * requests in flight — and drop it from the cache so it is never reused.
+   */
+  private discardSftp(client: Client, sftp: SFTPWrapper): void {
+    if (sftpSessions.get(client) === sftp) sftpSessions.delete(client);
+    try {
+      sftp.end();
+    } catch (_) {
+      // ignore — session may already be gone
+    }
+  }
+
   private runCommand(
     client: Client,
     command: string,
     timeout: number,
+    onOutput?: ExecuteOptions["onOutput"],
   ): Promise<ExecuteResult> {
     return new Promise((resolve, reject) => {
       let stdout = "";
       let stderr = "";
+      // Decoders hold back a multi-byte character split across two packets
+      // instead of turning both halves into U+FFFD.
+      const stdoutDecoder = new StringDecoder("utf8");
+      const stderrDecoder = new StringDecoder("utf8");
       // Keep a reference so the timeout handler can close the channel.
       let channelRef: Parameters<Parameters<Client["exec"]>[1]>[1] | null =
         null;
@@ -196,15 +312,21 @@ export class RemoteExecutorService {
         channelRef = stream;
 
         stream.on("data", (data: Buffer) => {
-          stdout += data.toString();
+          const chunk = stdoutDecoder.write(data);
+          stdout += chunk;
+          if (chunk) onOutput?.(chunk, "stdout");
         });
 
         stream.stderr.on("data", (data: Buffer) => {
-          stderr += data.toString();
+          const chunk = stderrDecoder.write(data);
+          stderr += chunk;
+          if (chunk) onOutput?.(chunk, "stderr");
         });
 
         stream.on("close", (code: number) => {
           clearTimeout(timer);
+          stdout += stdoutDecoder.end();
+          stderr += stderrDecoder.end();
           resolve({
             stdout: stdout.trim(),
             stderr: stderr.trim(),
@@ -222,7 +344,7 @@ export class RemoteExecutorService {
 
   private sftpPut(client: Client, file: RemoteFile): Promise<void> {
     return new Promise((resolve, reject) => {
-      client.sftp((err, sftp) => {
+      this.openSftp(client, (err, sftp) => {
         if (err) return reject(err);
 
         const content =
@@ -234,11 +356,11 @@ export class RemoteExecutorService {
           mode: file.mode ?? 0o644,
         });
 
-        writeStream.on("close", () => {
-          sftp.end();
-          resolve();
+        writeStream.on("close", () => resolve());
+        writeStream.on("error", (e: Error) => {
+          this.discardSftp(client, sftp);
+          reject(e);
         });
-        writeStream.on("error", reject);
         writeStream.end(content);
       });
     });
@@ -251,9 +373,9 @@ export class RemoteExecutorService {
   ): Promise<Buffer> {
     return new Promise((resolve, reject) => {
       let settled = false;
-      let sftpRef: any = null;
+      let sftpRef: SFTPWrapper | null = null;
       let readStreamRef: any = null;
-      const settle = (fn: () => void) => {
+      const settle = (fn: () => void, ok = false) => {
         if (!settled) {
           settled = true;
           clearTimeout(stallTimer);
@@ -262,11 +384,7 @@ export class RemoteExecutorService {
               readStreamRef.destroy();
             } catch (_) {}
           }
-          if (sftpRef) {
-            try {
-              sftpRef.end();
-            } catch (_) {}
-          }
+          if (sftpRef && !ok) this.discardSftp(client, sftpRef);
           fn();
         }
       };
@@ -276,20 +394,16 @@ export class RemoteExecutorService {
           `SFTP pull stalled — no data for ${timeoutMs / 1000}s on ${remotePath}`,
         );
 
-      let stallTimer: ReturnType<typeof setTimeout> = setTimeout(
+      const stallTimer = setTimeout(
         () => settle(() => reject(makeStallError())),
         timeoutMs,
       );
 
-      const resetStall = () => {
-        clearTimeout(stallTimer);
-        stallTimer = setTimeout(
-          () => settle(() => reject(makeStallError())),
-          timeoutMs,
-        );
-      };
+      // refresh() re-arms the same timer in place rather than clearing and
+      // allocating a new one for every chunk of a multi-GB transfer.
+      const resetStall = () => stallTimer.refresh();
 
-      client.sftp((err, sftp) => {
+      this.openSftp(client, (err, sftp) => {
         if (err) return settle(() => reject(err));
         sftpRef = sftp;
 
@@ -304,7 +418,7 @@ export class RemoteExecutorService {
         readStream.on("end", () => {
           settle(() => {
             resolve(Buffer.concat(chunks));
-          });
+          }, true);
         });
         readStream.on("error", (e: Error) => {
           settle(() => {
@@ -316,11 +430,16 @@ export class RemoteExecutorService {
   }
 
   /**
-   * Stream the remote file directly to a local file on disk.
+   * Download the remote file directly to a local file on disk.
+   *
+   * Uses ssh2's fastGet(), which keeps SFTP_READ_CONCURRENCY READ requests in
+   * flight instead of the single outstanding read a createReadStream() pipe
+   * allows, so throughput on high-latency links is bounded by bandwidth rather
+   * than one round trip per chunk.
    *
    * Uses an activity-based stall timer (not a flat wall-clock timer) so that
    * large files transfer uninterrupted as long as data keeps flowing. The
-   * timer resets on every `data` event. If no bytes arrive for `timeoutMs`
+   * timer resets on every completed chunk. If no bytes arrive for `timeoutMs`
    * (default 5 min) the connection is considered stalled and we abort.
    *
    * This replaces the old flat 45-min timer that caused 916 MB+ backups to
@@ -335,28 +454,12 @@ export class RemoteExecutorService {
   ): Promise<void> {
     return new Promise((resolve, reject) => {
       let settled = false;
-      let sftpRef: any = null;
-      let readStreamRef: any = null;
-      let writeStreamRef: any = null;
-      const settle = (fn: () => void) => {
+      let sftpRef: SFTPWrapper | null = null;
+      const settle = (fn: () => void, ok = false) => {
         if (!settled) {
           settled = true;
           clearTimeout(stallTimer);
-          if (readStreamRef) {
-            try {
-              readStreamRef.destroy();
-            } catch (_) {}
-          }
-          if (writeStreamRef) {
-            try {
-              writeStreamRef.destroy();
-            } catch (_) {}
-          }
-          if (sftpRef) {
-            try {
-              sftpRef.end();
-            } catch (_) {}
-          }
+          if (sftpRef && !ok) this.discardSftp(client, sftpRef);
           fn();
         }
       };
@@ -366,57 +469,97 @@ export class RemoteExecutorService {
           `SFTP pull stalled — no data for ${timeoutMs / 1000}s on ${remotePath}`,
         );
 
-      // Activity-based stall timer: resets on every data chunk.
-      let stallTimer: ReturnType<typeof setTimeout> = setTimeout(
+      // Activity-based stall timer: resets on every completed chunk.
+      const stallTimer = setTimeout(
         () => settle(() => reject(makeStallError())),
         timeoutMs,
       );
 
-      const resetStall = () => {
-        clearTimeout(stallTimer);
-        stallTimer = setTimeout(
-          () => settle(() => reject(makeStallError())),
-          timeoutMs,
-        );
-      };
+      const resetStall = () => stallTimer.refresh();
 
-      client.sftp((err, sftp) => {
+      this.openSftp(client, (err, sftp) => {
         if (err) return settle(() => reject(err));
         sftpRef = sftp;
 
-        const readStream = sftp.createReadStream(remotePath);
-        readStreamRef = readStream;
-        const writeStream = createWriteStream(localPath);
-        writeStreamRef = writeStream;
-        let totalBytes = 0;
+        sftp.fastGet(
+          remotePath,
+          localPath,
+          {
+            concurrency: SFTP_READ_CONCURRENCY,
+            chunkSize: SFTP_READ_CHUNK_BYTES,
+            step: (totalBytes: number) => {
+              resetStall(); // transfer is alive — postpone stall deadline
+              if (onProgress) onProgress(totalBytes);
+            },
+          },
+          (e?: Error | null) =>
+            settle(() => {
+              if (e) reject(e);
+              else resolve();
+            }, !e),
+        );
+      });
+    });
+  }
 
-        readStream.on("data", (chunk: Buffer) => {
-          totalBytes += chunk.length;
-          resetStall(); // transfer is alive — postpone stall deadline
-          if (onProgress) onProgress(totalBytes);
-        });
+  /**
+   * Upload a local file with ssh2's fastPut(). Each chunk is read from the
+   * local fd into the buffer that becomes the WRITE packet, with
+   * SFTP_WRITE_CONCURRENCY writes outstanding. Uses the same activity-based
+   * stall timer as sftpGetToFile().
+   */
+  private sftpPutFromFile(
+    client: Client,
+    localPath: string,
+    remotePath: string,
+    timeoutMs: number,
+    onProgress?: (bytes: number) => void,
+  ): Promise<void> {
+    return new Promise((resolve, reject) => {
+      let settled = false;
+      let sftpRef: SFTPWrapper | null = null;
+      const settle = (fn: () => void, ok = false) => {
+        if (!settled) {
+          settled = true;
+          clearTimeout(stallTimer);
+          if (sftpRef && !ok) this.discardSftp(client, sftpRef);
+          fn();
+        }
+      };
 
-        readStream.on("error", (e: Error) => {
-          settle(() => {
-            reject(e);
-          });
-        });
+      const makeStallError = () =>
+        new Error(
+          `SFTP push stalled — no data for ${timeoutMs / 1000}s on ${remotePath}`,
+        );
 
-        writeStream.on("error", (e: Error) => {
-          settle(() => {
-            reject(e);
-          });
-        });
+      const stallTimer = setTimeout(
+        () => settle(() => reject(makeStallError())),
+        timeoutMs,
+      );
 
-        // 'close' fires after all data is flushed and the fd is released.
-        // This is the correct completion signal for a file WriteStream.
-        writeStream.on("close", () =>
-          settle(() => {
-            resolve();
-          }),
-        );
+      const resetStall = () => stallTimer.refresh();
+
+      this.openSftp(client, (err, sftp) => {
+        if (err) return settle(() => reject(err));
+        sftpRef = sftp;
 
-        readStream.pipe(writeStream);
+        sftp.fastPut(
+          localPath,
+          remotePath,
+          {
+            concurrency: SFTP_WRITE_CONCURRENCY,
+            chunkSize: SFTP_WRITE_CHUNK_BYTES,
+            step: (totalBytes: number) => {
+              resetStall();
+              if (onProgress) onProgress(totalBytes);
+            },
+          },
+          (e?: Error | null) =>
+            settle(() => {
+              if (e) reject(e);
+              else resolve();
+            }, !e),
+        );
       });
     });
   }
@@ -435,9 +578,9 @@ export class RemoteExecutorService {
   ): Promise<void> {
     return new Promise((resolve, reject) => {
       let settled = false;
-      let sftpRef: any = null;
+      let sftpRef: SFTPWrapper | null = null;
       let writeStreamRef: any = null;
-      const settle = (fn: () => void) => {
+      const settle = (fn: () => void, ok = false) => {
         if (!settled) {
           settled = true;
           clearTimeout(stallTimer);
@@ -446,11 +589,7 @@ export class RemoteExecutorService {
               writeStreamRef.destroy();
             } catch (_) {}
           }
-          if (sftpRef) {
-            try {
-              sftpRef.end();
-            } catch (_) {}
-          }
+          if (sftpRef && !ok) this.discardSftp(client, sftpRef);
           fn();
         }
       };
@@ -461,25 +600,24 @@ export class RemoteExecutorService {
         );
 
       // Activity-based stall timer: resets on every data chunk.
-      let stallTimer: ReturnType<typeof setTimeout> = setTimeout(
+      const stallTimer = setTimeout(
         () => settle(() => reject(makeStallError())),
         timeoutMs,
       );
 
-      const resetStall = () => {
-        clearTimeout(stallTimer);
-        stallTimer = setTimeout(
-          () => settle(() => reject(makeStallError())),
-          timeoutMs,
-        );
-      };
+      const resetStall = () => stallTimer.refresh();
 
-      client.sftp((err, sftp) => {
+      this.openSftp(client, (err, sftp) => {
         if (err) return settle(() => reject(err));
         sftpRef = sftp;
 
+        // With the default 16 KiB highWaterMark every 64 KiB pipe chunk
+        // overflows the buffer, so the pipe pauses after each one and a
+        // single WRITE is in flight at a time. Buffering as much as fastPut()
+        // keeps outstanding lets ssh2's _writev() pipeline the queued chunks.
         const writeStream = sftp.createWriteStream(remotePath, {
           mode: 0o644,
+          highWaterMark: SFTP_WRITE_CONCURRENCY * SFTP_WRITE_CHUNK_BYTES,
         });
         writeStreamRef = writeStream;
         let totalBytes = 0;
@@ -506,7 +644,7 @@ export class RemoteExecutorService {
         writeStream.on("close", () =>
           settle(() => {
             resolve();
-          }),
+          }, true),
         );
 
         readable.pipe(writeStream);
@@ -1,4 +1,4 @@
-import { Client, ConnectConfig } from "ssh2";
+import { Client, ConnectConfig, ParsedKey, utils } from "ssh2";
 import { EventEmitter } from "events";
 import { createHash } from "crypto";
 
@@ -20,8 +20,34 @@ interface PooledConnection {
 }
 
 const MAX_POOL_SIZE = 15;
-const IDLE_TIMEOUT_MS = 5 * 60 * 1000; // 5 minutes
+// Just over the 5-minute security attack-watch tick, so each run finds the
+// previous run's connection still pooled instead of paying a fresh key
+// exchange every time.
+const IDLE_TIMEOUT_MS = 6 * 60 * 1000; // 6 minutes
 const CONNECTION_TIMEOUT_MS = 15_000;
+const MAX_PARSED_KEYS = 64;
+
+// Parsed private keys, keyed by a digest of the PEM. Handing ssh2 the raw PEM
+// makes it decode the key and detect its format again on every new
+// connection; a parallel fan-out over one server (or many servers sharing a
+// key) would repeat that work per connection.
+const parsedKeys = new Map<string, ParsedKey>();
+
+function loadPrivateKey(pem: string): ParsedKey {
+  const digest = createHash("sha256").update(pem).digest("base64");
+  const cached = parsedKeys.get(digest);
+  if (cached) return cached;
+
+  const parsed = utils.parseKey(pem);
+  if (parsed instanceof Error) throw parsed;
+  const key = Array.isArray(parsed) ? parsed[0] : parsed;
+  if (parsedKeys.size >= MAX_PARSED_KEYS) {
+    // Oldest first — Map iteration follows insertion order.
+    parsedKeys.delete(parsedKeys.keys().next().value as string);
+  }
+  parsedKeys.set(digest, key);
+  return key;
+}
 
 /**
  * Global SSH connection pool. One instance per process, shared across all
@@ -29,12 +55,24 @@ const CONNECTION_TIMEOUT_MS = 15_000;
  *
  * Design decisions:
  * - Max 15 concurrent connections per server to avoid overwhelming target hosts
- * - Connections idle for >5 min are proactively closed
- * - getConnection() blocks (polls) if pool is at capacity — callers should
- *   use BullMQ concurrency limits to avoid starvation
+ * - Connections idle for >6 min are proactively closed
+ * - getConnection() blocks if pool is at capacity until a connection is
+ *   released or dropped — callers should use BullMQ concurrency limits to
+ *   avoid starvation
  */
 export class SshPoolManager extends EventEmitter {
   private pools: Map<string, PooledConnection[]> = new Map();
+  /** Callers blocked on a full pool, woken in FIFO order as slots free up. */
+  private waiters: Map<string, Array<() => void>> = new Map();
+  /**
+   * Host key fingerprints accepted on first use, per server. Servers with no
+   * stored fingerprint are trusted on first contact; every later connection
+   * this process opens to them — including ones racing the first before its
+   * fingerprint is persisted — is pinned to the same key instead of being
+   * trusted (and reported) afresh. Entries last until the fingerprint is
+   * persisted or the server is closed.
+   */
+  private learnedHostKeys: Map<string, string> = new Map();
   private gcInterval: NodeJS.Timeout;
 
   constructor() {
@@ -64,9 +102,30 @@ export class SshPoolManager extends EventEmitter {
       return conn;
     }
 
-    // Pool at capacity — wait for a connection to become available
+    // Pool at capacity — wait to be woken by a release or an eviction
+    // rather than re-scanning the pool on a timer.
     return new Promise((resolve, reject) => {
+      const waiters = this.getWaiters(serverKey);
+
+      const wake = (): void => {
+        const current = this.getPool(serverKey);
+        const available = current.find((c) => !c.inUse);
+        if (available) {
+          clearTimeout(timeout);
+          available.inUse = true;
+          available.lastUsedAt = new Date();
+          resolve(available.client);
+        } else if (current.length < MAX_POOL_SIZE) {
+          clearTimeout(timeout);
+          this.createConnection(serverKey, config).then(resolve, reject);
+        } else {
+          waiters.push(wake);
+        }
+      };
+
       const timeout = setTimeout(() => {
+        const idx = waiters.indexOf(wake);
+        if (idx !== -1) waiters.splice(idx, 1);
         reject(
           new Error(
             `SSH pool timeout for server ${serverKey}: pool at capacity (${MAX_POOL_SIZE})`,
@@ -74,16 +133,7 @@ export class SshPoolManager extends EventEmitter {
         );
       }, 30_000);
 
-      const check = setInterval(() => {
-        const available = this.getPool(serverKey).find((c) => !c.inUse);
-        if (available) {
-          clearInterval(check);
-          clearTimeout(timeout);
-          available.inUse = true;
-          available.lastUsedAt = new Date();
-          resolve(available.client);
-        }
-      }, 100);
+      waiters.push(wake);
     });
   }
 
@@ -93,6 +143,7 @@ export class SshPoolManager extends EventEmitter {
     if (entry) {
       entry.inUse = false;
       entry.lastUsedAt = new Date();
+      this.wakeWaiter(serverKey);
     }
   }
 
@@ -111,6 +162,7 @@ export class SshPoolManager extends EventEmitter {
     } catch (_) {
       // ignore
     }
+    if (idx !== -1) this.wakeWaiter(serverKey);
   }
 
   closeServer(serverKey: string): void {
@@ -123,6 +175,7 @@ export class SshPoolManager extends EventEmitter {
       }
     });
     this.pools.delete(serverKey);
+    this.learnedHostKeys.delete(serverKey);
   }
 
   getPoolStats(serverKey: string): {
@@ -148,6 +201,19 @@ export class SshPoolManager extends EventEmitter {
     }
   }
 
+  private getWaiters(serverKey: string): Array<() => void> {
+    if (!this.waiters.has(serverKey)) {
+      this.waiters.set(serverKey, []);
+    }
+    return this.waiters.get(serverKey)!;
+  }
+
+  /** Hand a freed slot (idle connection or room to connect) to the next waiter. */
+  private wakeWaiter(serverKey: string): void {
+    const next = this.waiters.get(serverKey)?.shift();
+    if (next) next();
+  }
+
   private getPool(serverKey: string): PooledConnection[] {
     if (!this.pools.has(serverKey)) {
       this.pools.set(serverKey, []);
@@ -160,6 +226,18 @@ export class SshPoolManager extends EventEmitter {
     config: SshServerConfig,
   ): Promise<Client> {
     return new Promise((resolve, reject) => {
+      let key: ParsedKey;
+      try {
+        key = loadPrivateKey(config.privateKey);
+      } catch (err) {
+        reject(
+          new Error(
+            `SSH connection failed for server ${serverKey}: ${(err as Error).message}`,
+          ),
+        );
+        return;
+      }
+
       const client = new Client();
       const pool = this.getPool(serverKey);
 
@@ -167,7 +245,13 @@ export class SshPoolManager extends EventEmitter {
         host: config.host,
         port: config.port,
         username: config.username,
-        privateKey: config.privateKey,
+        // Every server is reached with its stored key, so offer only that
+        // method: no agent lookup and no fallback attempts when a key is
+        // rejected, just an immediate auth failure. The key goes in already
+        // parsed, so ssh2 doesn't re-decode the PEM for this connection.
+        authHandler: [
+          { type: "publickey", username: config.username, key },
+        ],
         readyTimeout: CONNECTION_TIMEOUT_MS,
         // Send a keepalive packet every 10 s so firewalls / NAT tables don't
         // silently drop the TCP connection during long SFTP transfers.
@@ -175,15 +259,24 @@ export class SshPoolManager extends EventEmitter {
         keepaliveCountMax: 3,
         hostVerifier: (key: Buffer, verify: (valid: boolean) => void) => {
           const fingerprint = createHash("sha256").update(key).digest("base64");
-          if (config.expectedHostKeyFingerprint) {
-            if (config.expectedHostKeyFingerprint === fingerprint) {
-              verify(true);
-            } else {
-              verify(false);
-            }
+          const expected =
+            config.expectedHostKeyFingerprint ??
+            this.learnedHostKeys.get(serverKey);
+          if (expected) {
+            verify(expected === fingerprint);
           } else {
+            this.learnedHostKeys.set(serverKey, fingerprint);
             if (config.onHostKeyFingerprint) {
-              Promise.resolve(config.onHostKeyFingerprint(fingerprint)).catch(() => {});
+              // Once persisted, the stored fingerprint takes over as the pin.
+              // Drop the in-memory one so resetting it (a rebuilt or re-added
+              // server on the same host) isn't overridden until a restart.
+              Promise.resolve(config.onHostKeyFingerprint(fingerprint))
+                .then(() => {
+                  if (this.learnedHostKeys.get(serverKey) === fingerprint) {
+                    this.learnedHostKeys.delete(serverKey);
+                  }
+                })
+                .catch(() => {});
             }
             verify(true);
           }
@@ -210,11 +303,19 @@ export class SshPoolManager extends EventEmitter {
         );
       });
 
-      client.on("end", () => {
-        // Remove from pool on disconnect
+      // Remove from pool on disconnect. A clean shutdown emits "end", but a
+      // dropped socket or keepalive timeout only emits "error" + "close" — so
+      // listen for both, otherwise the dead client stays idle in the pool
+      // and the next phase of a job is handed a connection that can't exec.
+      const evict = () => {
         const idx = pool.findIndex((c) => c.client === client);
-        if (idx !== -1) pool.splice(idx, 1);
-      });
+        if (idx !== -1) {
+          pool.splice(idx, 1);
+          this.wakeWaiter(serverKey);
+        }
+      };
+      client.on("end", evict);
+      client.on("close", evict);
 
       client.connect(connectConfig);
     });
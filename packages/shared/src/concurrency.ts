@@ -0,0 +1,27 @@
+// ─── Concurrency ──────────────────────────────────────────────────────────────
+
+/**
+ * Run `fn` over `items` with at most `limit` calls in flight, returning the
+ * results in input order. Each worker pulls the next unclaimed item as soon
+ * as its previous call settles, so one slow item doesn't hold back the rest.
+ * A rejection rejects the whole call; handle per-item failures inside `fn`
+ * when the remaining items should still run.
+ */
+export async function mapWithConcurrency<T, R>(
+  items: readonly T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>,
+): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+  const worker = async (): Promise<void> => {
+    while (next < items.length) {
+      const i = next++;
+      results[i] = await fn(items[i], i);
+    }
+  };
+  await Promise.all(
+    Array.from({ length: Math.min(Math.max(limit, 1), items.length) }, worker),
+  );
+  return results;
+}
@@ -3,3 +3,4 @@ export * from "./roles";
 export * from "./types";
 export * from "./security.types";
 export * from "./vulnerabilities";
+export * from "./concurrency";